@@ -10,8 +10,16 @@ __author__ = "RHINE-LAB"
 __license__ = "MIT"
 
 # 导出主要模块
-from .ocr import OCRProcessor
+from .ocr import OCRProcessor, clear_engine_cache
+from .result import OCRResult, BoxArray
+from .async_ocr import AsyncOCRProcessor
 from .mouse import MouseSimulator
 from .translation import Translator
+from .translation_cache import TranslationCache
+from .async_translation import AsyncTranslator
 from .core import AutoMod
-from .config import AutoModConfig
\ No newline at end of file
+from .config import AutoModConfig
+from .frame_cache import FrameCache
+from .capture import CaptureBackend, MSSCapture, PyAutoGUICapture, FakeCapture, create_capture_backend
+from .replay import OCRRecorder, ReplayRunner
+from .template import TemplateLocator
\ No newline at end of file
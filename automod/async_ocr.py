@@ -0,0 +1,128 @@
+"""
+异步OCR模块
+
+基于asyncio的OCR流水线：截图与识别并行执行，识别跟不上时丢弃过期帧而不是排队。
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+import numpy as np
+from .config import AutoModConfig
+from .ocr import OCRProcessor
+from .result import OCRResult
+
+
+class AsyncOCRProcessor:
+    """异步OCR处理器"""
+
+    def __init__(self, ocr: Optional[OCRProcessor] = None, config: Optional[AutoModConfig] = None,
+                 workers: int = 2, queue_size: int = 1):
+        """
+        初始化异步OCR处理器
+
+        参数:
+            ocr: 复用的OCRProcessor实例，为None时根据config创建
+            config: 配置对象
+            workers: 执行截图和识别的工作线程数
+            queue_size: 待识别帧队列的容量，队列满时丢弃最旧的帧
+        """
+        self.ocr = ocr or OCRProcessor(config)
+        self.queue_size = max(1, queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=max(2, workers), thread_name_prefix='automod-ocr')
+
+        # 统计计数
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_recognized = 0
+        # 最近一帧从截图完成到识别完成的耗时（毫秒）
+        self.last_latency = 0.0
+
+    async def _run(self, func, *args):
+        """在工作线程中执行阻塞调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def recognize(self, image: Union[str, np.ndarray]) -> OCRResult:
+        """异步识别图像中的文字"""
+        return await self._run(self.ocr.recognize, image)
+
+    async def screenshot_and_recognize(self, region: Optional[Tuple[int, int, int, int]] = None) -> OCRResult:
+        """异步截取屏幕并识别文字"""
+        return await self._run(self.ocr.screenshot_and_recognize, region)
+
+    async def stream(self, region: Optional[Tuple[int, int, int, int]] = None, fps: float = 2.0,
+                     max_frames: Optional[int] = None) -> AsyncIterator[OCRResult]:
+        """
+        持续截图并识别，按识别完成的顺序产出结果
+
+        截图任务按fps节奏独立运行，识别上一帧的同时截取下一帧；
+        识别速度跟不上截图时，队列中过期的帧会被丢弃，始终识别最新的画面。
+
+        参数:
+            region: 可选的截取区域 (x, y, width, height)
+            fps: 最高截图帧率
+            max_frames: 产出指定数量的结果后结束，为None时持续运行
+
+        返回的每个结果的 'timings' 字段为该帧识别各阶段耗时（毫秒）
+
+        用法:
+            async for result in ocr.stream(region, fps=5):
+                ...
+        """
+        interval = 1.0 / fps if fps > 0 else 0.0
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        loop = asyncio.get_running_loop()
+
+        async def produce():
+            while True:
+                start = loop.time()
+                frame = await self._run(self.ocr.grab_frame, region)
+                self.frames_captured += 1
+                # 队列已满说明识别跟不上，丢弃最旧的帧
+                if queue.full():
+                    queue.get_nowait()
+                    self.frames_dropped += 1
+                queue.put_nowait((time.perf_counter(), frame))
+                await asyncio.sleep(max(0.0, interval - (loop.time() - start)))
+
+        producer = asyncio.ensure_future(produce())
+        count = 0
+        try:
+            while max_frames is None or count < max_frames:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    # 截图任务异常退出时将异常抛给调用方
+                    getter.cancel()
+                    producer.result()
+                captured_at, frame = getter.result()
+
+                result = await self._run(self.ocr.recognize_frame, frame, region)
+                self.frames_recognized += 1
+                self.last_latency = (time.perf_counter() - captured_at) * 1000
+                count += 1
+                yield result
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """返回流水线统计信息"""
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.frames_dropped,
+            'frames_recognized': self.frames_recognized,
+            'last_latency_ms': self.last_latency
+        }
+
+    def close(self) -> None:
+        """关闭工作线程池"""
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncOCRProcessor":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
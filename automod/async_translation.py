@@ -0,0 +1,261 @@
+"""
+异步翻译模块
+
+基于httpx.AsyncClient的异步翻译器：复用长连接（可用时启用HTTP/2），
+按主机限制并发请求数，适合在asyncio程序中批量翻译大量文本。
+"""
+
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from .config import AutoModConfig
+from .rate_limit import get_rate_limiter
+from .translation import (SERVICE_NAMES, build_request, error_result, parse_response,
+                          plan_units, split_packed)
+from .translation_cache import TranslationCache, cache_from_config, make_key
+
+
+def _http2_available() -> bool:
+    """是否安装了HTTP/2支持（h2包）"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class AsyncTranslator:
+    """异步翻译器，返回结果与Translator相同"""
+
+    def __init__(self, config: Optional[AutoModConfig] = None,
+                 cache: Optional[TranslationCache] = None):
+        """
+        初始化异步翻译器
+
+        参数:
+            config: 配置对象
+            cache: 翻译结果缓存，为None时按配置创建（可传入Translator.cache与同步翻译器共用）
+        """
+        self.config = config or AutoModConfig()
+        self._client = None
+        # 主机名 -> 并发请求信号量（首次请求时在当前事件循环中创建）
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        self.pack_stats = {'packs': 0, 'packed_items': 0, 'fallbacks': 0}
+        self.requests = 0
+        # 连接池是否启用了HTTP/2（创建客户端后确定）
+        self.http2 = False
+
+        self.cache = cache if cache is not None else cache_from_config(self.config)
+
+    @property
+    def client(self):
+        """连接池化的httpx.AsyncClient（首次使用时创建）"""
+        if self._client is None:
+            try:
+                import httpx
+            except ImportError:
+                raise ImportError("请安装httpx: pip install httpx")
+
+            limits = httpx.Limits(
+                max_connections=self.config.get('translation', 'async_max_connections', 20),
+                max_keepalive_connections=self.config.get('translation', 'async_max_keepalive', 10)
+            )
+            # HTTP/2需要h2包（pip install httpx[http2]），未安装时使用HTTP/1.1长连接
+            self.http2 = bool(self.config.get('translation', 'http2', True)) and _http2_available()
+            kwargs = {
+                'limits': limits,
+                'timeout': self.config.get('translation', 'timeout', 10),
+                'http2': self.http2
+            }
+            proxy = self.config.get('translation', 'proxy', None)
+            if proxy:
+                kwargs['proxy'] = proxy
+            self._client = httpx.AsyncClient(**kwargs)
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """获取指定URL所在主机的并发信号量"""
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.config.get('translation', 'async_per_host', 8))
+            self._host_limits[host] = limit
+        return limit
+
+    async def _throttle(self, service: str) -> None:
+        """按rate_limits配置限流（与同步翻译器共用令牌桶，等待时不阻塞事件循环）"""
+        spec = (self.config.get('translation', 'rate_limits', None) or {}).get(service)
+        if spec:
+            delay = get_rate_limiter(service, spec.get('rate', 0), spec.get('burst')).reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def _request(self, service: str, text: str, src_lang: str, dest_lang: str) -> Dict:
+        """构造请求、限流后发送并解析响应"""
+        url, params, from_lang, to_lang = build_request(self.config, service, text, src_lang, dest_lang)
+        try:
+            await self._throttle(service)
+            async with self._host_limit(url):
+                response = await self.client.get(url, params=params)
+            self.requests += 1
+            response.raise_for_status()
+            return parse_response(service, response.json(), text, from_lang, to_lang)
+        except ImportError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"{SERVICE_NAMES[service]}失败: {str(e)}")
+
+    async def _translate_uncached(self, text: str, src_lang: str, dest_lang: str, service: str) -> Dict:
+        """调用翻译服务翻译文本（首选服务失败时回退到谷歌翻译）"""
+        try:
+            if service not in SERVICE_NAMES:
+                raise ValueError(f"不支持的翻译服务: {service}")
+            return await self._request(service, text, src_lang, dest_lang)
+        except ImportError:
+            raise
+        except Exception as e:
+            if service != 'google':
+                try:
+                    return await self._request('google', text, src_lang, dest_lang)
+                except ImportError:
+                    raise
+                except Exception:
+                    pass
+            return error_result(text, src_lang, dest_lang, service, str(e))
+
+    async def _cache_call(self, func, *args):
+        """
+        调用缓存方法：使用SQLite持久化时在线程池中执行，避免磁盘读写阻塞事件循环；
+        只使用内存缓存时直接调用
+        """
+        if self.cache.path is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    def _lookup_many(self, service: str, src_lang: str, dest_lang: str, texts: list) -> Dict[str, Dict]:
+        """批量查找缓存的翻译结果，返回命中的 文本 -> 结果"""
+        found = {}
+        for text in texts:
+            result = self.cache.get(make_key(service, src_lang, dest_lang, text))
+            if result is not None:
+                result['text'] = text
+                found[text] = result
+        return found
+
+    def _store_many(self, service: str, src_lang: str, dest_lang: str, results: Dict[str, Dict]) -> None:
+        """批量保存翻译结果"""
+        for text, result in results.items():
+            self.cache.set(make_key(service, src_lang, dest_lang, text), result)
+
+    async def _cache_get(self, service: str, src_lang: str, dest_lang: str, texts: list) -> Dict[str, Dict]:
+        """查找缓存的翻译结果，未开启缓存时返回空字典"""
+        if self.cache is None or not texts:
+            return {}
+        return await self._cache_call(self._lookup_many, service, src_lang, dest_lang, texts)
+
+    async def _cache_set(self, service: str, src_lang: str, dest_lang: str, results: Dict[str, Dict]) -> None:
+        """缓存翻译结果（未开启缓存时忽略）"""
+        if self.cache is not None and results:
+            await self._cache_call(self._store_many, service, src_lang, dest_lang, results)
+
+    async def translate(self, text: str, src_lang: str = 'auto', dest_lang: str = 'zh') -> Dict:
+        """
+        翻译文本
+
+        参数:
+            text: 要翻译的文本
+            src_lang: 源语言，'auto'表示自动检测
+            dest_lang: 目标语言
+
+        返回:
+            包含翻译结果的字典（与Translator.translate相同）
+        """
+        if not text.strip():
+            return error_result(text, src_lang, dest_lang, None, 'Empty text')
+
+        service = self.config.get('translation', 'service', 'google')
+        cached = await self._cache_get(service, src_lang, dest_lang, [text])
+        if text in cached:
+            return cached[text]
+        return await self._translate_and_cache(text, src_lang, dest_lang, service)
+        
+    async def _translate_and_cache(self, text: str, src_lang: str, dest_lang: str, service: str) -> Dict:
+        """翻译已确认未缓存的文本并缓存结果（不再重复查找缓存）"""
+        if not text.strip():
+            return error_result(text, src_lang, dest_lang, None, 'Empty text')
+        result = await self._translate_uncached(text, src_lang, dest_lang, service)
+        await self._cache_set(service, src_lang, dest_lang, {text: result})
+        return result
+
+    async def _translate_packed(self, texts: list, src_lang: str, dest_lang: str, service: str) -> Dict[str, Dict]:
+        """将多条文本按行拼接为一个请求翻译，拆分失败时并发逐条重新翻译"""
+        result = await self._translate_uncached('\n'.join(texts), src_lang, dest_lang, service)
+        results = split_packed(texts, result)
+        if results is None:
+            self.pack_stats['fallbacks'] += 1
+            items = await asyncio.gather(*(self._translate_and_cache(text, src_lang, dest_lang, service)
+                                           for text in texts))
+            return dict(zip(texts, items))
+
+        self.pack_stats['packs'] += 1
+        self.pack_stats['packed_items'] += len(texts)
+        await self._cache_set(service, src_lang, dest_lang, results)
+        return results
+
+    async def translate_many(self, texts: list, src_lang: str = 'auto', dest_lang: str = 'zh') -> list:
+        """
+        并发翻译文本列表（相同文本只翻译一次，短文本合并请求，结果顺序与输入一致）
+
+        参数:
+            texts: 要翻译的文本列表
+            src_lang: 源语言
+            dest_lang: 目标语言
+
+        返回:
+            翻译结果列表
+        """
+        if not texts:
+            return []
+
+        service = self.config.get('translation', 'service', 'google')
+        unique = list(dict.fromkeys(texts))
+        translated = await self._cache_get(service, src_lang, dest_lang, [text for text in unique if text.strip()])
+        pending = [text for text in unique if text not in translated]
+
+        async def run(unit):
+            if isinstance(unit, list):
+                return await self._translate_packed(unit, src_lang, dest_lang, service)
+            # 缓存已在上面统一查找过，未命中的文本直接请求
+            return {unit: await self._translate_and_cache(unit, src_lang, dest_lang, service)}
+
+        # 并发数由每个主机的信号量和连接池大小限制
+        units = plan_units(self.config, pending, src_lang, service)
+        for part in await asyncio.gather(*(run(unit) for unit in units)):
+            translated.update(part)
+
+        return [dict(translated[text]) for text in texts]
+
+    def stats(self) -> Dict:
+        """返回请求数、合并请求和缓存统计"""
+        return {
+            'requests': self.requests,
+            'http2': self.http2,
+            'pack': dict(self.pack_stats),
+            'cache': self.cache.stats() if self.cache is not None else None
+        }
+
+    async def aclose(self) -> None:
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_limits.clear()
+
+    async def __aenter__(self) -> "AsyncTranslator":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
@@ -0,0 +1,242 @@
+"""
+OCR基准测试模块
+
+用PIL渲染中英文合成图像（不同字号、噪声和分辨率），通过OCRProcessor.recognize
+测试各引擎的吞吐量、延迟分位数、峰值内存和字符准确率。无需屏幕，可在无界面的Linux上运行。
+
+命令行用法:
+    python -m automod.benchmark --engines pytesseract paddleocr --langs en zh --json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import warnings
+from typing import Dict, List, Optional, Sequence
+
+from .config import AutoModConfig
+from .metrics import char_accuracy, latency_summary
+from .ocr import OCRProcessor
+from .render import find_font, render_text
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 测试语言：样本文本及各引擎对应的语言参数
+LANGUAGES = {
+    'en': {
+        'texts': [
+            'The quick brown fox jumps over the lazy dog',
+            'Start Game',
+            'Settings and Options 2048',
+            'Connection lost, retrying in 5 seconds',
+            'Level 12 Complete'
+        ],
+        'tesseract': 'eng',
+        'paddleocr': 'en'
+    },
+    'zh': {
+        'texts': [
+            '开始游戏',
+            '设置与选项',
+            '网络连接已断开，正在重试',
+            '恭喜通关第十二关',
+            '确认购买该道具吗'
+        ],
+        'tesseract': 'chi_sim',
+        'paddleocr': 'ch'
+    }
+}
+
+def generate_samples(langs: Sequence[str] = ('en', 'zh'), font_sizes: Sequence[int] = (14, 20, 32),
+                     noise_levels: Sequence[float] = (0.0, 20.0), scales: Sequence[float] = (1.0, 0.75),
+                     per_case: int = 2, seed: int = 0) -> List[Dict]:
+    """
+    生成合成测试样本
+
+    参数:
+        langs: 语言列表（LANGUAGES中的键）
+        font_sizes: 字号列表
+        noise_levels: 噪声标准差列表
+        scales: 分辨率缩放比例列表
+        per_case: 每种组合生成的样本数
+        seed: 随机种子，相同参数生成的样本完全一致
+
+    返回:
+        样本列表，每项包含 image, text, lang, font_size, noise, scale
+    """
+    rng = random.Random(seed)
+    samples = []
+    for lang in langs:
+        if lang not in LANGUAGES:
+            raise ValueError(f"不支持的测试语言: {lang}")
+        font_path = find_font(lang)
+        if font_path is None:
+            warnings.warn(f"未找到可渲染 {lang} 的字体，跳过该语言")
+            continue
+        for font_size in font_sizes:
+            for noise in noise_levels:
+                for scale in scales:
+                    for _ in range(per_case):
+                        text = rng.choice(LANGUAGES[lang]['texts'])
+                        samples.append({
+                            'image': render_text(text, font_path, font_size, noise, scale, rng.randrange(1 << 30)),
+                            'text': text,
+                            'lang': lang,
+                            'font_size': font_size,
+                            'noise': noise,
+                            'scale': scale
+                        })
+    return samples
+
+
+def peak_rss_mb() -> Optional[float]:
+    """当前进程（含子进程）的峰值常驻内存（MB），平台不支持时返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux单位为KB，macOS为字节
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _engine_lang(engine: str, lang: str) -> str:
+    """测试语言对应的引擎语言参数"""
+    key = 'paddleocr' if engine == 'paddleocr' else 'tesseract'
+    return LANGUAGES[lang][key]
+
+
+def _group_value(name: str):
+    """分组名 '维度=取值' 中的取值，数值维度按数值排序"""
+    value = name.split('=', 1)[1]
+    try:
+        return (0, float(value), '')
+    except ValueError:
+        return (1, 0.0, value)
+
+
+def _summarize(latencies: List[float], accuracies: List[float], elapsed: float) -> Dict:
+    """汇总一组样本的吞吐量、延迟和准确率"""
+    count = len(latencies)
+    return {
+        'images': count,
+        'images_per_sec': count / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': latency_summary(latencies),
+        'char_accuracy': sum(accuracies) / count if count else 0.0
+    }
+
+
+def run_benchmark(engines: Sequence[str], samples: Sequence[Dict],
+                  config: Optional[AutoModConfig] = None, warmup: int = 1) -> Dict:
+    """
+    对每个引擎运行基准测试
+
+    参数:
+        engines: 引擎名称列表
+        samples: generate_samples生成的样本
+        config: 基础配置（引擎和语言会被覆盖），为None时使用默认配置
+        warmup: 每种引擎/语言组合的预热次数（排除模型加载耗时）
+
+    返回:
+        报告字典，results中每个引擎包含总体和按语言、字号、噪声、缩放比例分组的统计；
+        引擎不可用时记录error并继续测试其余引擎
+    """
+    report = {'samples': len(samples), 'results': {}}
+    for engine in engines:
+        latencies: List[float] = []
+        accuracies: List[float] = []
+        groups: Dict[str, Dict[str, List[float]]] = {}
+        elapsed = 0.0
+        try:
+            for lang in sorted({sample['lang'] for sample in samples}):
+                lang_samples = [sample for sample in samples if sample['lang'] == lang]
+                ocr_config = AutoModConfig()
+                if config is not None:
+                    ocr_config.ocr_config.update(config.ocr_config)
+                # 每张图都真正执行识别，不使用帧差缓存和录制
+                ocr_config.update_ocr_config(engine=engine, lang=_engine_lang(engine, lang),
+                                             frame_cache=False, record_dir=None)
+                processor = OCRProcessor(ocr_config)
+                for sample in lang_samples[:warmup]:
+                    processor.recognize(sample['image'])
+
+                for sample in lang_samples:
+                    start = time.perf_counter()
+                    result = processor.recognize(sample['image'])
+                    latency = (time.perf_counter() - start) * 1000
+                    accuracy = char_accuracy(sample['text'], result['text'])
+                    elapsed += latency / 1000
+                    latencies.append(latency)
+                    accuracies.append(accuracy)
+                    for name in ('lang', 'font_size', 'noise', 'scale'):
+                        group = groups.setdefault(f"{name}={sample[name]}", {'latency': [], 'accuracy': []})
+                        group['latency'].append(latency)
+                        group['accuracy'].append(accuracy)
+        except Exception as e:
+            report['results'][engine] = {'error': str(e)}
+            continue
+
+        summary = _summarize(latencies, accuracies, elapsed)
+        summary['peak_rss_mb'] = peak_rss_mb()
+        # 按维度排列分组，同一维度内按取值排序
+        order = ('lang', 'font_size', 'noise', 'scale')
+        summary['groups'] = {
+            name: _summarize(groups[name]['latency'], groups[name]['accuracy'], sum(groups[name]['latency']) / 1000)
+            for name in sorted(groups, key=lambda n: (order.index(n.split('=')[0]), _group_value(n)))
+        }
+        report['results'][engine] = summary
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """将基准测试报告格式化为文本表格"""
+    header = f"{'引擎/分组':<24}{'图像数':>8}{'图像/秒':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'准确率':>9}{'峰值内存(MB)':>14}"
+    lines = [f"样本数: {report['samples']}", header, '-' * len(header)]
+
+    def row(name: str, stats: Dict) -> str:
+        rss = stats.get('peak_rss_mb')
+        return (f"{name:<24}{stats['images']:>8}{stats['images_per_sec']:>10.2f}"
+                f"{stats['latency_ms']['p50']:>10.1f}{stats['latency_ms']['p95']:>10.1f}"
+                f"{stats['char_accuracy']:>9.1%}{(f'{rss:.1f}' if rss is not None else '-'):>14}")
+
+    for engine, stats in report['results'].items():
+        if 'error' in stats:
+            lines.append(f"{engine:<24}失败: {stats['error']}")
+            continue
+        lines.append(row(engine, stats))
+        for name, group in stats['groups'].items():
+            lines.append(row(f"  {name}", group))
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='使用合成图像测试OCR引擎的速度和准确率')
+    parser.add_argument('--engines', nargs='+', default=['pytesseract', 'paddleocr'], help='测试的引擎')
+    parser.add_argument('--langs', nargs='+', default=['en', 'zh'], choices=sorted(LANGUAGES), help='测试的语言')
+    parser.add_argument('--font-sizes', nargs='+', type=int, default=[14, 20, 32], help='字号')
+    parser.add_argument('--noise', nargs='+', type=float, default=[0.0, 20.0], help='高斯噪声标准差')
+    parser.add_argument('--scales', nargs='+', type=float, default=[1.0, 0.75], help='分辨率缩放比例')
+    parser.add_argument('--per-case', type=int, default=2, help='每种组合的样本数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--config', help='AutoMod配置JSON文件（使用其中的OCR配置）')
+    parser.add_argument('--json', action='store_true', help='以JSON格式输出报告')
+    args = parser.parse_args(argv)
+
+    config = AutoModConfig()
+    if args.config:
+        config.load_from_json(args.config)
+    samples = generate_samples(args.langs, args.font_sizes, args.noise, args.scales, args.per_case, args.seed)
+    report = run_benchmark(args.engines, samples, config)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
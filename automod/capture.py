@@ -0,0 +1,203 @@
+"""
+屏幕截图模块
+
+提供可插拔的截图后端，直接返回截图缓冲区的numpy视图，减少整帧拷贝。
+"""
+
+import threading
+import time
+import cv2
+import numpy as np
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# 支持的输出布局
+LAYOUTS = ('bgr', 'bgra', 'gray')
+
+
+class CaptureBackend:
+    """截图后端基类"""
+
+    name = 'base'
+
+    def __init__(self):
+        """初始化截图后端"""
+        # 最近一次截图各阶段耗时（毫秒）
+        self.last_timings: Dict[str, float] = {}
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None, layout: str = 'bgr') -> np.ndarray:
+        """
+        截取屏幕
+
+        参数:
+            region: 可选的区域坐标 (x, y, width, height)
+            layout: 输出布局，可选 bgr, bgra, gray
+
+        返回:
+            指定布局的numpy数组
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"不支持的图像布局: {layout}")
+
+        start = time.perf_counter()
+        raw, raw_layout = self._grab_raw(region)
+        grabbed = time.perf_counter()
+        image = self._convert(raw, raw_layout, layout)
+        converted = time.perf_counter()
+
+        self.last_timings = {
+            'grab': (grabbed - start) * 1000,
+            'convert': (converted - grabbed) * 1000
+        }
+        return image
+
+    def _grab_raw(self, region: Optional[Tuple[int, int, int, int]]) -> Tuple[np.ndarray, str]:
+        """截取原始缓冲区，返回 (数组, 布局)，由子类实现"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _convert(image: np.ndarray, src: str, dest: str) -> np.ndarray:
+        """在布局之间转换，布局相同时直接返回原数组"""
+        if src == dest:
+            return image
+        codes = {
+            ('bgra', 'bgr'): cv2.COLOR_BGRA2BGR,
+            ('bgra', 'gray'): cv2.COLOR_BGRA2GRAY,
+            ('rgb', 'bgr'): cv2.COLOR_RGB2BGR,
+            ('rgb', 'bgra'): cv2.COLOR_RGB2BGRA,
+            ('rgb', 'gray'): cv2.COLOR_RGB2GRAY,
+            ('bgr', 'bgra'): cv2.COLOR_BGR2BGRA,
+            ('bgr', 'gray'): cv2.COLOR_BGR2GRAY,
+            ('gray', 'bgr'): cv2.COLOR_GRAY2BGR,
+            ('gray', 'bgra'): cv2.COLOR_GRAY2BGRA
+        }
+        return cv2.cvtColor(image, codes[(src, dest)])
+
+
+class MSSCapture(CaptureBackend):
+    """基于mss的截图后端（Linux下使用XShm/XGetImage，Windows下使用BitBlt）"""
+
+    name = 'mss'
+
+    def __init__(self, monitor: int = 1):
+        """
+        初始化mss截图后端
+
+        参数:
+            monitor: 全屏截图时使用的显示器编号，1为主显示器
+        """
+        super().__init__()
+        try:
+            import mss
+        except ImportError:
+            raise ImportError("请安装mss: pip install mss")
+        self._mss = mss
+        self.monitor = monitor
+        # mss实例不是线程安全的，每个线程使用独立实例
+        self._local = threading.local()
+
+    def _grab_raw(self, region: Optional[Tuple[int, int, int, int]]) -> Tuple[np.ndarray, str]:
+        """截取BGRA缓冲区并直接构造numpy视图（不拷贝像素数据）"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = self._mss.mss()
+            self._local.sct = sct
+
+        if region:
+            x, y, w, h = region
+            monitor = {'left': x, 'top': y, 'width': w, 'height': h}
+        else:
+            monitor = sct.monitors[self.monitor]
+
+        shot = sct.grab(monitor)
+        image = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return image, 'bgra'
+
+
+class PyAutoGUICapture(CaptureBackend):
+    """基于pyautogui的截图后端（兼容性最好）"""
+
+    name = 'pyautogui'
+
+    def __init__(self):
+        """初始化pyautogui截图后端"""
+        super().__init__()
+        try:
+            import pyautogui
+        except ImportError:
+            raise ImportError("请安装pyautogui: pip install pyautogui")
+        self._pyautogui = pyautogui
+
+    def _grab_raw(self, region: Optional[Tuple[int, int, int, int]]) -> Tuple[np.ndarray, str]:
+        """截取RGB图像"""
+        if region:
+            screenshot = self._pyautogui.screenshot(region=region)
+        else:
+            screenshot = self._pyautogui.screenshot()
+        return np.asarray(screenshot), 'rgb'
+
+
+class FakeCapture(CaptureBackend):
+    """内存截图后端，按顺序返回预先提供的帧，用于测试和离线回放"""
+
+    name = 'fake'
+
+    def __init__(self, frames: Union[np.ndarray, Iterable[np.ndarray]], loop: bool = True):
+        """
+        初始化内存截图后端
+
+        参数:
+            frames: 单帧或帧序列（BGR格式，整屏尺寸）
+            loop: 帧序列用完后是否从头循环，否则一直返回最后一帧
+        """
+        super().__init__()
+        if isinstance(frames, np.ndarray):
+            frames = [frames]
+        self.frames = list(frames)
+        if not self.frames:
+            raise ValueError("FakeCapture至少需要提供一帧图像")
+        self.loop = loop
+        self.index = 0
+
+    def push(self, frame: np.ndarray) -> "FakeCapture":
+        """追加一帧图像"""
+        self.frames.append(frame)
+        return self
+
+    def _grab_raw(self, region: Optional[Tuple[int, int, int, int]]) -> Tuple[np.ndarray, str]:
+        """返回当前帧（区域截图返回原帧的视图）"""
+        if self.index >= len(self.frames):
+            self.index = 0 if self.loop else len(self.frames) - 1
+        frame = self.frames[self.index]
+        self.index += 1
+
+        if region:
+            x, y, w, h = region
+            frame = frame[max(0, y):y + h, max(0, x):x + w]
+        return frame, 'gray' if frame.ndim == 2 else 'bgr'
+
+
+# 截图后端名称与实现类的对应关系
+CAPTURE_BACKENDS = {
+    'mss': MSSCapture,
+    'pyautogui': PyAutoGUICapture
+}
+
+
+def create_capture_backend(name: str = 'auto') -> CaptureBackend:
+    """
+    创建截图后端
+
+    参数:
+        name: 后端名称，可选 auto, mss, pyautogui；auto表示优先使用mss，不可用时回退到pyautogui
+
+    返回:
+        截图后端实例
+    """
+    if name == 'auto':
+        try:
+            return MSSCapture()
+        except ImportError:
+            return PyAutoGUICapture()
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"不支持的截图后端: {name}")
+    return CAPTURE_BACKENDS[name]()
@@ -13,10 +13,44 @@ class AutoModConfig:
     def __init__(self):
         # OCR 配置
         self.ocr_config = {
-            "engine": "pytesseract",  # 可选: pytesseract, paddleocr
+            "engine": "pytesseract",  # 可选: pytesseract, pytesseract_pool, tesserocr, paddleocr
             "lang": "chi_sim+eng",    # OCR识别语言
             "data_path": None,        # 自定义OCR数据路径
-            "confidence_threshold": 0.7  # 置信度阈值
+            "confidence_threshold": 0.7,  # 置信度阈值
+            "capture_backend": "auto",  # 截图后端: auto, mss, pyautogui
+            "preprocess": None,       # 预处理步骤列表，None表示灰度化+自适应阈值(11, 2)
+            "preprocess_profile": False,  # 是否统计每个预处理步骤的耗时
+            "phrase_gap": 1.0,        # 同一行内单词间距超过 行高×该值 时切分为不同短语
+            "columnar": False,        # pytesseract结果以列式数组(BoxArray)返回，按需生成字典
+            "text_detection": False,  # 识别前先检测文字区域，跳过空白区域
+            "text_detection_min_height": 6,  # 文字区域的最小高度（像素）
+            "text_detection_margin": 4,  # 文字区域向外扩展的像素
+            # 帧差缓存按缩小4倍的灰度图比较画面，单个像素灰度差超过12才计为变化，
+            # 细小的文字变化（如单个数字改变）可能被判定为未变化而返回旧结果；
+            # 需要感知这类变化时关闭frame_cache
+            "frame_cache": True,      # 画面未变化时复用上一次的识别结果
+            "frame_cache_size": 16,   # 帧差缓存的最大区域数量
+            "frame_cache_threshold": 0.0,  # 允许变化的像素比例（0表示签名中任一像素变化即重新识别）
+            "incremental": False,     # 全屏识别时只重新识别发生变化的区域
+            "incremental_tile": 64,   # 增量识别的分块边长（像素）
+            "incremental_max_ratio": 0.5,  # 变化块比例超过该值时执行全量识别
+            "pool_workers": None,     # pytesseract_pool 进程数，None表示CPU核心数
+            "pool_overlap": 48,       # 条带之间的重叠像素（应大于单行文字高度）
+            "pool_min_band": 256,     # 单个条带的最小高度（像素）
+            "record_dir": None,       # 识别录制目录，None表示不录制（录制结果可用 python -m automod.replay 回放）
+            "template_threshold": 0.85,  # 模板匹配的最低得分（归一化相关系数）
+            "template_max_per_text": 3,  # 每个文字保留的截图模板数量
+            "template_render": False,    # 尚未截取到文字时是否使用字体渲染的模板
+            "template_font_sizes": [14, 18, 24, 32],  # 渲染模板使用的字号
+            "track_margins": [16, 64],   # 位置跟踪时在上次位置周围逐级扩大的窗口边距（像素）
+            "track_max": 64,             # 最多跟踪的文字数量
+            "upright": False,            # 文字均为水平正向时设为True，PaddleOCR跳过方向分类
+            "paddle_det_cache": False,   # 静态布局下缓存PaddleOCR检测框，只执行识别
+            "paddle_det_refresh": 30,    # 检测框最多复用的帧数，超过后重新检测
+            "retry": False,              # 区域识别置信度不足时按重试变体依次重试（全屏识别不重试）
+            "retry_variants": None,      # 重试变体名称列表，None表示全部默认变体（见preprocess.RETRY_VARIANTS）
+            "retry_min_confidence": 0.8, # 识别结果的平均置信度（0-1）低于该值时重试
+            "retry_winners_max": 256     # 最多记住成功变体的区域数量，超出时淘汰最久未使用的区域
         }
         
         # 鼠标模拟配置
@@ -33,7 +67,30 @@ class AutoModConfig:
             "api_key": None,          # API密钥
             "api_secret": None,       # API密钥
             "timeout": 10,            # 超时时间（秒）
-            "proxy": None             # 代理设置
+            "proxy": None,            # 代理设置
+            "cache": True,            # 是否缓存翻译结果
+            "cache_size": 1024,       # 内存缓存条目数
+            "cache_ttl": 604800,      # 翻译结果有效期（秒），None表示永不过期
+            "cache_negative_ttl": 60, # 翻译失败结果的缓存时间（秒），0表示不缓存失败结果
+            "cache_path": None,       # SQLite缓存文件路径，None表示只使用内存缓存
+            "cache_max_disk_entries": 100000,  # SQLite缓存最多保存的条目数
+            "max_workers": 8,         # 批量翻译的并发请求数
+            "rate_limits": {          # 各服务的令牌桶限流：rate为每秒请求数，burst为最大突发请求数
+                "google": {"rate": 10, "burst": 10},
+                "baidu": {"rate": 1, "burst": 1},
+                "youdao": {"rate": 5, "burst": 5}
+            },
+            "pack": True,             # 批量翻译时将多条短文本合并为一个请求（按行分隔）
+            "pack_limits": {          # 各服务单个请求的最大字符数
+                "google": 1800,
+                "baidu": 2000,
+                "youdao": 1000
+            },
+            "pack_max_items": 64,     # 单个请求最多合并的文本数
+            "async_max_connections": 20,  # AsyncTranslator连接池的最大连接数
+            "async_max_keepalive": 10,    # AsyncTranslator保持的空闲长连接数
+            "async_per_host": 8,      # AsyncTranslator对同一主机的最大并发请求数
+            "http2": True             # AsyncTranslator是否启用HTTP/2（需安装httpx[http2]）
         }
         
     def update_ocr_config(self, **kwargs) -> "AutoModConfig":
@@ -4,11 +4,13 @@ AutoMod 核心模块
 整合OCR、鼠标模拟和翻译功能，提供统一的接口。
 """
 
+import copy
 from typing import Dict, Optional, Tuple, Union
 from .config import AutoModConfig
 from .ocr import OCRProcessor
 from .mouse import MouseSimulator
 from .translation import Translator
+from .template import TemplateLocator
 
 class AutoMod:
     """AutoMod主类，整合所有功能模块"""
@@ -21,10 +23,13 @@ class AutoMod:
         self.ocr = OCRProcessor(self.config)
         self.mouse = MouseSimulator(self.config)
         self.translator = Translator(self.config)
+        # 已知文字定位器（模板匹配优先，未命中时回退到OCR）
+        self.locator = TemplateLocator(self.ocr, self.config)
         
     def update_config(self, **kwargs) -> "AutoMod":
         """更新配置参数"""
         # 处理不同模块的配置更新
+        snapshot = self._snapshot_config()
         if 'ocr' in kwargs:
             self.config.update_ocr_config(**kwargs['ocr'])
         if 'mouse' in kwargs:
@@ -32,24 +37,40 @@ class AutoMod:
         if 'translation' in kwargs:
             self.config.update_translation_config(**kwargs['translation'])
         
-        # 重新初始化模块以应用新配置
-        self.ocr = OCRProcessor(self.config)
-        self.mouse = MouseSimulator(self.config)
-        self.translator = Translator(self.config)
+        # 仅重新初始化配置发生变化的模块
+        self._reload_changed(snapshot)
         
         return self
         
     def load_config(self, json_path: str) -> "AutoMod":
         """从JSON文件加载配置"""
+        snapshot = self._snapshot_config()
         self.config.load_from_json(json_path)
         
-        # 重新初始化模块
-        self.ocr = OCRProcessor(self.config)
-        self.mouse = MouseSimulator(self.config)
-        self.translator = Translator(self.config)
+        # 仅重新初始化配置发生变化的模块
+        self._reload_changed(snapshot)
         
         return self
         
+    def _snapshot_config(self) -> Dict:
+        """保存当前各模块配置的副本，用于检测配置变化"""
+        return {
+            'ocr': copy.deepcopy(self.config.ocr_config),
+            'mouse': copy.deepcopy(self.config.mouse_config),
+            'translation': copy.deepcopy(self.config.translation_config)
+        }
+        
+    def _reload_changed(self, snapshot: Dict) -> None:
+        """根据配置快照重新初始化配置发生变化的模块"""
+        if snapshot['ocr'] != self.config.ocr_config:
+            self.ocr = OCRProcessor(self.config)
+            # 模板来自屏幕内容，与OCR配置无关，保留已缓存的模板
+            self.locator.ocr = self.ocr
+        if snapshot['mouse'] != self.config.mouse_config:
+            self.mouse = MouseSimulator(self.config)
+        if snapshot['translation'] != self.config.translation_config:
+            self.translator = Translator(self.config)
+        
     def save_config(self, json_path: str) -> None:
         """将配置保存到JSON文件"""
         self.config.save_to_json(json_path)
@@ -82,6 +103,46 @@ class AutoMod:
         """
         return self.ocr.screenshot_and_recognize(region)
         
+    def screenshot_and_recognize_regions(self, regions: list) -> list:
+        """
+        截取一次屏幕并批量识别多个区域
+        
+        参数:
+            regions: (x, y, width, height) 区域坐标列表
+        
+        返回:
+            与regions一一对应的识别结果列表
+        """
+        return self.ocr.screenshot_and_recognize_regions(regions)
+        
+    def recognize_at_points(self, points: list, sizes: tuple = (30, 60)) -> list:
+        """
+        截取一次屏幕，识别多个坐标附近的文字（识别为空时自动扩大区域）
+        
+        参数:
+            points: 屏幕坐标列表 [(x, y), ...]
+            sizes: 候选区域半径（由小到大）
+        
+        返回:
+            与points一一对应的识别结果列表
+        """
+        return self.ocr.recognize_at_points(points, sizes)
+        
+    def locate_text(self, text: str, region: Optional[Tuple[int, int, int, int]] = None,
+                    min_confidence: float = 0.0) -> Optional[Dict]:
+        """
+        在屏幕上定位文字（已出现过的文字直接用模板匹配，只需几毫秒）
+        
+        参数:
+            text: 要查找的文字
+            region: 可选的查找区域 (x, y, width, height)
+            min_confidence: OCR回退时的最低置信度（0-1）
+        
+        返回:
+            文字框字典（屏幕坐标），未找到时返回None
+        """
+        return self.locator.locate(text, region, min_confidence=min_confidence)
+        
     # 鼠标模拟功能封装
     def move_mouse(self, x: int, y: int, duration: Optional[float] = None) -> "AutoMod":
         """移动鼠标到指定位置"""
@@ -194,21 +255,15 @@ class AutoMod:
         
     def set_ocr_engine(self, engine: str) -> "AutoMod":
         """设置OCR引擎"""
-        self.config.update_ocr_config(engine=engine)
-        self.ocr = OCRProcessor(self.config)
-        return self
+        return self.update_config(ocr={'engine': engine})
         
     def set_translation_service(self, service: str) -> "AutoMod":
         """设置翻译服务"""
-        self.config.update_translation_config(service=service)
-        self.translator = Translator(self.config)
-        return self
+        return self.update_config(translation={'service': service})
         
     def set_human_like_mouse(self, enable: bool) -> "AutoMod":
         """设置是否启用类人鼠标操作"""
-        self.config.update_mouse_config(human_like=enable)
-        self.mouse = MouseSimulator(self.config)
-        return self
+        return self.update_config(mouse={'human_like': enable})
         
     def __str__(self) -> str:
         """返回AutoMod实例的字符串表示"""
@@ -0,0 +1,101 @@
+"""
+帧差缓存模块
+
+根据画面像素差异判断截图是否发生变化，画面未变化时直接复用上一次的OCR结果。
+"""
+
+import threading
+import cv2
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class FrameCache:
+    """按区域缓存OCR结果的帧差缓存（LRU淘汰）"""
+
+    def __init__(self, max_size: int = 16, threshold: float = 0.0,
+                 pixel_tolerance: int = 12, downscale: int = 4):
+        """
+        初始化帧差缓存
+
+        参数:
+            max_size: 最多缓存的区域数量，超出时淘汰最久未使用的条目
+            threshold: 允许变化的像素比例，不超过该比例视为画面未变化
+            pixel_tolerance: 单个像素灰度差超过该值才计为变化，用于过滤噪声
+            downscale: 计算帧签名时的缩小倍数
+        """
+        self.max_size = max(1, int(max_size))
+        self.threshold = threshold
+        self.pixel_tolerance = pixel_tolerance
+        self.downscale = max(1, int(downscale))
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 统计计数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def signature(self, image: np.ndarray) -> np.ndarray:
+        """计算图像的帧签名（缩小后的灰度图）"""
+        if image.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            image = cv2.cvtColor(image, code)
+        if self.downscale > 1:
+            h, w = image.shape[:2]
+            size = (max(1, w // self.downscale), max(1, h // self.downscale))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        return image
+
+    def changed_ratio(self, a: np.ndarray, b: np.ndarray) -> float:
+        """计算两个帧签名之间发生变化的像素比例"""
+        if a.shape != b.shape:
+            return 1.0
+        diff = cv2.absdiff(a, b)
+        return np.count_nonzero(diff > self.pixel_tolerance) / diff.size
+
+    def lookup(self, key: Hashable, signature: np.ndarray) -> Optional[Any]:
+        """
+        查找缓存结果
+
+        参数:
+            key: 缓存键（通常为截图区域）
+            signature: 当前帧的签名
+
+        返回:
+            画面未变化时返回缓存的结果，否则返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.changed_ratio(entry[0], signature) <= self.threshold:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def store(self, key: Hashable, signature: np.ndarray, result: Any) -> None:
+        """保存识别结果"""
+        with self._lock:
+            self._entries[key] = (signature, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存（保留统计计数）"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """返回缓存命中统计"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'hit_rate': self.hits / total if total else 0.0
+        }
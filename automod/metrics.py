@@ -0,0 +1,66 @@
+"""
+指标计算模块
+
+提供延迟分位数、吞吐量和字符准确率等基准测试指标的计算函数。
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def latency_summary(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """
+    汇总延迟分布
+
+    参数:
+        latencies_ms: 每次调用的耗时（毫秒）
+
+    返回:
+        包含 mean, p50, p95, p99, max 的字典
+    """
+    if not latencies_ms:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    values = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(values.max())
+    }
+
+
+def edit_distance(a: str, b: str) -> int:
+    """计算两个字符串的编辑距离（Levenshtein距离）"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def char_accuracy(reference: str, hypothesis: str, ignore_space: bool = True) -> float:
+    """
+    计算字符准确率：1 - 编辑距离 / 参考文本长度（最低为0）
+
+    参数:
+        reference: 参考文本
+        hypothesis: 识别文本
+        ignore_space: 是否忽略空白字符（中文识别结果的空格没有意义）
+    """
+    if ignore_space:
+        reference = ''.join(reference.split())
+        hypothesis = ''.join(hypothesis.split())
+    if not reference:
+        return 1.0 if not hypothesis else 0.0
+    return max(0.0, 1.0 - edit_distance(reference, hypothesis) / len(reference))
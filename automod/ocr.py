@@ -4,10 +4,163 @@ OCR 模块
 提供图像文字识别功能，支持多种OCR引擎。
 """
 
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict
 import cv2
 import numpy as np
-from typing import Dict, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from .config import AutoModConfig
+from .frame_cache import FrameCache
+from .capture import CaptureBackend, create_capture_backend
+from .preprocess import DEFAULT_PIPELINE, RETRY_VARIANTS, PreprocessPipeline, compile_pipeline, with_scale
+from .replay import OCRRecorder
+from .result import BoxArray, OCRResult, confidence_scale, normalize_text
+from . import regions as rg
+
+# 进程级OCR引擎注册表，键为 (engine, lang, data_path, 引擎特有参数...)
+# 同一进程内的多个OCRProcessor共享已加载的引擎实例，避免重复加载模型
+_ENGINE_REGISTRY: Dict[Tuple[Any, ...], Any] = {}
+_ENGINE_REGISTRY_LOCK = threading.Lock()
+
+
+def _get_or_create_engine(key: Tuple[Any, ...], factory: Callable[[], Any]) -> Any:
+    """从注册表获取引擎实例，不存在时调用factory创建并缓存"""
+    with _ENGINE_REGISTRY_LOCK:
+        engine = _ENGINE_REGISTRY.get(key)
+        if engine is None:
+            engine = factory()
+            _ENGINE_REGISTRY[key] = engine
+        return engine
+
+
+def clear_engine_cache(engine_type: Optional[str] = None) -> None:
+    """
+    清空引擎注册表，释放已加载的模型
+    
+    参数:
+        engine_type: 仅清除指定类型的引擎，为None时清除全部
+    """
+    with _ENGINE_REGISTRY_LOCK:
+        for key in list(_ENGINE_REGISTRY):
+            if engine_type is None or key[0] == engine_type:
+                engine = _ENGINE_REGISTRY.pop(key)
+                # 进程池引擎需要关闭工作进程
+                if hasattr(engine, 'shutdown'):
+                    engine.shutdown(wait=False)
+
+
+def _tesseract_worker(image: np.ndarray, lang: str, config: str, tesseract_cmd: Optional[str]) -> Dict:
+    """进程池工作函数：在子进程中调用tesseract识别单张图像"""
+    import pytesseract
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    return pytesseract.image_to_data(image, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+
+
+class _TesserocrEngine:
+    """
+    基于tesserocr的常驻Tesseract引擎
+    
+    语言数据只在每个线程首次使用时加载一次，之后复用同一个API实例，
+    省去pytesseract每次调用启动tesseract进程、写临时文件和解析TSV的开销。
+    tesseract的API实例不是线程安全的，因此每个线程使用独立实例。
+    """
+    
+    def __init__(self, lang: str, data_path: Optional[str] = None):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self.data_path = data_path
+        self._local = threading.local()
+        self._apis = []
+        self._lock = threading.Lock()
+        
+    def _api(self):
+        """获取当前线程的API实例，不存在时创建"""
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            kwargs = {'lang': self.lang}
+            if self.data_path:
+                kwargs['path'] = self.data_path
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            self._local.api = api
+            with self._lock:
+                self._apis.append(api)
+        return api
+        
+    def image_to_data(self, image: np.ndarray) -> Dict:
+        """识别图像，返回与pytesseract.image_to_data(Output.DICT)相同结构的数据"""
+        tesserocr = self._tesserocr
+        RIL = tesserocr.RIL
+        api = self._api()
+        
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        if channels == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        elif channels == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+        api.Recognize()
+        
+        data = {key: [] for key in ('block_num', 'par_num', 'line_num', 'left', 'top',
+                                    'width', 'height', 'conf', 'text')}
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+            
+        # 根据迭代器所处的层级边界推算块、段落和行编号
+        block = par = line = 0
+        for word in tesserocr.iterate_level(iterator, RIL.WORD):
+            if word.IsAtBeginningOf(RIL.BLOCK):
+                block, par, line = block + 1, 0, 0
+            if word.IsAtBeginningOf(RIL.PARA):
+                par, line = par + 1, 0
+            if word.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1
+            bbox = word.BoundingBox(RIL.WORD)
+            text = word.GetUTF8Text(RIL.WORD)
+            if bbox is None or text is None:
+                continue
+            x1, y1, x2, y2 = bbox
+            data['block_num'].append(block)
+            data['par_num'].append(par)
+            data['line_num'].append(line)
+            data['left'].append(x1)
+            data['top'].append(y1)
+            data['width'].append(x2 - x1)
+            data['height'].append(y2 - y1)
+            data['conf'].append(word.Confidence(RIL.WORD))
+            data['text'].append(text)
+        return data
+        
+    def shutdown(self, wait: bool = True) -> None:
+        """释放所有线程创建的API实例"""
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis = []
+        self._local = threading.local()
+
+
+def _crop_quad(image: np.ndarray, quad: Any) -> np.ndarray:
+    """按四边形检测框透视裁剪出文字行图像（竖排文字旋转为横排）"""
+    points = np.asarray(quad, dtype=np.float32)
+    width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+    height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+    width, height = max(1, width), max(1, height)
+    target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    matrix = cv2.getPerspectiveTransform(points, target)
+    crop = cv2.warpPerspective(image, matrix, (width, height),
+                               borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+    if height / width >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
 
 class OCRProcessor:
     """OCR处理器，用于图像文字识别"""
@@ -15,36 +168,153 @@ class OCRProcessor:
     def __init__(self, config: Optional[AutoModConfig] = None):
         """初始化OCR处理器"""
         self.config = config or AutoModConfig()
+        # 最近一次识别的耗时、重试和检测统计按线程分别保存，多个线程同时识别时互不覆盖
+        self._local = threading.local()
+        # 截图后端和增量识别状态不支持并发访问
+        self._capture_lock = threading.Lock()
+        self._incremental_lock = threading.Lock()
         self.engine = None
         self._init_engine()
         
-    def _init_engine(self):
-        """初始化OCR引擎"""
-        engine_type = self.config.get('ocr', 'engine', 'pytesseract')
+        # 帧差缓存：画面未变化时复用上一次的识别结果
+        self.frame_cache = None
+        if self.config.get('ocr', 'frame_cache', True):
+            self.frame_cache = FrameCache(
+                max_size=self.config.get('ocr', 'frame_cache_size', 16),
+                threshold=self.config.get('ocr', 'frame_cache_threshold', 0.0)
+            )
+            
+        # 识别录制：配置record_dir后将截图识别的帧和结果保存到该目录，供replay回放
+        self.recorder = None
+        record_dir = self.config.get('ocr', 'record_dir', None)
+        if record_dir:
+            self.recorder = OCRRecorder(record_dir)
+            
+        # 增量识别状态：(上一帧灰度图, 上一帧识别结果, 配置指纹)
+        self._incremental_state = None
+        
+        # 各坐标上次识别成功时使用的区域半径
+        self._point_sizes: Dict[Tuple[int, int], int] = {}
+        
+        # 识别重试：区域 -> 上次成功的变体名称，下次优先尝试该变体（按最近使用排序）
+        self._retry_winners: "OrderedDict[Any, str]" = OrderedDict()
+        self._retry_lock = threading.Lock()
+        self._retry_stats = {'calls': 0, 'attempts': 0, 'first_try_hits': 0, 'failures': 0}
+        
+        # PaddleOCR检测框缓存：画面尺寸 -> {'quads': 检测框, 'age': 已复用帧数}
+        self._paddle_det_cache: Dict[Tuple[int, ...], Dict] = {}
+        self._paddle_det_stats = {'detections': 0, 'cache_hits': 0, 'invalidations': 0}
+        # recognize_frame可在多个线程中同时调用，检测框缓存和统计需加锁
+        self._paddle_lock = threading.Lock()
+        
+        # 文字位置跟踪：规范化文字 -> 上次找到时的屏幕矩形（按最近使用排序）
+        self._tracks: "OrderedDict[str, Tuple[int, int, int, int]]" = OrderedDict()
+        self._track_lock = threading.Lock()
+        self._track_stats = {'window_hits': 0, 'window_misses': 0, 'full_hits': 0, 'misses': 0}
+        
+        # 截图后端在首次截图时创建，纯图像识别场景无需依赖屏幕
+        self._capture = None
+    @property
+    def last_timings(self) -> Dict[str, float]:
+        """当前线程最近一次识别各阶段耗时（毫秒）"""
+        return self._local.__dict__.setdefault('timings', {})
+        
+    @last_timings.setter
+    def last_timings(self, value: Dict[str, float]) -> None:
+        self._local.timings = value
+        
+    @property
+    def last_retry(self) -> Dict[str, Any]:
+        """当前线程最近一次重试的变体和尝试次数"""
+        return self._local.__dict__.setdefault('retry', {})
+        
+    @last_retry.setter
+    def last_retry(self, value: Dict[str, Any]) -> None:
+        self._local.retry = value
+        
+    @property
+    def last_detection_stats(self) -> Dict[str, float]:
+        """当前线程最近一次文字区域检测的统计（跳过的像素比例等）"""
+        return self._local.__dict__.setdefault('detection_stats', {})
+        
+    @last_detection_stats.setter
+    def last_detection_stats(self, value: Dict[str, float]) -> None:
+        self._local.detection_stats = value
+        
+    @property
+    def capture(self) -> CaptureBackend:
+        """当前使用的截图后端"""
+        if self._capture is None:
+            self._capture = create_capture_backend(self.config.get('ocr', 'capture_backend', 'auto'))
+        return self._capture
+        
+    @capture.setter
+    def capture(self, backend: CaptureBackend) -> None:
+        """替换截图后端（例如在测试中使用FakeCapture）"""
+        self._capture = backend
+        
+    def _init_engine(self, engine_type: Optional[str] = None):
+        """初始化OCR引擎（优先复用注册表中已加载的实例）"""
+        engine_type = engine_type or self.config.get('ocr', 'engine', 'pytesseract')
+        lang = self.config.get('ocr', 'lang', 'chi_sim+eng')
+        data_path = self.config.get('ocr', 'data_path', None)
+        key = (engine_type, lang, data_path)
+        # 实际使用的引擎类型（tesserocr不可用时会回退到pytesseract）
+        self.engine_type = engine_type
+        # PaddleOCR是否支持分阶段调用（检测、方向分类、识别）
+        self._paddle_staged = False
         
         if engine_type == 'pytesseract':
             try:
                 import pytesseract
-                self.engine = pytesseract
+                self.engine = _get_or_create_engine(key, lambda: pytesseract)
                 # 检查tesseract命令路径配置
                 if hasattr(self.config, 'tesseract_cmd') and self.config.tesseract_cmd:
                     pytesseract.pytesseract.tesseract_cmd = self.config.tesseract_cmd
             except ImportError:
                 raise ImportError("请安装pytesseract: pip install pytesseract")
+        elif engine_type == 'pytesseract_pool':
+            try:
+                import pytesseract  # noqa: F401  子进程中使用
+            except ImportError:
+                raise ImportError("请安装pytesseract: pip install pytesseract")
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool_workers = self.config.get('ocr', 'pool_workers', None) or os.cpu_count() or 1
+            # 进程数不同的进程池不能共用
+            self.engine = _get_or_create_engine(key + (self._pool_workers,),
+                                                lambda: ProcessPoolExecutor(max_workers=self._pool_workers))
+        elif engine_type == 'tesserocr':
+            try:
+                self.engine = _get_or_create_engine(key, lambda: _TesserocrEngine(lang, data_path))
+            except ImportError:
+                warnings.warn("未安装tesserocr，回退到pytesseract引擎（pip install tesserocr）")
+                self._init_engine('pytesseract')
         elif engine_type == 'paddleocr':
             try:
                 from paddleocr import PaddleOCR
-                self.engine = PaddleOCR(
-                    use_angle_cls=True,
+                # 文字均为水平正向时不加载方向分类模型
+                upright = self.config.get('ocr', 'upright', False)
+                self.engine = _get_or_create_engine(key + (upright,), lambda: PaddleOCR(
+                    use_angle_cls=not upright,
                     lang=self.config.get('ocr', 'lang', 'ch').replace('+', '_'),
                     use_gpu=False
-                )
+                ))
+                # 分阶段调用依赖PaddleOCR的内部属性，不同版本不一定提供
+                self._paddle_staged = all(callable(getattr(self.engine, name, None))
+                                          for name in ('text_detector', 'text_recognizer'))
             except ImportError:
                 raise ImportError("请安装paddleocr: pip install paddleocr")
         else:
             raise ValueError(f"不支持的OCR引擎: {engine_type}")
             
-    def recognize(self, image: Union[str, np.ndarray]) -> Dict:
+    def _tesseract_config(self) -> str:
+        """生成传递给tesseract的额外命令行参数"""
+        data_path = self.config.get('ocr', 'data_path', None)
+        if data_path:
+            return f'--tessdata-dir "{data_path}"'
+        return ''
+            
+    def recognize(self, image: Union[str, np.ndarray]) -> OCRResult:
         """
         识别图像中的文字
         
@@ -52,42 +322,127 @@ class OCRProcessor:
             image: 图像路径或numpy数组
         
         返回:
-            包含识别结果的字典
+            包含识别结果的OCRResult（dict子类，可用find()查找文字）
         """
-        # 加载图像
-        if isinstance(image, str):
+        # 加载图像（传入的数组不会被修改，预处理在需要时自行拷贝）
+        owned = isinstance(image, str)
+        if owned:
             img = cv2.imread(image)
             if img is None:
                 raise FileNotFoundError(f"无法加载图像: {image}")
         else:
-            img = image.copy()
+            img = image
+            
+        # 先检测可能包含文字的区域，只识别这些区域
+        if self.config.get('ocr', 'text_detection', False):
+            return self._recognize_detected(img)
             
         # 图像预处理
-        img = self._preprocess_image(img)
+        start = time.perf_counter()
+        img = self._preprocess_image(img, owned)
+        preprocessed = time.perf_counter()
+        
+        result = self._run_engine(img)
+        
+        self.last_timings['preprocess'] = (preprocessed - start) * 1000
+        self.last_timings['recognize'] = (time.perf_counter() - preprocessed) * 1000
+        return result
+        
+    def _recognize_detected(self, image: np.ndarray) -> OCRResult:
+        """
+        文字区域检测 + 区域识别
         
-        # 使用不同引擎进行识别
-        engine_type = self.config.get('ocr', 'engine', 'pytesseract')
+        使用形态学梯度和连通域快速找出可能包含文字的区域，
+        空白区域不送入OCR引擎，识别结果的坐标映射回整图。
+        """
+        start = time.perf_counter()
+        gray = image if image.ndim == 2 else cv2.cvtColor(
+            image, cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+        rects = rg.detect_text_regions(
+            gray,
+            min_height=self.config.get('ocr', 'text_detection_min_height', 6),
+            margin=self.config.get('ocr', 'text_detection_margin', 4)
+        )
+        detected = time.perf_counter()
+        
+        result = self._recognize_rects(image, rects)
+        
+        total = gray.shape[0] * gray.shape[1]
+        scanned = sum(w * h for _, _, w, h in rects)
+        self.last_detection_stats = {
+            'regions': len(rects),
+            'pixels_total': total,
+            'pixels_scanned': scanned,
+            'pixels_skipped': total - scanned,
+            'skipped_ratio': (total - scanned) / total if total else 0.0
+        }
+        self.last_timings['detect'] = (detected - start) * 1000
+        self.last_timings['recognize'] = (time.perf_counter() - detected) * 1000
+        return result
+        
+    def _run_engine(self, image: np.ndarray) -> OCRResult:
+        """使用当前配置的引擎识别已预处理的图像"""
+        engine_type = self.engine_type
         confidence_threshold = self.config.get('ocr', 'confidence_threshold', 0.7)
         
         if engine_type == 'pytesseract':
-            return self._recognize_with_pytesseract(img, confidence_threshold)
+            result = self._recognize_with_pytesseract(image, confidence_threshold)
+        elif engine_type == 'tesserocr':
+            result = self._recognize_with_tesserocr(image, confidence_threshold)
+        elif engine_type == 'pytesseract_pool':
+            result = self._recognize_with_pytesseract_pool(image, confidence_threshold)
         elif engine_type == 'paddleocr':
-            return self._recognize_with_paddleocr(img, confidence_threshold)
-            
-    def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
-        """图像预处理"""
-        # 转换为灰度图
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # 自适应阈值处理
-        thresh = cv2.adaptiveThreshold(
-            gray, 255, 
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY, 
-            11, 2
-        )
+            result = self._recognize_with_paddleocr(image, confidence_threshold)
+        else:
+            raise ValueError(f"不支持的OCR引擎: {engine_type}")
+            
+        return self._group(OCRResult(result))
+        
+    def _group(self, result: OCRResult) -> OCRResult:
+        """构建行级和短语级文字框"""
+        return result.group(self.config.get('ocr', 'phrase_gap', 1.0))
+            
+    @property
+    def pipeline(self) -> PreprocessPipeline:
+        """根据ocr_config中的preprocess配置获取编译后的预处理流水线"""
+        stages = self.config.get('ocr', 'preprocess', None)
+        if stages is None and self.engine_type == 'paddleocr':
+            # PaddleOCR自带检测模型，直接使用原始彩色/灰度图，默认不做二值化
+            stages = []
+        return compile_pipeline(stages, self.config.get('ocr', 'preprocess_profile', False))
+        
+    def _preprocess_image(self, image: np.ndarray, owned: bool = False) -> np.ndarray:
+        """
+        图像预处理
+        
+        参数:
+            image: 输入图像（BGR、BGRA或灰度图）
+            owned: 是否允许原地修改image
+        """
+        pipeline = self.pipeline
+        result = pipeline(image, owned)
+        if pipeline.profile:
+            for stage, ms in pipeline.last_timings.items():
+                self.last_timings[f'preprocess.{stage}'] = ms
+        return result
+        
+    def benchmark_preprocess(self, image: Union[str, np.ndarray], runs: int = 20) -> Dict:
+        """
+        测量当前预处理流水线各步骤的平均耗时
         
-        return thresh
+        参数:
+            image: 图像路径或numpy数组
+            runs: 重复执行次数
+        
+        返回:
+            {步骤: {'calls', 'total_ms', 'avg_ms'}} 字典
+        """
+        if isinstance(image, str):
+            img = cv2.imread(image)
+            if img is None:
+                raise FileNotFoundError(f"无法加载图像: {image}")
+            image = img
+        return self.pipeline.benchmark(image, runs)
         
     def _recognize_with_pytesseract(self, image: np.ndarray, confidence_threshold: float) -> Dict:
         """使用pytesseract进行OCR识别"""
@@ -96,69 +451,153 @@ class OCRProcessor:
             data = self.engine.image_to_data(
                 image, 
                 lang=self.config.get('ocr', 'lang', 'chi_sim+eng'),
+                config=self._tesseract_config(),
                 output_type=self.engine.Output.DICT
             )
             
-            # 提取有效结果
-            text = ""
-            boxes = []
+            boxes = self._parse_tesseract_data(
+                data, confidence_threshold,
+                columnar=self.config.get('ocr', 'columnar', False)
+            )
             
-            for i in range(len(data['text'])):
-                confidence = float(data['conf'][i])
-                if confidence > confidence_threshold and data['text'][i].strip():
-                    text += data['text'][i] + " "
-                    # 获取边界框
-                    x, y, w, h = (
-                        data['left'][i], 
-                        data['top'][i], 
-                        data['width'][i], 
-                        data['height'][i]
-                    )
-                    boxes.append({
-                        'x': x, 'y': y, 'width': w, 'height': h,
-                        'text': data['text'][i],
-                        'confidence': confidence
-                    })
-                    
             return {
-                'text': text.strip(),
+                'text': ' '.join(box['text'] for box in boxes) if isinstance(boxes, list) else ' '.join(boxes.text),
                 'boxes': boxes,
                 'engine': 'pytesseract'
             }
         except Exception as e:
             raise RuntimeError(f"pytesseract OCR识别失败: {str(e)}")
             
+    def _recognize_with_tesserocr(self, image: np.ndarray, confidence_threshold: float) -> Dict:
+        """使用常驻的tesserocr引擎进行OCR识别"""
+        try:
+            data = self.engine.image_to_data(image)
+            boxes = self._parse_tesseract_data(
+                data, confidence_threshold,
+                columnar=self.config.get('ocr', 'columnar', False)
+            )
+            
+            return {
+                'text': ' '.join(box['text'] for box in boxes) if isinstance(boxes, list) else ' '.join(boxes.text),
+                'boxes': boxes,
+                'engine': 'tesserocr'
+            }
+        except Exception as e:
+            raise RuntimeError(f"tesserocr OCR识别失败: {str(e)}")
+            
+    def _parse_tesseract_data(self, data: Dict, confidence_threshold: float, offset_y: int = 0,
+                              line_base: int = 0, columnar: bool = False) -> Union[List[Dict], BoxArray]:
+        """
+        从image_to_data的输出中提取置信度达标的文字框
+        
+        筛选以numpy数组运算完成。每个文字框的 'line' 字段为行编号，
+        由 (block_num, par_num, line_num) 映射而来并从line_base开始递增，
+        用于后续构建行级和短语级文字框。
+        
+        参数:
+            columnar: 为True时返回列式存储的BoxArray，否则返回字典列表
+        """
+        boxes = BoxArray.from_tesseract(data, confidence_threshold, offset_y, line_base)
+        return boxes if columnar else boxes.to_list()
+        
+    def _submit_tesseract(self, image: np.ndarray):
+        """向进程池提交一次tesseract识别任务"""
+        return self.engine.submit(
+            _tesseract_worker,
+            image,
+            self.config.get('ocr', 'lang', 'chi_sim+eng'),
+            self._tesseract_config(),
+            getattr(self.config, 'tesseract_cmd', None)
+        )
+        
+    def _recognize_with_pytesseract_pool(self, image: np.ndarray, confidence_threshold: float) -> Dict:
+        """
+        使用进程池并行运行tesseract
+        
+        将图像切分为相互重叠的水平条带并分发到各工作进程，
+        每个条带只保留中心点落在自身负责范围内的文字框，重叠区内的重复结果由此去除。
+        """
+        try:
+            height = image.shape[0]
+            overlap = self.config.get('ocr', 'pool_overlap', 48)
+            band = max(self.config.get('ocr', 'pool_min_band', 256), -(-height // self._pool_workers))
+            
+            # 各条带负责的纵向范围 [start, end)，实际识别范围向上下各扩展overlap像素
+            futures = []
+            for start in range(0, height, band):
+                end = min(height, start + band)
+                top, bottom = max(0, start - overlap), min(height, end + overlap)
+                futures.append((start, end, top, self._submit_tesseract(image[top:bottom])))
+                
+            boxes = []
+            line_base = 0
+            for start, end, top, future in futures:
+                data = future.result()
+                for box in self._parse_tesseract_data(data, confidence_threshold, offset_y=top, line_base=line_base):
+                    if start <= box['y'] + box['height'] / 2 < end:
+                        boxes.append(box)
+                # 各条带的行编号互不重叠
+                line_base += len(data['text'])
+                        
+            # 兜底去重：相同文字且高度重叠的框只保留一个
+            unique = []
+            for box in boxes:
+                rect = rg.box_rect(box)
+                if not any(other['text'] == box['text'] and rg.iou(rect, rg.box_rect(other)) > 0.5
+                           for other in unique):
+                    unique.append(box)
+                    
+            return {
+                'text': ' '.join(box['text'] for box in unique),
+                'boxes': BoxArray.from_list(unique) if self.config.get('ocr', 'columnar', False) else unique,
+                'engine': 'pytesseract_pool'
+            }
+        except Exception as e:
+            raise RuntimeError(f"pytesseract进程池OCR识别失败: {str(e)}")
+            
     def _recognize_with_paddleocr(self, image: np.ndarray, confidence_threshold: float) -> Dict:
-        """使用paddleocr进行OCR识别"""
+        """使用paddleocr进行OCR识别（检测、方向分类和识别分阶段执行）"""
         try:
-            # PaddleOCR需要RGB图像
-            img_rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+            # PaddleOCR内部使用BGR，灰度图和BGR图原样传入，只去掉截图的alpha通道
+            if image.ndim == 3 and image.shape[2] == 4:
+                image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+            use_cls = not self.config.get('ocr', 'upright', False)
             
-            # 执行识别
-            result = self.engine.ocr(img_rgb, cls=True)
+            lines = None
+            if self._paddle_staged:
+                try:
+                    lines = self._paddle_stages(image, use_cls, confidence_threshold)
+                except (AttributeError, TypeError) as e:
+                    # 内部接口与当前版本不一致，之后改为整体识别
+                    warnings.warn(f"PaddleOCR不支持分阶段识别，改用整体识别: {str(e)}")
+                    self._paddle_staged = False
+            if lines is None:
+                # 不支持分阶段调用的版本，整体识别
+                start = time.perf_counter()
+                result = self.engine.ocr(image, cls=use_cls)
+                self.last_timings['paddle.total'] = (time.perf_counter() - start) * 1000
+                lines = [(box, txt, confidence) for line in result if line
+                         for box, (txt, confidence) in line]
             
             # 处理结果
             text = ""
             boxes = []
-            
-            for line in result:
-                if line is None:
-                    continue
-                for box_info in line:
-                    box, (txt, confidence) = box_info
-                    if confidence > confidence_threshold and txt.strip():
-                        text += txt + " "
-                        # 转换边界框格式
-                        x1, y1 = box[0]
-                        x3, y3 = box[2]
-                        boxes.append({
-                            'x': int(x1), 
-                            'y': int(y1), 
-                            'width': int(x3 - x1), 
-                            'height': int(y3 - y1),
-                            'text': txt,
-                            'confidence': confidence
-                        })
+            for quad, txt, confidence in lines:
+                if confidence > confidence_threshold and txt.strip():
+                    text += txt + " "
+                    # 四边形检测框转换为外接矩形
+                    xs = [point[0] for point in quad]
+                    ys = [point[1] for point in quad]
+                    boxes.append({
+                        'x': int(min(xs)),
+                        'y': int(min(ys)),
+                        'width': int(max(xs) - min(xs)),
+                        'height': int(max(ys) - min(ys)),
+                        'text': txt,
+                        'confidence': float(confidence),
+                        # PaddleOCR的每个结果本身就是一行文字
+                        'line': len(boxes)
+                    })
                         
             return {
                 'text': text.strip(),
@@ -168,6 +607,82 @@ class OCRProcessor:
         except Exception as e:
             raise RuntimeError(f"paddleocr OCR识别失败: {str(e)}")
             
+    def _paddle_stages(self, image: np.ndarray, use_cls: bool, confidence_threshold: float,
+                       allow_cached: bool = True) -> List[Tuple[Any, str, float]]:
+        """
+        分阶段执行PaddleOCR：检测（可复用缓存的检测框）→ 方向分类（可跳过）→ 批量识别
+        
+        返回:
+            [(四边形检测框, 文字, 置信度), ...]
+        """
+        # 检测模型需要三通道输入
+        bgr = image if image.ndim == 3 else cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        
+        start = time.perf_counter()
+        quads, cached = self._paddle_detect(bgr, allow_cached)
+        detected = time.perf_counter()
+        crops = [_crop_quad(bgr, quad) for quad in quads]
+        cropped = time.perf_counter()
+        if use_cls and crops and getattr(self.engine, 'text_classifier', None) is not None:
+            crops, _, _ = self.engine.text_classifier(crops)
+        classified = time.perf_counter()
+        rec_res = self.engine.text_recognizer(crops)[0] if crops else []
+        finished = time.perf_counter()
+        
+        self.last_timings['paddle.det'] = (detected - start) * 1000
+        self.last_timings['paddle.crop'] = (cropped - detected) * 1000
+        self.last_timings['paddle.cls'] = (classified - cropped) * 1000
+        self.last_timings['paddle.rec'] = (finished - classified) * 1000
+        
+        lines = [(quad, txt, confidence) for quad, (txt, confidence) in zip(quads, rec_res)]
+        # 缓存的检测框上识别不到任何文字，说明布局已变化，重新检测
+        if cached and not any(confidence > confidence_threshold and txt.strip() for _, txt, confidence in lines):
+            with self._paddle_lock:
+                self._paddle_det_stats['invalidations'] += 1
+                self._paddle_det_cache.pop(bgr.shape, None)
+            return self._paddle_stages(image, use_cls, confidence_threshold, allow_cached=False)
+        return lines
+        
+    def _paddle_detect(self, image: np.ndarray, allow_cached: bool = True) -> Tuple[List[np.ndarray], bool]:
+        """
+        文字检测；开启paddle_det_cache时，相同尺寸的画面在paddle_det_refresh帧内复用检测框
+        
+        返回:
+            (按阅读顺序排列的四边形检测框列表, 是否来自缓存)
+        """
+        use_cache = self.config.get('ocr', 'paddle_det_cache', False)
+        key = image.shape
+        if use_cache and allow_cached:
+            with self._paddle_lock:
+                entry = self._paddle_det_cache.get(key)
+                if entry is not None and entry['age'] < self.config.get('ocr', 'paddle_det_refresh', 30):
+                    entry['age'] += 1
+                    self._paddle_det_stats['cache_hits'] += 1
+                    return entry['quads'], True
+                
+        dt_boxes = self.engine.text_detector(image)[0]
+        quads = [] if dt_boxes is None else list(dt_boxes)
+        # 按从上到下、从左到右排序（纵坐标相差10像素以内视为同一行）
+        quads.sort(key=lambda quad: (int(quad[0][1] // 10), quad[0][0]))
+        with self._paddle_lock:
+            self._paddle_det_stats['detections'] += 1
+            if use_cache:
+                self._paddle_det_cache[key] = {'quads': quads, 'age': 0}
+        return quads, False
+        
+    def paddle_det_stats(self) -> Dict:
+        """返回PaddleOCR检测框缓存的统计（检测次数、缓存命中次数、因布局变化失效的次数）"""
+        with self._paddle_lock:
+            stats = dict(self._paddle_det_stats)
+        total = stats['detections'] + stats['cache_hits']
+        stats['hit_rate'] = stats['cache_hits'] / total if total else 0.0
+        return stats
+        
+    def clear_paddle_det_cache(self) -> None:
+        """清除缓存的PaddleOCR检测框（画面布局切换时调用）"""
+        with self._paddle_lock:
+            self._paddle_det_cache.clear()
+            
     def recognize_region(self, image: Union[str, np.ndarray], region: Tuple[int, int, int, int]) -> Dict:
         """
         识别图像中指定区域的文字
@@ -191,9 +706,175 @@ class OCRProcessor:
         x, y, w, h = region
         region_img = img[y:y+h, x:x+w]
         
-        # 识别区域文字
+        # 识别区域文字（开启重试时置信度不足则按重试变体重新识别）
+        if self.config.get('ocr', 'retry', False):
+            return self.recognize_with_retry(region_img, tuple(region))
         return self.recognize(region_img)
         
+    def recognize_regions(self, image: Optional[Union[str, np.ndarray]], regions: Sequence[Tuple[int, int, int, int]],
+                          keys: Optional[Sequence[Any]] = None, retry: bool = True) -> List[Dict]:
+        """
+        批量识别同一图像中的多个区域
+        
+        所有区域在同一帧上裁剪，拼接后只调用一次OCR引擎；
+        开启retry时，置信度不足的区域再单独按重试变体识别。
+        
+        参数:
+            image: 图像路径或numpy数组，为None时截取一次全屏
+            regions: (x, y, width, height) 区域坐标列表
+            keys: 各区域的重试标识（用于记住成功的变体），为None时使用区域坐标
+            retry: 为False时即使开启retry也不重试（全屏识别内部拆分出的区域使用）
+        
+        返回:
+            与regions一一对应的识别结果列表，边界框坐标相对于各自区域
+        """
+        if not regions:
+            return []
+            
+        if image is None:
+            img = self._grab_screen()
+        elif isinstance(image, str):
+            img = cv2.imread(image)
+            if img is None:
+                raise FileNotFoundError(f"无法加载图像: {image}")
+        else:
+            img = image
+            
+        # 裁剪并预处理各区域（裁剪结果为原图视图，预处理会生成新数组）
+        raw_crops = [self._crop(img, region) for region in regions]
+        crops = [self._preprocess_image(crop) if crop.size else None for crop in raw_crops]
+        results = self._recognize_batch(crops)
+        
+        # 置信度不足的区域在同一帧上单独重试（批量识别的结果作为原始变体的结果）
+        if retry and self.config.get('ocr', 'retry', False):
+            keys = keys if keys is not None else [tuple(region) for region in regions]
+            for i, (crop, result) in enumerate(zip(raw_crops, results)):
+                if crop.size and self._retry_needed(result):
+                    results[i] = self.recognize_with_retry(crop, keys[i], first=result)
+        
+        # 区域超出图像边界被截断时，将坐标修正为相对于原始区域
+        for region, result in zip(regions, results):
+            dx, dy = max(0, -region[0]), max(0, -region[1])
+            if dx or dy:
+                if isinstance(result['boxes'], BoxArray):
+                    result['boxes'].offset(dx, dy)
+                else:
+                    for box in result['boxes']:
+                        box['x'] += dx
+                        box['y'] += dy
+                self._group(result)
+                    
+        return results
+        
+    def _crop(self, image: np.ndarray, region: Tuple[int, int, int, int]) -> np.ndarray:
+        """按区域裁剪图像，区域超出图像边界时自动截断"""
+        x, y, w, h = region
+        height, width = image.shape[:2]
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(width, x + w), min(height, y + h)
+        if x2 <= x1 or y2 <= y1:
+            return image[0:0, 0:0]
+        return image[y1:y2, x1:x2]
+        
+    def _recognize_batch(self, images: List[Optional[np.ndarray]], gap: int = 20) -> List[Dict]:
+        """将多张预处理后的图像纵向拼接为一张画布，一次引擎调用后按位置拆分结果"""
+        engine_type = self.engine_type
+        results = [OCRResult(text='', boxes=[], engine=engine_type) for _ in images]
+        valid = [i for i, img in enumerate(images) if img is not None]
+        
+        if not valid:
+            return results
+        if engine_type == 'pytesseract_pool':
+            # 进程池引擎直接将各区域分发到不同工作进程并行识别
+            confidence_threshold = self.config.get('ocr', 'confidence_threshold', 0.7)
+            futures = [(i, self._submit_tesseract(images[i])) for i in valid]
+            for i, future in futures:
+                boxes = self._parse_tesseract_data(future.result(), confidence_threshold,
+                                                   columnar=self.config.get('ocr', 'columnar', False))
+                results[i]['boxes'] = boxes
+                results[i]['text'] = ' '.join(box['text'] for box in boxes)
+                self._group(results[i])
+            return results
+        if len(valid) == 1:
+            results[valid[0]] = self._run_engine(images[valid[0]])
+            return results
+            
+        # 构建白底画布，各区域之间留出空白间隔，避免相邻区域的文字被合并
+        width = max(images[i].shape[1] for i in valid) + gap * 2
+        height = sum(images[i].shape[0] for i in valid) + gap * (len(valid) + 1)
+        canvas = np.full((height, width) + images[valid[0]].shape[2:], 255, dtype=np.uint8)
+        
+        offsets = []
+        y = gap
+        for i in valid:
+            h, w = images[i].shape[:2]
+            canvas[y:y+h, gap:gap+w] = images[i]
+            offsets.append((i, y, h))
+            y += h + gap
+            
+        combined = self._run_engine(canvas)
+        
+        # 根据边界框中心点所在的纵向区间将结果分配回各区域
+        texts = {i: [] for i in valid}
+        for box in combined['boxes']:
+            center_y = box['y'] + box['height'] / 2
+            for i, top, h in offsets:
+                if top - gap / 2 <= center_y < top + h + gap / 2:
+                    mapped = dict(box)
+                    mapped['x'] = box['x'] - gap
+                    mapped['y'] = box['y'] - top
+                    results[i]['boxes'].append(mapped)
+                    texts[i].append(box['text'])
+                    break
+                    
+        for i in valid:
+            results[i]['text'] = ' '.join(texts[i])
+            results[i]['engine'] = combined['engine']
+            self._group(results[i])
+            
+        return results
+        
+    def _grab_screen(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        截取屏幕
+        
+        预处理的第一步就是转换为灰度图，因此直接让截图后端输出灰度图，
+        省去RGB→BGR→GRAY的中间转换和整帧拷贝。
+        """
+        layout = 'gray' if self.pipeline.starts_with_grayscale else 'bgr'
+        with self._capture_lock:
+            img = self.capture.grab(region, layout=layout)
+            self.last_timings = {f'capture_{stage}': ms for stage, ms in self.capture.last_timings.items()}
+        return img
+        
+    def grab_frame(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        截取一帧屏幕（线程安全），供recognize_frame识别
+        
+        参数:
+            region: 可选的区域坐标 (x, y, width, height)
+        
+        返回:
+            截图数组（灰度或BGR，取决于预处理流水线）
+        """
+        return self._grab_screen(region)
+        
+    def recognize_frame(self, image: np.ndarray, region: Optional[Tuple[int, int, int, int]] = None) -> OCRResult:
+        """
+        识别一帧截图（经过帧差缓存和增量识别），可在多个线程中同时调用
+        
+        参数:
+            image: grab_frame返回的截图
+            region: 截图对应的屏幕区域，为None表示全屏
+        
+        返回:
+            识别结果（独立副本），'timings' 字段为本次识别各阶段耗时（毫秒）
+        """
+        self.last_timings = {}
+        result = self._recognize_frame(image, region)
+        result['timings'] = dict(self.last_timings)
+        return result
+        
     def screenshot_and_recognize(self, region: Optional[Tuple[int, int, int, int]] = None) -> Dict:
         """
         截取屏幕并识别文字
@@ -205,18 +886,458 @@ class OCRProcessor:
             包含识别结果的字典
         """
         try:
-            import pyautogui
+            img = self._grab_screen(region)
             
-            if region:
-                screenshot = pyautogui.screenshot(region=region)
+            return self._recognize_frame(img, region)
+        except ImportError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"截图识别失败: {str(e)}")
+            
+    def _recognize_frame(self, image: np.ndarray, region: Optional[Tuple[int, int, int, int]] = None) -> OCRResult:
+        """识别一帧截图（经过帧差缓存和增量识别）"""
+        # 全屏识别时可只重新识别发生变化的区域
+        incremental = region is None and self.config.get('ocr', 'incremental', False)
+        if incremental:
+            def recognize(img):
+                # 增量识别依赖上一帧的状态，同一时刻只能有一个线程执行
+                with self._incremental_lock:
+                    return self._recognize_incremental(img)
+        elif region is not None and self.config.get('ocr', 'retry', False):
+            # 只对区域截图重试，全屏轮询重试代价过高（多次整屏识别，且包含整屏放大）
+            def recognize(img):
+                return self.recognize_with_retry(img, tuple(region))
+        else:
+            recognize = self.recognize
+            
+        if self.frame_cache is None:
+            result = recognize(image)
+            self._record(image, region, result)
+            # 增量识别的结果同时作为下一帧的基准，返回副本
+            return result.copy() if incremental else result
+            
+        # 画面未变化时直接返回缓存结果（返回副本，调用方修改结果不会影响缓存）
+        key = (tuple(region) if region else None, self._config_fingerprint())
+        signature = self.frame_cache.signature(image)
+        result = self.frame_cache.lookup(key, signature)
+        if result is None:
+            result = recognize(image)
+            self.frame_cache.store(key, signature, result)
+            self._record(image, region, result)
+        return result.copy()
+        
+    def _record(self, image: np.ndarray, region: Optional[Tuple[int, int, int, int]], result: Dict) -> None:
+        """开启录制时保存本次实际执行识别的帧和结果（命中缓存的帧不录制）"""
+        if self.recorder is None:
+            return
+        try:
+            self.recorder.record(image, region, dict(self.config.ocr_config), result, self.last_timings)
+        except Exception as e:
+            warnings.warn(f"OCR录制失败: {str(e)}")
+        
+    def _retry_variants(self) -> List[Dict]:
+        """按配置获取重试变体列表（retry_variants可为变体名称或变体字典）"""
+        configured = self.config.get('ocr', 'retry_variants', None)
+        if configured is None:
+            return RETRY_VARIANTS
+        named = {variant['name']: variant for variant in RETRY_VARIANTS}
+        variants = []
+        for item in configured:
+            if isinstance(item, str):
+                if item not in named:
+                    raise ValueError(f"不支持的重试变体: {item}")
+                variants.append(named[item])
+            else:
+                variants.append(item)
+        return variants
+        
+    def _result_confidence(self, result: Dict) -> float:
+        """识别结果的平均置信度，统一换算到0-1（tesseract系列引擎的置信度为0-100）"""
+        boxes = result['boxes']
+        if not len(boxes):
+            return 0.0
+        if isinstance(boxes, BoxArray):
+            mean = float(boxes.confidence.mean())
+        else:
+            mean = sum(box['confidence'] for box in boxes) / len(boxes)
+        return mean / confidence_scale(self.engine_type)
+        
+    def _recognize_variant(self, image: np.ndarray, variant: Dict) -> OCRResult:
+        """按变体（缩放比例和预处理步骤）识别图像，坐标换算回原图"""
+        if self._is_native_variant(variant):
+            return self.recognize(image)
+        scale = variant.get('scale', 1.0)
+        stages = variant.get('preprocess')
+        if stages is None:
+            stages = self.config.get('ocr', 'preprocess', None)
+            if stages is None:
+                stages = [] if self.engine_type == 'paddleocr' else DEFAULT_PIPELINE
+        pipeline = compile_pipeline(with_scale(stages, scale))
+        result = self._run_engine(pipeline(image))
+        if scale != 1.0:
+            boxes = result['boxes']
+            if isinstance(boxes, BoxArray):
+                boxes.rescale(1 / scale)
             else:
-                screenshot = pyautogui.screenshot()
+                for box in boxes:
+                    for field in ('x', 'y', 'width', 'height'):
+                        box[field] = int(round(box[field] / scale))
+            result = self._group(result)
+        return result
+        
+    @staticmethod
+    def _is_native_variant(variant: Dict) -> bool:
+        """是否为原始变体（不缩放、使用默认预处理）"""
+        return variant.get('scale', 1.0) == 1.0 and variant.get('preprocess') is None
+        
+    def _retry_needed(self, result: Dict) -> bool:
+        """识别结果为空或平均置信度低于retry_min_confidence时需要重试"""
+        return (not result['text'].strip()
+                or self._result_confidence(result) < self.config.get('ocr', 'retry_min_confidence', 0.8))
+        
+    def recognize_with_retry(self, image: Union[str, np.ndarray], key: Any = None,
+                             first: Optional[OCRResult] = None) -> OCRResult:
+        """
+        按重试策略识别：依次尝试各变体（原始、放大1.5倍、放大2倍、其他阈值方法），
+        平均置信度达到retry_min_confidence时立即返回
+        
+        参数:
+            image: 图像路径或numpy数组
+            key: 区域标识（如截图区域），记住该区域上次成功的变体，下次优先尝试
+            first: 已按原始方式（不缩放、默认预处理）得到的识别结果，作为原始变体的结果使用，不再重复识别
+        
+        返回:
+            第一个达到阈值的识别结果；全部未达到时返回置信度最高的结果。
+            'variant' 字段为产生该结果的变体名称；重试变体列表为空时返回原始识别结果
+        """
+        if isinstance(image, str):
+            img = cv2.imread(image)
+            if img is None:
+                raise FileNotFoundError(f"无法加载图像: {image}")
+            image = img
+            
+        variants = list(self._retry_variants())
+        if not variants:
+            variants = [{'name': 'native'}]
+        with self._retry_lock:
+            winner = self._retry_winners.get(key)
+        for index, variant in enumerate(variants):
+            if variant['name'] == winner:
+                variants.insert(0, variants.pop(index))
+                break
+        if first is not None:
+            # 已有的原始识别结果最先参与比较，其余变体中不再包含原始变体
+            native = next((v for v in variants if self._is_native_variant(v)), {'name': 'native'})
+            variants = [native] + [v for v in variants if not self._is_native_variant(v)]
+            
+        best, best_confidence = None, -1.0
+        for attempt, variant in enumerate(variants, 1):
+            if attempt == 1 and first is not None:
+                result = first
+            else:
+                result = self._recognize_variant(image, variant)
+            result['variant'] = variant['name']
+            confidence = self._result_confidence(result)
+            if not self._retry_needed(result):
+                self._retry_succeeded(key, variant['name'], attempt)
+                self.last_retry = {'variant': variant['name'], 'attempts': attempt, 'confidence': confidence}
+                return result
+            if confidence > best_confidence:
+                best, best_confidence = result, confidence
+                
+        with self._retry_lock:
+            self._retry_stats['calls'] += 1
+            self._retry_stats['attempts'] += len(variants)
+            self._retry_stats['failures'] += 1
+        self.last_retry = {'variant': None, 'attempts': len(variants), 'confidence': max(best_confidence, 0.0)}
+        return best
+        
+    def _retry_succeeded(self, key: Any, variant: str, attempts: int) -> None:
+        """记录成功的变体和统计（区域数量超过retry_winners_max时淘汰最久未使用的区域）"""
+        with self._retry_lock:
+            self._retry_stats['calls'] += 1
+            self._retry_stats['attempts'] += attempts
+            if attempts == 1:
+                self._retry_stats['first_try_hits'] += 1
+            self._retry_winners[key] = variant
+            self._retry_winners.move_to_end(key)
+            while len(self._retry_winners) > self.config.get('ocr', 'retry_winners_max', 256):
+                self._retry_winners.popitem(last=False)
+        
+    def retry_stats(self) -> Dict:
+        """返回重试统计：调用次数、总尝试次数、首个变体即成功的次数、全部失败的次数"""
+        with self._retry_lock:
+            stats = dict(self._retry_stats)
+            stats['winners'] = dict(self._retry_winners)
+        stats['avg_attempts'] = stats['attempts'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
+        
+    def _recognize_incremental(self, image: np.ndarray) -> Dict:
+        """
+        增量识别：与上一帧逐块比较，只重新识别发生变化的区域
+        
+        参数:
+            image: 当前帧图像
+        
+        返回:
+            合并后的完整识别结果，格式与recognize一致
+        """
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        fingerprint = self._config_fingerprint()
+        state = self._incremental_state
+        
+        # 没有可复用的上一帧时执行全量识别
+        if state is None or state[0].shape != gray.shape or state[2] != fingerprint:
+            result = self.recognize(image)
+            self._incremental_state = (gray, result, fingerprint)
+            return result
+            
+        prev_gray, prev_result, _ = state
+        tile = self.config.get('ocr', 'incremental_tile', 64)
+        mask = rg.changed_tiles(prev_gray, gray, tile)
+        
+        if not mask.any():
+            self._incremental_state = (gray, prev_result, fingerprint)
+            return prev_result
+            
+        # 变化区域过大时，全量识别比分块识别更快
+        if mask.mean() > self.config.get('ocr', 'incremental_max_ratio', 0.5):
+            result = self.recognize(image)
+            self._incremental_state = (gray, result, fingerprint)
+            return result
+            
+        # 扩展脏矩形，使其完整包含与之相交的旧文字框，这些文字需要重新识别
+        dirty = [rg.expand_rect(rect, tile // 4, gray.shape)
+                 for rect in rg.tiles_to_rects(mask, tile, gray.shape)]
+        kept = list(prev_result['boxes'])
+        while True:
+            dirty = rg.merge_rects(dirty)
+            remaining = []
+            for box in kept:
+                rect = rg.box_rect(box)
+                for i, area in enumerate(dirty):
+                    if rg.intersects(rect, area):
+                        dirty[i] = rg.union_rect(area, rect)
+                        break
+                else:
+                    remaining.append(box)
+            if len(remaining) == len(kept):
+                break
+            kept = remaining
+            
+        # 批量识别所有脏矩形，与未变化区域的旧文字框合并
+        result = self._recognize_rects(image, dirty, kept)
+        self._incremental_state = (gray, result, fingerprint)
+        return result
+        
+    def _recognize_rects(self, image: np.ndarray, rects: List[Tuple[int, int, int, int]],
+                         kept: Optional[List[Dict]] = None) -> OCRResult:
+        """
+        批量识别图像中的多个矩形区域，并将结果合并为整图的识别结果
+        
+        参数:
+            image: 整图
+            rects: (x, y, width, height) 区域列表
+            kept: 需要一并保留的已有文字框（整图坐标）
+        
+        返回:
+            坐标和行编号均已映射回整图的识别结果
+        """
+        boxes = list(kept or [])
+        line_base = max((box.get('line', 0) for box in boxes), default=-1) + 1
+        # 这些区域由全屏识别拆分而来（每帧都不同），不参与重试
+        for (x, y, _, _), partial in zip(rects, self.recognize_regions(image, rects, retry=False)):
+            for box in partial['boxes']:
+                box = dict(box)
+                box['x'] += x
+                box['y'] += y
+                box['line'] = line_base + box.get('line', 0)
+                boxes.append(box)
+            line_base = max((box['line'] for box in boxes), default=line_base - 1) + 1
+            
+        boxes.sort(key=lambda box: (box['y'], box['x']))
+        result = OCRResult(
+            text=' '.join(box['text'] for box in boxes),
+            boxes=boxes,
+            engine=self.engine_type
+        )
+        return self._group(result)
+        
+    def recognize_at_points(self, points: Sequence[Tuple[int, int]], sizes: Sequence[int] = (30, 60),
+                            image: Optional[np.ndarray] = None) -> List[OCRResult]:
+        """
+        识别多个坐标附近的文字，识别为空时逐步扩大区域
+        
+        只截取一次能覆盖所有最大候选区域的画面，各级候选区域都从同一缓冲区裁剪；
+        每一轮把所有尚未成功的坐标合并为一次批量识别。
+        每个坐标会记住上次成功的区域大小，后续调用优先使用该大小。
+        
+        参数:
+            points: 屏幕坐标列表 [(x, y), ...]
+            sizes: 候选区域半径（由小到大），区域为以坐标为中心、边长2×size的正方形
+            image: 可选的整屏图像，为None时截取屏幕
+        
+        返回:
+            与points一一对应的识别结果，'region' 字段为最终使用的屏幕区域，边界框坐标相对于该区域
+        """
+        if not points:
+            return []
+        sizes = sorted(sizes)
+        
+        # 截取覆盖所有最大候选区域的画面
+        largest = sizes[-1]
+        if image is None:
+            left = max(0, min(x for x, _ in points) - largest)
+            top = max(0, min(y for _, y in points) - largest)
+            right = max(x for x, _ in points) + largest
+            bottom = max(y for _, y in points) + largest
+            origin = (left, top)
+            frame = self._grab_screen((left, top, right - left, bottom - top))
+        else:
+            origin = (0, 0)
+            frame = image
+            
+        # 每个坐标的尝试顺序：上次成功的大小优先，其余由小到大
+        orders = []
+        for point in points:
+            remembered = self._point_sizes.get(tuple(point))
+            order = list(sizes)
+            if remembered in order:
+                order.remove(remembered)
+                order.insert(0, remembered)
+            orders.append(order)
+            
+        results: List[Optional[OCRResult]] = [None] * len(points)
+        pending = list(range(len(points)))
+        for attempt in range(len(sizes)):
+            regions = []
+            for i in pending:
+                x, y = points[i]
+                size = orders[i][attempt]
+                regions.append((x - size, y - size, size * 2, size * 2))
+            local = [(rx - origin[0], ry - origin[1], rw, rh) for rx, ry, rw, rh in regions]
+            
+            still_pending = []
+            for i, region, result in zip(pending, regions, self.recognize_regions(frame, local, keys=regions)):
+                result['region'] = region
+                results[i] = result
+                if result['text'].strip():
+                    self._point_sizes[tuple(points[i])] = orders[i][attempt]
+                else:
+                    still_pending.append(i)
+            pending = still_pending
+            if not pending:
+                break
+                
+        return results
+        
+    def find_text(self, text: str, region: Optional[Tuple[int, int, int, int]] = None,
+                  image: Optional[np.ndarray] = None, min_confidence: float = 0.0) -> Optional[Dict]:
+        """
+        查找文字并跟踪其位置
+        
+        找到文字后记住它的位置；再次查找同一文字时先只识别上次位置附近的小窗口，
+        未命中时按track_margins逐级扩大窗口，全部未命中才识别整个区域。
+        
+        参数:
+            text: 要查找的文字
+            region: 可选的查找区域 (x, y, width, height)
+            image: 可选的图像（对应region，region为None时对应整屏），为None时截取屏幕
+            min_confidence: 最低置信度（0-1）
+        
+        返回:
+            文字框字典（屏幕坐标），未找到时返回None
+        """
+        key = normalize_text(text)
+        origin = (max(0, region[0]), max(0, region[1])) if region else (0, 0)
+        rect = self.tracked_rect(text)
+        
+        if rect is not None:
+            for margin in self.config.get('ocr', 'track_margins', [16, 64]):
+                window = rg.clip_rect((rect[0] - margin, rect[1] - margin,
+                                       rect[2] + margin * 2, rect[3] + margin * 2), region)
+                if window is None:
+                    continue
+                if image is None:
+                    crop = self._grab_screen(window)
+                else:
+                    crop = self._crop(image, (window[0] - origin[0], window[1] - origin[1], window[2], window[3]))
+                box = self.recognize(crop).find_one(text, min_confidence=min_confidence)
+                if box is not None:
+                    self._track_stats['window_hits'] += 1
+                    return self._track_hit(key, box, (window[0], window[1]))
+            self._track_stats['window_misses'] += 1
+            
+        if image is None:
+            image = self._grab_screen(region)
+        box = self._recognize_frame(image, region).find_one(text, min_confidence=min_confidence)
+        if box is None:
+            # 文字已不在画面中，不再跟踪
+            self._track_stats['misses'] += 1
+            with self._track_lock:
+                self._tracks.pop(key, None)
+            return None
+        self._track_stats['full_hits'] += 1
+        return self._track_hit(key, box, origin)
+        
+    def _track_hit(self, key: str, box: Dict, origin: Tuple[int, int]) -> Dict:
+        """将窗口内坐标换算为屏幕坐标并更新跟踪位置"""
+        box = dict(box)
+        box['x'] += origin[0]
+        box['y'] += origin[1]
+        self.track(key, rg.box_rect(box))
+        return box
+        
+    def track(self, text: str, rect: Tuple[int, int, int, int]) -> None:
+        """记录文字的屏幕位置，之后find_text优先在该位置附近查找"""
+        key = normalize_text(text)
+        with self._track_lock:
+            self._tracks[key] = tuple(rect)
+            self._tracks.move_to_end(key)
+            while len(self._tracks) > self.config.get('ocr', 'track_max', 64):
+                self._tracks.popitem(last=False)
                 
-            # 转换为OpenCV格式
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+    def tracked_rect(self, text: str) -> Optional[Tuple[int, int, int, int]]:
+        """返回文字上次找到时的屏幕矩形，未跟踪时返回None"""
+        with self._track_lock:
+            return self._tracks.get(normalize_text(text))
+            
+    def clear_tracks(self) -> None:
+        """清除所有跟踪位置"""
+        with self._track_lock:
+            self._tracks.clear()
             
-            return self.recognize(img)
+    def track_stats(self) -> Dict:
+        """返回位置跟踪统计，fast_path_hit_rate为已跟踪文字在小窗口内命中的比例"""
+        stats = dict(self._track_stats)
+        tracked_lookups = stats['window_hits'] + stats['window_misses']
+        stats['tracked'] = len(self._tracks)
+        stats['fast_path_hit_rate'] = stats['window_hits'] / tracked_lookups if tracked_lookups else 0.0
+        return stats
+        
+    def _config_fingerprint(self) -> str:
+        """生成当前OCR配置的指纹，配置变化后缓存自动失效"""
+        return repr(sorted(self.config.ocr_config.items(), key=lambda item: item[0]))
+        
+    def cache_stats(self) -> Dict:
+        """返回帧差缓存的命中统计"""
+        if self.frame_cache is None:
+            return {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'hit_rate': 0.0}
+        return self.frame_cache.stats()
+        
+    def screenshot_and_recognize_regions(self, regions: Sequence[Tuple[int, int, int, int]]) -> List[Dict]:
+        """
+        截取一次全屏并批量识别多个区域
+        
+        参数:
+            regions: (x, y, width, height) 屏幕区域坐标列表
+        
+        返回:
+            与regions一一对应的识别结果列表
+        """
+        try:
+            return self.recognize_regions(None, regions)
         except ImportError:
-            raise ImportError("请安装pyautogui: pip install pyautogui")
+            raise
         except Exception as e:
-            raise RuntimeError(f"截图识别失败: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"截图识别失败: {str(e)}")
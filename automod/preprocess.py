@@ -0,0 +1,290 @@
+"""
+图像预处理模块
+
+根据配置构建可组合的预处理流水线，支持灰度化、缩放、阈值、去噪、纠偏和反色等步骤。
+"""
+
+import json
+import threading
+import time
+import cv2
+import numpy as np
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+# 默认流水线：灰度化 + 高斯自适应阈值(11, 2)
+DEFAULT_PIPELINE = [
+    'grayscale',
+    {'op': 'threshold', 'method': 'adaptive_gaussian', 'block_size': 11, 'c': 2}
+]
+
+# 识别重试策略的默认变体，按顺序尝试：原始流水线 → 放大1.5倍 → 放大2倍 → 其他阈值方法
+# 每个变体可指定 scale（先放大再预处理）和 preprocess（替换预处理步骤，为None时使用当前配置）
+RETRY_VARIANTS = [
+    {'name': 'native'},
+    {'name': 'scale_1.5', 'scale': 1.5},
+    {'name': 'scale_2', 'scale': 2.0},
+    {'name': 'otsu', 'preprocess': ['grayscale', {'op': 'threshold', 'method': 'otsu'}]},
+    {'name': 'adaptive_mean',
+     'preprocess': ['grayscale', {'op': 'threshold', 'method': 'adaptive_mean', 'block_size': 15, 'c': 5}]},
+    {'name': 'scale_2_otsu', 'scale': 2.0, 'preprocess': ['grayscale', {'op': 'threshold', 'method': 'otsu'}]}
+]
+
+_INTERPOLATIONS = {
+    'nearest': cv2.INTER_NEAREST,
+    'linear': cv2.INTER_LINEAR,
+    'cubic': cv2.INTER_CUBIC,
+    'area': cv2.INTER_AREA,
+    'lanczos': cv2.INTER_LANCZOS4
+}
+
+# 步骤函数签名: fn(image, owned, **params) -> (image, owned)
+# owned表示image由流水线自己创建，可以原地修改；否则修改前必须先拷贝
+StageFunc = Callable[..., Tuple[np.ndarray, bool]]
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """转换为灰度图，已是灰度图时原样返回"""
+    if image.ndim == 2:
+        return image
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+def _stage_grayscale(image: np.ndarray, owned: bool) -> Tuple[np.ndarray, bool]:
+    """灰度化"""
+    if image.ndim == 2:
+        return image, owned
+    return _to_gray(image), True
+
+
+def _stage_resize(image: np.ndarray, owned: bool, scale: float = 2.0,
+                  interpolation: str = 'cubic') -> Tuple[np.ndarray, bool]:
+    """按比例缩放（小字体放大后识别率更高）"""
+    if scale == 1.0:
+        return image, owned
+    if interpolation not in _INTERPOLATIONS:
+        raise ValueError(f"不支持的插值方式: {interpolation}")
+    resized = cv2.resize(image, None, fx=scale, fy=scale, interpolation=_INTERPOLATIONS[interpolation])
+    return resized, True
+
+
+def _stage_threshold(image: np.ndarray, owned: bool, method: str = 'adaptive_gaussian',
+                     block_size: int = 11, c: int = 2, value: int = 127) -> Tuple[np.ndarray, bool]:
+    """二值化"""
+    if image.ndim == 3:
+        image, owned = _to_gray(image), True
+    dst = image if owned else None
+
+    if method == 'adaptive_gaussian':
+        result = cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                       cv2.THRESH_BINARY, block_size, c, dst=dst)
+    elif method == 'adaptive_mean':
+        result = cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                       cv2.THRESH_BINARY, block_size, c, dst=dst)
+    elif method == 'otsu':
+        _, result = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=dst)
+    elif method == 'binary':
+        _, result = cv2.threshold(image, value, 255, cv2.THRESH_BINARY, dst=dst)
+    else:
+        raise ValueError(f"不支持的阈值方法: {method}")
+    return result, True
+
+
+def _stage_denoise(image: np.ndarray, owned: bool, method: str = 'median',
+                   ksize: int = 3, strength: float = 10.0) -> Tuple[np.ndarray, bool]:
+    """去噪"""
+    if method == 'median':
+        return cv2.medianBlur(image, ksize), True
+    if method == 'gaussian':
+        dst = image if owned else None
+        return cv2.GaussianBlur(image, (ksize, ksize), 0, dst=dst), True
+    if method == 'nlmeans':
+        if image.ndim == 2:
+            return cv2.fastNlMeansDenoising(image, None, strength), True
+        return cv2.fastNlMeansDenoisingColored(image, None, strength, strength), True
+    raise ValueError(f"不支持的去噪方法: {method}")
+
+
+def _stage_deskew(image: np.ndarray, owned: bool, max_angle: float = 15.0,
+                  min_angle: float = 0.5) -> Tuple[np.ndarray, bool]:
+    """根据深色像素分布估计倾斜角并旋转校正"""
+    gray = _to_gray(image)
+    coords = cv2.findNonZero(cv2.bitwise_not(gray) if gray.mean() > 127 else gray)
+    if coords is None:
+        return image, owned
+
+    angle = cv2.minAreaRect(coords)[-1]
+    # minAreaRect返回的角度范围随OpenCV版本不同，统一换算到(-45, 45]
+    if angle > 45:
+        angle -= 90
+    elif angle <= -45:
+        angle += 90
+    if abs(angle) < min_angle or abs(angle) > max_angle:
+        return image, owned
+
+    h, w = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    border = 255 if image.ndim == 2 else (255, 255, 255, 255)
+    rotated = cv2.warpAffine(image, matrix, (w, h), flags=cv2.INTER_LINEAR,
+                             borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+    return rotated, True
+
+
+def _stage_invert(image: np.ndarray, owned: bool) -> Tuple[np.ndarray, bool]:
+    """反色（浅色文字深色背景时使用）"""
+    return cv2.bitwise_not(image, dst=image if owned else None), True
+
+
+# 预处理步骤注册表
+STAGES: Dict[str, StageFunc] = {
+    'grayscale': _stage_grayscale,
+    'resize': _stage_resize,
+    'threshold': _stage_threshold,
+    'denoise': _stage_denoise,
+    'deskew': _stage_deskew,
+    'invert': _stage_invert
+}
+
+
+class PreprocessPipeline:
+    """编译后的预处理流水线"""
+
+    def __init__(self, stages: Sequence[Union[str, Dict[str, Any]]], profile: bool = False):
+        """
+        编译预处理流水线
+
+        参数:
+            stages: 步骤列表，每项为步骤名或 {'op': 步骤名, 参数...} 字典
+            profile: 是否统计每个步骤的耗时
+        """
+        self.stages: List[Tuple[str, StageFunc, Dict[str, Any]]] = []
+        for spec in stages:
+            if isinstance(spec, str):
+                name, params = spec, {}
+            else:
+                params = dict(spec)
+                name = params.pop('op', None)
+            if name not in STAGES:
+                raise ValueError(f"不支持的预处理步骤: {name}")
+            self.stages.append((name, STAGES[name], params))
+
+        self.profile = profile
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.last_timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def starts_with_grayscale(self) -> bool:
+        """流水线第一步是否为灰度化（此时截图可直接输出灰度图）"""
+        return bool(self.stages) and self.stages[0][0] == 'grayscale'
+
+    def __call__(self, image: np.ndarray, owned: bool = False) -> np.ndarray:
+        """
+        执行预处理
+
+        参数:
+            image: 输入图像
+            owned: 调用方是否允许原地修改image
+
+        返回:
+            预处理后的图像
+        """
+        if not self.profile:
+            for _, func, params in self.stages:
+                image, owned = func(image, owned, **params)
+            return image
+
+        timings = {}
+        for index, (name, func, params) in enumerate(self.stages):
+            start = time.perf_counter()
+            image, owned = func(image, owned, **params)
+            timings[f'{index}:{name}'] = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.last_timings = timings
+            for stage, ms in timings.items():
+                entry = self.stats.setdefault(stage, {'calls': 0, 'total_ms': 0.0})
+                entry['calls'] += 1
+                entry['total_ms'] += ms
+        return image
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """返回各步骤的累计调用次数、总耗时和平均耗时（毫秒）"""
+        with self._lock:
+            return {
+                stage: {
+                    'calls': entry['calls'],
+                    'total_ms': entry['total_ms'],
+                    'avg_ms': entry['total_ms'] / entry['calls'] if entry['calls'] else 0.0
+                }
+                for stage, entry in self.stats.items()
+            }
+
+    def reset_stats(self) -> None:
+        """清空耗时统计"""
+        with self._lock:
+            self.stats = {}
+            self.last_timings = {}
+
+    def benchmark(self, image: np.ndarray, runs: int = 20) -> Dict[str, Dict[str, float]]:
+        """
+        对单张图像重复执行流水线并统计各步骤耗时
+
+        参数:
+            image: 测试图像
+            runs: 执行次数
+
+        返回:
+            与report()格式相同的耗时统计
+        """
+        bench = PreprocessPipeline([], profile=True)
+        bench.stages = self.stages
+        for _ in range(max(1, runs)):
+            bench(image)
+        return bench.report()
+
+
+def with_scale(stages: Sequence[Union[str, Dict[str, Any]]], scale: float) -> List[Union[str, Dict[str, Any]]]:
+    """
+    在步骤列表中插入缩放步骤（位于开头的灰度化之后，只放大单通道图像）
+
+    参数:
+        stages: 步骤列表
+        scale: 缩放比例，为1时原样返回
+
+    返回:
+        新的步骤列表
+    """
+    stages = list(stages)
+    if scale == 1.0:
+        return stages
+    index = 1 if stages and stages[0] == 'grayscale' else 0
+    stages.insert(index, {'op': 'resize', 'scale': scale})
+    return stages
+
+
+# 已编译流水线缓存，键为步骤配置的JSON串
+_PIPELINE_CACHE: Dict[Tuple[str, bool], PreprocessPipeline] = {}
+_PIPELINE_CACHE_LOCK = threading.Lock()
+
+
+def compile_pipeline(stages: Sequence[Union[str, Dict[str, Any]]] = None, profile: bool = False) -> PreprocessPipeline:
+    """
+    获取编译后的预处理流水线（相同配置复用同一实例）
+
+    参数:
+        stages: 步骤列表，为None时使用默认流水线
+        profile: 是否统计每个步骤的耗时
+
+    返回:
+        PreprocessPipeline实例
+    """
+    if stages is None:
+        stages = DEFAULT_PIPELINE
+    key = (json.dumps(stages, sort_keys=True), profile)
+    with _PIPELINE_CACHE_LOCK:
+        pipeline = _PIPELINE_CACHE.get(key)
+        if pipeline is None:
+            pipeline = PreprocessPipeline(stages, profile)
+            _PIPELINE_CACHE[key] = pipeline
+        return pipeline
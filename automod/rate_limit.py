@@ -0,0 +1,96 @@
+"""
+限流模块
+
+令牌桶限流器：按固定速率补充令牌，允许短时突发，超出时让调用方等待。
+同一翻译服务的所有调用共享一个限流器。
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        初始化令牌桶
+
+        参数:
+            rate: 每秒补充的令牌数（即平均每秒允许的请求数），不大于0时不限流
+            burst: 桶容量（允许的最大突发请求数），为None时等于rate（至少为1）
+            clock: 单调时钟（秒），测试时可替换
+        """
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+        # 统计
+        self.acquired = 0
+        self.waited = 0.0
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        预订令牌
+
+        令牌不足时同样会预订（令牌数变为负数），由调用方等待返回的时长后再发送请求，
+        因此同步和异步调用方可以共用同一个令牌桶。
+
+        返回:
+            需要等待的秒数
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            self.waited += delay
+            return delay
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """获取令牌，令牌不足时阻塞等待，返回实际等待的秒数"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict:
+        """返回限流统计"""
+        return {
+            'rate': self.rate,
+            'burst': self.burst,
+            'acquired': self.acquired,
+            'waited_s': self.waited
+        }
+
+
+# 按服务名共享的限流器
+_LIMITERS: Dict[str, TokenBucket] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, burst: Optional[float] = None) -> TokenBucket:
+    """
+    获取指定服务的共享限流器（限流参数变化时重新创建）
+
+    参数:
+        name: 服务名称
+        rate: 每秒请求数
+        burst: 最大突发请求数
+    """
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        expected_burst = float(burst) if burst is not None else max(1.0, float(rate))
+        if limiter is None or limiter.rate != float(rate) or limiter.burst != expected_burst:
+            limiter = TokenBucket(rate, burst)
+            _LIMITERS[name] = limiter
+        return limiter
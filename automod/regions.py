@@ -0,0 +1,162 @@
+"""
+区域计算模块
+
+提供帧差分块、矩形合并与相交判断等区域相关的辅助函数。
+"""
+
+import cv2
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+def changed_tiles(prev: np.ndarray, curr: np.ndarray, tile: int = 64, tolerance: int = 12) -> np.ndarray:
+    """
+    按块比较两帧灰度图，返回发生变化的块掩码
+
+    参数:
+        prev: 上一帧灰度图
+        curr: 当前帧灰度图（尺寸需与prev一致）
+        tile: 块边长（像素）
+        tolerance: 灰度差超过该值的像素才计为变化
+
+    返回:
+        形状为 (行块数, 列块数) 的布尔数组
+    """
+    diff = cv2.absdiff(prev, curr) > tolerance
+    h, w = diff.shape[:2]
+    rows, cols = -(-h // tile), -(-w // tile)
+    pad_h, pad_w = rows * tile - h, cols * tile - w
+    if pad_h or pad_w:
+        diff = np.pad(diff, ((0, pad_h), (0, pad_w)))
+    return diff.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+
+
+def tiles_to_rects(mask: np.ndarray, tile: int, shape: Tuple[int, ...]) -> List[Rect]:
+    """
+    将变化块掩码合并为若干矩形（相邻的变化块合并为同一矩形）
+
+    参数:
+        mask: changed_tiles 返回的块掩码
+        tile: 块边长（像素）
+        shape: 原图尺寸，用于截断超出边界的矩形
+
+    返回:
+        (x, y, width, height) 矩形列表
+    """
+    height, width = shape[:2]
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+    rects = []
+    for col, row, cols, rows, _ in stats[1:count]:
+        x, y = int(col) * tile, int(row) * tile
+        w = min(int(cols) * tile, width - x)
+        h = min(int(rows) * tile, height - y)
+        rects.append((x, y, w, h))
+    return rects
+
+
+def box_rect(box: Dict) -> Rect:
+    """将OCR结果中的边界框字典转换为矩形元组"""
+    return (box['x'], box['y'], box['width'], box['height'])
+
+
+def intersects(a: Rect, b: Rect) -> bool:
+    """判断两个矩形是否相交"""
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def iou(a: Rect, b: Rect) -> float:
+    """计算两个矩形的交并比"""
+    w = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    h = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / float(a[2] * a[3] + b[2] * b[3] - inter)
+
+
+def union_rect(a: Rect, b: Rect) -> Rect:
+    """返回同时包含两个矩形的最小矩形"""
+    x1, y1 = min(a[0], b[0]), min(a[1], b[1])
+    x2, y2 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def expand_rect(rect: Rect, margin: int, shape: Tuple[int, ...]) -> Rect:
+    """向四周扩展矩形，并截断到图像范围内"""
+    height, width = shape[:2]
+    x1, y1 = max(0, rect[0] - margin), max(0, rect[1] - margin)
+    x2 = min(width, rect[0] + rect[2] + margin)
+    y2 = min(height, rect[1] + rect[3] + margin)
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def clip_rect(rect: Rect, bounds: Optional[Rect] = None) -> Optional[Rect]:
+    """将矩形截断到bounds范围内（为None时只截断到非负坐标），截断后为空时返回None"""
+    bx, by = (bounds[0], bounds[1]) if bounds else (0, 0)
+    x1, y1 = max(bx, rect[0]), max(by, rect[1])
+    x2, y2 = rect[0] + rect[2], rect[1] + rect[3]
+    if bounds:
+        x2, y2 = min(x2, bx + bounds[2]), min(y2, by + bounds[3])
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def merge_rects(rects: List[Rect]) -> List[Rect]:
+    """合并相互重叠的矩形，直到所有矩形两两不相交"""
+    merged = list(rects)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        for rect in merged:
+            for i, other in enumerate(result):
+                if intersects(rect, other):
+                    result[i] = union_rect(rect, other)
+                    changed = True
+                    break
+            else:
+                result.append(rect)
+        merged = result
+    return merged
+
+
+def detect_text_regions(gray: np.ndarray, min_width: int = 4, min_height: int = 6,
+                        max_height: Optional[int] = None, margin: int = 4,
+                        min_fill: float = 0.1) -> List[Rect]:
+    """
+    快速检测可能包含文字的区域
+
+    对灰度图做形态学梯度突出笔画边缘，Otsu二值化后横向闭运算把同一行的字符连成一片，
+    再通过连通域得到候选矩形。
+
+    参数:
+        gray: 灰度图
+        min_width: 候选区域最小宽度
+        min_height: 候选区域最小高度
+        max_height: 候选区域最大高度，默认为图像高度的一半
+        margin: 候选区域向外扩展的像素（避免裁掉笔画边缘）
+        min_fill: 连通域面积占外接矩形面积的最小比例，用于过滤细长线条和边框
+
+    返回:
+        合并重叠后的 (x, y, width, height) 矩形列表
+    """
+    if max_height is None:
+        max_height = max(min_height, gray.shape[0] // 2)
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    rects = []
+    for x, y, w, h, area in stats[1:count].tolist():
+        if w < min_width or h < min_height or h > max_height:
+            continue
+        if area < min_fill * w * h:
+            continue
+        rects.append(expand_rect((x, y, w, h), margin, gray.shape))
+    return merge_rects(rects)
@@ -0,0 +1,78 @@
+"""
+文字渲染模块
+
+查找系统中可用的中英文字体，用PIL将文字渲染为图像（用于合成测试样本和文字模板）。
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# 常见字体路径（按优先级），CJK字体同时可渲染英文
+_FONT_CANDIDATES = {
+    'zh': [
+        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+        '/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc',
+        '/usr/share/fonts/wqy-microhei/wqy-microhei.ttc',
+        'C:/Windows/Fonts/msyh.ttc',
+        'C:/Windows/Fonts/simhei.ttf',
+        '/System/Library/Fonts/PingFang.ttc'
+    ],
+    'en': [
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+        '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+        '/usr/share/fonts/TTF/DejaVuSans.ttf',
+        'C:/Windows/Fonts/arial.ttf',
+        '/System/Library/Fonts/Helvetica.ttc'
+    ]
+}
+
+
+def find_font(lang: str) -> Optional[str]:
+    """查找可渲染指定语言的字体文件，找不到时返回None"""
+    candidates = _FONT_CANDIDATES.get(lang, [])
+    if lang == 'en':
+        candidates = candidates + _FONT_CANDIDATES['zh']
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def render_text(text: str, font_path: str, font_size: int, noise: float = 0.0,
+                scale: float = 1.0, seed: int = 0) -> np.ndarray:
+    """
+    渲染一张白底黑字的合成图像
+
+    参数:
+        text: 文本内容
+        font_path: 字体文件路径
+        font_size: 字号（像素）
+        noise: 高斯噪声标准差（0-255灰度）
+        scale: 渲染后的缩放比例（小于1模拟低分辨率截图）
+        seed: 噪声随机种子
+
+    返回:
+        BGR格式图像
+    """
+    font = ImageFont.truetype(font_path, font_size)
+    left, top, right, bottom = font.getbbox(text)
+    margin = max(8, font_size // 2)
+    image = Image.new('RGB', (right - left + margin * 2, bottom - top + margin * 2), 'white')
+    ImageDraw.Draw(image).text((margin - left, margin - top), text, font=font, fill='black')
+
+    if scale != 1.0:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.BILINEAR)
+
+    array = np.asarray(image, dtype=np.uint8)[:, :, ::-1]
+    if noise > 0:
+        rng = np.random.default_rng(seed)
+        noisy = array.astype(np.float32) + rng.normal(0.0, noise, array.shape)
+        array = np.clip(noisy, 0, 255).astype(np.uint8)
+    return np.ascontiguousarray(array)
@@ -0,0 +1,245 @@
+"""
+OCR录制与回放模块
+
+将实时截图的识别过程（帧、区域、配置、结果、耗时）录制到磁盘，
+之后可以用任意引擎和配置重新识别录制的数据，得到可复现的吞吐量、延迟和准确率对比。
+
+命令行用法:
+    python -m automod.replay <录制目录> [--engine pytesseract] [--config config.json]
+"""
+
+import argparse
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .config import AutoModConfig
+from .metrics import char_accuracy, latency_summary
+
+# 索引文件名与帧目录名
+INDEX_FILE = 'index.jsonl'
+FRAMES_DIR = 'frames'
+
+
+def _json_default(value: Any) -> Any:
+    """JSON序列化numpy标量等非标准类型"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class OCRRecorder:
+    """OCR录制器：帧以PNG（无损压缩）保存，其余信息逐行追加到索引文件"""
+
+    def __init__(self, store_dir: str):
+        """
+        初始化录制器
+
+        参数:
+            store_dir: 录制目录，不存在时自动创建；已有录制时在其后追加
+        """
+        self.store_dir = store_dir
+        os.makedirs(os.path.join(store_dir, FRAMES_DIR), exist_ok=True)
+        self._index_path = os.path.join(store_dir, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        if os.path.exists(self._index_path):
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                self._next_id = sum(1 for line in f if line.strip())
+
+    def record(self, frame: np.ndarray, region: Optional[Tuple[int, int, int, int]],
+               config: Dict, result: Dict, timings: Optional[Dict] = None) -> int:
+        """
+        录制一次识别
+
+        参数:
+            frame: 送入识别的截图
+            region: 截图区域，全屏时为None
+            config: 识别时的OCR配置
+            result: 识别结果
+            timings: 各阶段耗时（毫秒）
+
+        返回:
+            录制条目编号
+        """
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+
+        frame_name = f'{FRAMES_DIR}/{entry_id:06d}.png'
+        if not cv2.imwrite(os.path.join(self.store_dir, frame_name), frame):
+            raise RuntimeError(f"保存录制帧失败: {frame_name}")
+
+        entry = {
+            'id': entry_id,
+            'frame': frame_name,
+            'region': list(region) if region else None,
+            'config': config,
+            'result': {
+                'text': result.get('text', ''),
+                'boxes': list(result.get('boxes', [])),
+                'engine': result.get('engine')
+            },
+            'timings': dict(timings or {}),
+            'timestamp': time.time()
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=_json_default)
+        with self._lock:
+            with open(self._index_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        return entry_id
+
+
+class ReplayRunner:
+    """回放器：用指定配置重新识别录制的帧并与录制结果对比"""
+
+    def __init__(self, store_dir: str):
+        """
+        初始化回放器
+
+        参数:
+            store_dir: 录制目录
+        """
+        self.store_dir = store_dir
+        self._index_path = os.path.join(store_dir, INDEX_FILE)
+        if not os.path.exists(self._index_path):
+            raise FileNotFoundError(f"未找到录制索引: {self._index_path}")
+
+    def entries(self) -> Iterator[Dict]:
+        """按录制顺序遍历索引条目"""
+        with open(self._index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def load_frame(self, entry: Dict) -> np.ndarray:
+        """读取条目对应的帧"""
+        path = os.path.join(self.store_dir, entry['frame'])
+        frame = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if frame is None:
+            raise FileNotFoundError(f"无法加载录制帧: {path}")
+        return frame
+
+    def run(self, config: Optional[AutoModConfig] = None, limit: Optional[int] = None,
+            warmup: int = 1, max_diffs: int = 20) -> Dict:
+        """
+        重新识别录制的帧
+
+        参数:
+            config: 回放使用的配置，为None时使用默认配置
+            limit: 最多回放的帧数
+            warmup: 预热次数（不计入统计，用于排除引擎首次加载的耗时）
+            max_diffs: 报告中最多列出的结果差异条数
+
+        返回:
+            包含吞吐量、延迟分位数和准确率对比的报告字典
+        """
+        from .ocr import OCRProcessor
+
+        config = copy.deepcopy(config) if config else AutoModConfig()
+        # 回放时不再录制，也不使用帧差缓存，保证每帧都真正执行识别
+        config.update_ocr_config(record_dir=None, frame_cache=False)
+        processor = OCRProcessor(config)
+
+        entries = list(self.entries())
+        if limit is not None:
+            entries = entries[:limit]
+        frames = [self.load_frame(entry) for entry in entries]
+
+        for frame in frames[:warmup]:
+            processor.recognize(frame)
+
+        latencies: List[float] = []
+        similarities: List[float] = []
+        exact = 0
+        diffs = []
+        started = time.perf_counter()
+        for entry, frame in zip(entries, frames):
+            region = tuple(entry['region']) if entry.get('region') else None
+            start = time.perf_counter()
+            result = processor.recognize_frame(frame, region)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            expected = entry['result']['text']
+            similarity = char_accuracy(expected, result['text'])
+            similarities.append(similarity)
+            if expected == result['text']:
+                exact += 1
+            elif len(diffs) < max_diffs:
+                diffs.append({
+                    'id': entry['id'],
+                    'expected': expected,
+                    'actual': result['text'],
+                    'similarity': similarity
+                })
+        elapsed = time.perf_counter() - started
+
+        count = len(entries)
+        return {
+            'frames': count,
+            'engine': processor.engine_type,
+            'elapsed_s': elapsed,
+            'throughput_fps': count / elapsed if elapsed > 0 else 0.0,
+            'latency_ms': latency_summary(latencies),
+            'accuracy': {
+                'exact_match_rate': exact / count if count else 0.0,
+                'mean_char_similarity': sum(similarities) / count if count else 0.0
+            },
+            'diffs': diffs
+        }
+
+
+def format_report(report: Dict) -> str:
+    """将回放报告格式化为文本表格"""
+    latency = report['latency_ms']
+    accuracy = report['accuracy']
+    lines = [
+        f"引擎: {report['engine']}    帧数: {report['frames']}    耗时: {report['elapsed_s']:.2f}s",
+        f"吞吐量: {report['throughput_fps']:.2f} 帧/秒",
+        f"延迟(ms): mean={latency['mean']:.1f}  p50={latency['p50']:.1f}  "
+        f"p95={latency['p95']:.1f}  p99={latency['p99']:.1f}  max={latency['max']:.1f}",
+        f"与录制结果一致: {accuracy['exact_match_rate']:.1%}    "
+        f"平均字符相似度: {accuracy['mean_char_similarity']:.1%}"
+    ]
+    for diff in report['diffs']:
+        lines.append(f"  #{diff['id']} ({diff['similarity']:.1%}): {diff['expected']!r} -> {diff['actual']!r}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='回放OCR录制数据并输出基准测试报告')
+    parser.add_argument('store_dir', help='录制目录')
+    parser.add_argument('--config', help='AutoMod配置JSON文件')
+    parser.add_argument('--engine', help='覆盖OCR引擎')
+    parser.add_argument('--lang', help='覆盖OCR识别语言')
+    parser.add_argument('--limit', type=int, help='最多回放的帧数')
+    parser.add_argument('--json', action='store_true', help='以JSON格式输出报告')
+    args = parser.parse_args(argv)
+
+    config = AutoModConfig()
+    if args.config:
+        config.load_from_json(args.config)
+    if args.engine:
+        config.update_ocr_config(engine=args.engine)
+    if args.lang:
+        config.update_ocr_config(lang=args.lang)
+
+    report = ReplayRunner(args.store_dir).run(config, limit=args.limit)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,471 @@
+"""
+OCR结果模块
+
+提供带文字索引的OCR结果对象，支持精确、子串、模糊和按位置的快速查找。
+"""
+
+import math
+import numpy as np
+from collections import Counter, abc, defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+
+# 置信度为0-100刻度的引擎（其余引擎为0-1）
+TESSERACT_ENGINES = ('pytesseract', 'pytesseract_pool', 'tesserocr')
+
+
+def confidence_scale(engine: Optional[str]) -> float:
+    """引擎置信度刻度与0-1刻度之比（tesseract系列为100，其余为1）"""
+    return 100.0 if engine in TESSERACT_ENGINES else 1.0
+
+
+def normalize_text(text: str) -> str:
+    """规范化文字：忽略大小写和所有空白字符"""
+    return ''.join(text.split()).casefold()
+
+
+def _grams(text: str) -> Set[str]:
+    """提取文字的二元组集合（单字符文字返回其本身）"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class BoxArray(abc.Sequence):
+    """
+    列式存储的文字框集合
+
+    坐标、置信度和行编号以numpy数组保存，按下标访问时才生成与原格式一致的字典（并缓存）。
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, width: np.ndarray, height: np.ndarray,
+                 confidence: np.ndarray, text: Sequence[str], line: Optional[np.ndarray] = None):
+        self.x = np.asarray(x, dtype=np.int64)
+        self.y = np.asarray(y, dtype=np.int64)
+        self.width = np.asarray(width, dtype=np.int64)
+        self.height = np.asarray(height, dtype=np.int64)
+        self.confidence = np.asarray(confidence, dtype=np.float64)
+        self.text = list(text)
+        self.line = np.asarray(line if line is not None else np.arange(len(self.text)), dtype=np.int64)
+        self._dicts: Dict[int, Dict] = {}
+
+    @classmethod
+    def from_tesseract(cls, data: Dict, confidence_threshold: float,
+                       offset_y: int = 0, line_base: int = 0) -> "BoxArray":
+        """
+        从pytesseract的image_to_data输出向量化地筛选文字框
+
+        参数:
+            data: image_to_data 返回的字典（Output.DICT）
+            confidence_threshold: 置信度阈值
+            offset_y: 纵坐标偏移
+            line_base: 行编号起始值
+        """
+        texts = np.asarray(data['text'], dtype=object)
+        conf = np.asarray(data['conf'], dtype=np.float64)
+        non_empty = np.char.str_len(np.char.strip(texts.astype(str))) > 0 if len(texts) else np.zeros(0, bool)
+        keep = np.flatnonzero((conf > confidence_threshold) & non_empty)
+
+        # (block_num, par_num, line_num) 合成行键后映射为连续的行编号
+        line_keys = (np.asarray(data['block_num'], dtype=np.int64)[keep] * 1000000
+                     + np.asarray(data['par_num'], dtype=np.int64)[keep] * 1000
+                     + np.asarray(data['line_num'], dtype=np.int64)[keep])
+        _, lines = np.unique(line_keys, return_inverse=True)
+
+        return cls(
+            np.asarray(data['left'], dtype=np.int64)[keep],
+            np.asarray(data['top'], dtype=np.int64)[keep] + offset_y,
+            np.asarray(data['width'], dtype=np.int64)[keep],
+            np.asarray(data['height'], dtype=np.int64)[keep],
+            conf[keep],
+            texts[keep].tolist(),
+            lines.reshape(-1) + line_base
+        )
+
+    @classmethod
+    def from_list(cls, boxes: Sequence[Dict]) -> "BoxArray":
+        """从文字框字典列表构建（缺少 'line' 字段时每个框各占一行）"""
+        return cls(
+            [box['x'] for box in boxes],
+            [box['y'] for box in boxes],
+            [box['width'] for box in boxes],
+            [box['height'] for box in boxes],
+            [box['confidence'] for box in boxes],
+            [box['text'] for box in boxes],
+            [box.get('line', i) for i, box in enumerate(boxes)]
+        )
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        box = self._dicts.get(index)
+        if box is None:
+            box = {
+                'x': int(self.x[index]), 'y': int(self.y[index]),
+                'width': int(self.width[index]), 'height': int(self.height[index]),
+                'text': self.text[index],
+                'confidence': float(self.confidence[index]),
+                'line': int(self.line[index])
+            }
+            self._dicts[index] = box
+        return box
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self[i] for i in range(len(self)))
+
+    def offset(self, dx: int = 0, dy: int = 0) -> "BoxArray":
+        """原地平移所有文字框"""
+        self.x += dx
+        self.y += dy
+        self._dicts = {}
+        return self
+
+    def rescale(self, factor: float) -> "BoxArray":
+        """原地按比例缩放所有文字框（识别放大后的图像时，用于将坐标换算回原图）"""
+        self.x = np.rint(self.x * factor).astype(np.int64)
+        self.y = np.rint(self.y * factor).astype(np.int64)
+        self.width = np.rint(self.width * factor).astype(np.int64)
+        self.height = np.rint(self.height * factor).astype(np.int64)
+        self._dicts = {}
+        return self
+
+    def to_list(self) -> List[Dict]:
+        """转换为字典列表"""
+        return list(self)
+
+    def copy(self) -> "BoxArray":
+        """复制所有列，副本与原集合互不影响"""
+        return BoxArray(self.x.copy(), self.y.copy(), self.width.copy(), self.height.copy(),
+                        self.confidence.copy(), self.text, self.line.copy())
+
+
+def _is_cjk(char: str) -> bool:
+    """判断字符是否为中日韩文字或全角标点（此类文字之间不加空格）"""
+    code = ord(char)
+    return (0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or 0x3000 <= code <= 0x30FF
+            or 0xAC00 <= code <= 0xD7AF or 0xFF00 <= code <= 0xFFEF)
+
+
+def join_words(words: Sequence[str]) -> str:
+    """拼接单词：相邻两侧都是中日韩文字时直接连接，否则以空格分隔"""
+    parts = []
+    for word in words:
+        if parts and not (_is_cjk(parts[-1][-1]) and _is_cjk(word[0])):
+            parts.append(' ')
+        parts.append(word)
+    return ''.join(parts)
+
+
+def _merge_boxes(boxes: Sequence[Dict], indices: Sequence[int]) -> Dict:
+    """将多个单词框合并为一个文字框，words记录组成它的单词框下标"""
+    members = [boxes[i] for i in indices]
+    x1 = min(box['x'] for box in members)
+    y1 = min(box['y'] for box in members)
+    x2 = max(box['x'] + box['width'] for box in members)
+    y2 = max(box['y'] + box['height'] for box in members)
+    return {
+        'x': x1, 'y': y1, 'width': x2 - x1, 'height': y2 - y1,
+        'text': join_words([box['text'] for box in members]),
+        'confidence': sum(box['confidence'] for box in members) / len(members),
+        'words': list(indices)
+    }
+
+
+def group_words(boxes: Sequence[Dict], phrase_gap: float = 1.0) -> Tuple[List[Dict], List[Dict]]:
+    """
+    将单词框按行分组，并在行内按间距切分为短语
+
+    参数:
+        boxes: 单词框列表，属于同一行的单词框具有相同的 'line' 值
+        phrase_gap: 同一行内相邻单词的水平间距超过 行高×phrase_gap 时切分为不同短语
+
+    返回:
+        (行列表, 短语列表)
+    """
+    if isinstance(boxes, BoxArray):
+        return _group_columns(boxes, phrase_gap)
+
+    rows: Dict = {}
+    for i, box in enumerate(boxes):
+        rows.setdefault(box.get('line', ('box', i)), []).append(i)
+
+    lines, phrases = [], []
+    for indices in rows.values():
+        indices.sort(key=lambda i: boxes[i]['x'])
+        lines.append(_merge_boxes(boxes, indices))
+
+        heights = sorted(boxes[i]['height'] for i in indices)
+        max_gap = heights[len(heights) // 2] * phrase_gap
+        start = 0
+        for k in range(1, len(indices)):
+            prev, curr = boxes[indices[k - 1]], boxes[indices[k]]
+            if curr['x'] - (prev['x'] + prev['width']) > max_gap:
+                phrases.append(_merge_boxes(boxes, indices[start:k]))
+                start = k
+        phrases.append(_merge_boxes(boxes, indices[start:]))
+
+    return lines, phrases
+
+
+def _group_columns(boxes: BoxArray, phrase_gap: float) -> Tuple[List[Dict], List[Dict]]:
+    """group_words 的列式实现：按行排序后用数组运算计算各行、各短语的外接矩形"""
+    if not len(boxes):
+        return [], []
+
+    order = np.lexsort((boxes.x, boxes.line))
+    x, y = boxes.x[order], boxes.y[order]
+    right, bottom = x + boxes.width[order], y + boxes.height[order]
+    conf, heights = boxes.confidence[order], boxes.height[order]
+    line = boxes.line[order]
+    line_starts = np.flatnonzero(np.r_[True, line[1:] != line[:-1]])
+    line_ends = np.r_[line_starts[1:], len(order)]
+
+    def merge(start: int, end: int) -> Dict:
+        x1, y1 = int(x[start:end].min()), int(y[start:end].min())
+        return {
+            'x': x1, 'y': y1,
+            'width': int(right[start:end].max()) - x1,
+            'height': int(bottom[start:end].max()) - y1,
+            'text': join_words([boxes.text[i] for i in order[start:end]]),
+            'confidence': float(conf[start:end].mean()),
+            'words': order[start:end].tolist()
+        }
+
+    # 相邻单词的水平间距（行首单词为负无穷，不会触发切分）
+    gaps = np.r_[-np.inf, x[1:] - right[:-1]]
+    lines, phrases = [], []
+    for start, end in zip(line_starts.tolist(), line_ends.tolist()):
+        lines.append(merge(start, end))
+        max_gap = np.sort(heights[start:end])[(end - start) // 2] * phrase_gap
+        splits = (start + 1 + np.flatnonzero(gaps[start + 1:end] > max_gap)).tolist()
+        for a, b in zip([start] + splits, splits + [end]):
+            phrases.append(merge(a, b))
+    return lines, phrases
+
+
+class TextIndex:
+    """OCR文字框索引：规范化文字哈希表、n-gram倒排索引和空间网格"""
+
+    def __init__(self, boxes: Sequence[Dict], cell_size: int = 64):
+        """
+        构建索引
+
+        参数:
+            boxes: 文字框列表
+            cell_size: 空间网格单元边长（像素）
+        """
+        self.boxes = boxes
+        self.cell_size = cell_size
+        self.normalized: List[str] = []
+        self.exact: Dict[str, List[int]] = defaultdict(list)
+        self.chars: Dict[str, List[int]] = defaultdict(list)
+        self.grams: Dict[str, List[int]] = defaultdict(list)
+        self.gram_sets: List[Set[str]] = []
+        self.grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+        for i, box in enumerate(boxes):
+            norm = normalize_text(box['text'])
+            grams = _grams(norm)
+            self.normalized.append(norm)
+            self.gram_sets.append(grams)
+            self.exact[norm].append(i)
+            for char in set(norm):
+                self.chars[char].append(i)
+            for gram in grams:
+                self.grams[gram].append(i)
+            for cell in self._cells(box['x'], box['y'], box['x'] + box['width'], box['y'] + box['height']):
+                self.grid[cell].append(i)
+
+    def _cells(self, x1: float, y1: float, x2: float, y2: float) -> Iterable[Tuple[int, int]]:
+        """返回矩形覆盖的所有网格单元"""
+        size = self.cell_size
+        for cx in range(int(x1 // size), int(x2 // size) + 1):
+            for cy in range(int(y1 // size), int(y2 // size) + 1):
+                yield (cx, cy)
+
+    def substring_candidates(self, query: str) -> Set[int]:
+        """返回包含query全部n-gram的文字框（需再校验是否为子串）"""
+        if len(query) == 1:
+            return set(self.chars.get(query, ()))
+        postings = sorted((self.grams.get(gram, ()) for gram in _grams(query)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def fuzzy_scores(self, query: str) -> Dict[int, float]:
+        """按二元组的Dice系数计算与query相似的文字框得分"""
+        query_grams = _grams(query)
+        if not query_grams:
+            return {}
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.grams.get(gram, ()))
+        return {
+            i: 2.0 * count / (len(query_grams) + len(self.gram_sets[i]))
+            for i, count in shared.items()
+        }
+
+    def within(self, x: float, y: float, radius: float) -> Set[int]:
+        """返回与以(x, y)为中心、radius为半径的方形范围相交的文字框"""
+        found = set()
+        for cell in self._cells(x - radius, y - radius, x + radius, y + radius):
+            found.update(self.grid.get(cell, ()))
+        return found
+
+
+def _copy_boxes(boxes: Union[List[Dict], BoxArray]) -> Union[List[Dict], BoxArray]:
+    """复制文字框集合（连同每个文字框字典及其中的列表字段）"""
+    if isinstance(boxes, BoxArray):
+        return boxes.copy()
+    return [{key: list(value) if isinstance(value, list) else value for key, value in box.items()}
+            for box in boxes]
+
+
+class OCRResult(dict):
+    """
+    OCR识别结果
+
+    与原有的 {'text', 'boxes', 'engine'} 字典完全兼容，
+    额外提供行级 'lines' 和短语级 'phrases' 文字框，
+    以及基于索引的 find() 查找，索引在首次查找时构建并复用。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setdefault('text', '')
+        self.setdefault('boxes', [])
+        self.setdefault('engine', None)
+        self._indexes: Dict[str, Tuple[tuple, TextIndex]] = {}
+
+    def group(self, phrase_gap: float = 1.0) -> "OCRResult":
+        """根据单词框（重新）构建行级和短语级文字框"""
+        self['lines'], self['phrases'] = group_words(self['boxes'], phrase_gap)
+        self._indexes = {}
+        return self
+
+    def _candidates(self, level: str) -> List[Dict]:
+        """返回指定层级参与查找的文字框"""
+        if level == 'word':
+            return self['boxes']
+        if level == 'phrase':
+            return self.get('phrases', [])
+        if level == 'line':
+            return self.get('lines', [])
+        if level == 'auto':
+            return list(self['boxes']) + self.get('phrases', []) + self.get('lines', [])
+        raise ValueError(f"不支持的查找层级: {level}")
+
+    def index_for(self, level: str = 'word') -> TextIndex:
+        """指定层级的文字框索引（惰性构建）"""
+        cached = self._indexes.get(level)
+        sources = (self.get('boxes'), self.get('phrases'), self.get('lines'))
+        if cached is None or any(a is not b for a, b in zip(cached[0], sources)):
+            cached = (sources, TextIndex(self._candidates(level)))
+            self._indexes[level] = cached
+        return cached[1]
+
+    @property
+    def index(self) -> TextIndex:
+        """单词级文字框索引"""
+        return self.index_for('word')
+
+    def invalidate(self) -> None:
+        """文字框被原地修改后调用，使索引在下次查找时重建"""
+        self._indexes = {}
+
+    def find(self, text: Optional[str] = None, fuzzy: Union[bool, float] = False,
+             near: Optional[Tuple[float, float]] = None, radius: Optional[float] = None,
+             min_confidence: float = 0.0, limit: Optional[int] = None,
+             level: str = 'auto') -> List[Dict]:
+        """
+        查找文字框
+
+        参数:
+            text: 要查找的文字，为None时只按位置查找
+            fuzzy: 是否启用模糊匹配；为浮点数时表示最低相似度（默认0.6）
+            near: 参考坐标 (x, y)，结果按与该点的距离排序
+            radius: 与near配合使用，只返回该半径范围内的文字框
+            min_confidence: 最低置信度（0-1，按识别引擎的置信度刻度换算后比较）
+            limit: 最多返回的结果数量
+            level: 查找层级，word（单词）、phrase（短语）、line（行）或 auto（全部层级）
+
+        返回:
+            按匹配程度排序的文字框列表（精确匹配 > 子串匹配 > 模糊匹配，同级按距离和置信度排序）
+        """
+        index = self.index_for(level)
+        boxes = index.boxes
+        scores: Dict[int, float] = {}
+
+        if text is None:
+            if near is None:
+                candidates = range(len(boxes))
+            elif radius is not None:
+                candidates = index.within(near[0], near[1], radius)
+            else:
+                candidates = range(len(boxes))
+            scores = {i: 0.0 for i in candidates}
+        else:
+            query = normalize_text(text)
+            if not query:
+                return []
+            for i in index.exact.get(query, ()):
+                scores[i] = 3.0
+            for i in index.substring_candidates(query):
+                if i not in scores and query in index.normalized[i]:
+                    # 子串匹配时，文字框越短（越接近查询文字）得分越高
+                    scores[i] = 2.0 + len(query) / len(index.normalized[i])
+            if fuzzy:
+                threshold = 0.6 if fuzzy is True else float(fuzzy)
+                for i, score in index.fuzzy_scores(query).items():
+                    if i not in scores and score >= threshold:
+                        scores[i] = score
+
+        min_confidence *= confidence_scale(self.get('engine'))
+        matches = []
+        for i, score in scores.items():
+            box = boxes[i]
+            if box['confidence'] < min_confidence:
+                continue
+            distance = 0.0
+            if near is not None:
+                distance = math.hypot(box['x'] + box['width'] / 2 - near[0],
+                                      box['y'] + box['height'] / 2 - near[1])
+                if radius is not None and distance > radius:
+                    continue
+            matches.append((-score, distance, -box['confidence'], i))
+
+        matches.sort()
+        found, seen = [], set()
+        for _, _, _, i in matches:
+            # auto层级下单词、短语和行可能完全重合，只保留排名最高的一个
+            key = (boxes[i]['x'], boxes[i]['y'], boxes[i]['width'], boxes[i]['height'])
+            if key in seen:
+                continue
+            seen.add(key)
+            found.append(boxes[i])
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def copy(self) -> "OCRResult":
+        """拷贝结果：文字框列表和文字框字典均为新对象，修改副本不影响原结果（索引在查找时重建）"""
+        copied = OCRResult(self)
+        for field in ('boxes', 'lines', 'phrases'):
+            if field in copied:
+                copied[field] = _copy_boxes(copied[field])
+        return copied
+
+    def find_one(self, text: Optional[str] = None, **kwargs) -> Optional[Dict]:
+        """返回最佳匹配的文字框，未找到时返回None"""
+        matches = self.find(text, limit=1, **kwargs)
+        return matches[0] if matches else None
@@ -0,0 +1,279 @@
+"""
+模板匹配模块
+
+对反复出现的已知文字（按钮、选项等），缓存其截图或字体渲染的模板，
+用cv2.matchTemplate在图像金字塔上快速定位，只有匹配失败时才回退到完整OCR。
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .config import AutoModConfig
+from .ocr import OCRProcessor
+from .preprocess import _to_gray
+from .regions import expand_rect
+from .render import find_font, render_text
+from .result import normalize_text
+
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+
+
+def _best_match(image: np.ndarray, template: np.ndarray, invert: bool) -> Tuple[float, Tuple[int, int]]:
+    """在image中查找template的最佳匹配位置，invert为True时同时接受反色匹配"""
+    result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    if invert:
+        result = np.abs(result)
+    _, score, _, location = cv2.minMaxLoc(result)
+    return float(score), location
+
+
+def match_template(image: np.ndarray, template: np.ndarray, levels: Optional[int] = None,
+                   invert: bool = False, min_side: int = 12) -> Tuple[float, Tuple[int, int]]:
+    """
+    金字塔模板匹配：先在缩小的图像上粗定位，再在原分辨率的邻域内精确匹配
+
+    参数:
+        image: 灰度图像
+        template: 灰度模板
+        levels: 金字塔层数，为None时按模板尺寸自动选择（缩小后模板短边不小于min_side）
+        invert: 是否同时接受反色匹配（深色背景浅色文字）
+        min_side: 自动选择层数时缩小后模板的最小短边
+
+    返回:
+        (匹配得分, (x, y))，得分范围0-1，模板大于图像时得分为0
+    """
+    th, tw = template.shape[:2]
+    ih, iw = image.shape[:2]
+    if th > ih or tw > iw:
+        return 0.0, (0, 0)
+
+    if levels is None:
+        levels = 0
+        while levels < 3 and min(th, tw) >> (levels + 1) >= min_side:
+            levels += 1
+    if levels <= 0:
+        return _best_match(image, template, invert)
+
+    factor = 1 << levels
+    small_image = cv2.resize(image, (iw // factor, ih // factor), interpolation=cv2.INTER_AREA)
+    small_template = cv2.resize(template, (tw // factor, th // factor), interpolation=cv2.INTER_AREA)
+    _, (cx, cy) = _best_match(small_image, small_template, invert)
+
+    # 粗定位误差不超过缩放倍数，在其邻域内按原分辨率精确匹配
+    pad = factor * 2
+    x1, y1 = max(0, cx * factor - pad), max(0, cy * factor - pad)
+    x2, y2 = min(iw, cx * factor + tw + pad), min(ih, cy * factor + th + pad)
+    score, (x, y) = _best_match(image[y1:y2, x1:x2], template, invert)
+    return score, (x1 + x, y1 + y)
+
+
+class TemplateLocator:
+    """已知文字定位器：模板匹配优先，未命中时回退到OCR并自动更新模板"""
+
+    def __init__(self, ocr: Optional[OCRProcessor] = None, config: Optional[AutoModConfig] = None):
+        """
+        初始化定位器
+
+        参数:
+            ocr: 回退识别使用的OCRProcessor，为None时根据config创建
+            config: 配置对象，为None时使用ocr的配置
+        """
+        self.ocr = ocr or OCRProcessor(config)
+        self.config = config or self.ocr.config
+        # 文字 -> 模板列表（最新的截图模板排在最前）
+        self.templates: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+
+        # 统计计数
+        self.template_hits = 0
+        # 其中在上次位置附近窗口内命中的次数
+        self.window_hits = 0
+        self.ocr_hits = 0
+        self.misses = 0
+        # 最近一次定位各阶段耗时（毫秒）
+        self.last_timings: Dict[str, float] = {}
+
+    def add_template(self, text: str, image: np.ndarray, source: str = 'capture') -> bool:
+        """
+        添加文字模板
+
+        参数:
+            text: 模板对应的文字
+            image: 模板图像（截取的文字区域）
+            source: 模板来源，capture（截图）或 render（字体渲染）
+
+        返回:
+            是否已添加（纯色图像无法作为模板）
+        """
+        gray = _to_gray(image)
+        # 纯色模板无法匹配（归一化相关系数无定义）
+        if gray.size == 0 or float(gray.std()) < 1.0:
+            return False
+        entry = {'image': np.ascontiguousarray(gray), 'source': source}
+        limit = self.config.get('ocr', 'template_max_per_text', 3)
+        key = normalize_text(text)
+        with self._lock:
+            templates = self.templates.setdefault(key, [])
+            if source == 'capture':
+                # 新出现的截图模板优先匹配，超出数量时淘汰最旧的截图模板
+                templates.insert(0, entry)
+                captured = [t for t in templates if t['source'] == 'capture']
+                for stale in captured[limit:]:
+                    templates.remove(stale)
+            else:
+                templates.append(entry)
+        return True
+
+    def render_templates(self, text: str) -> int:
+        """
+        用系统字体渲染文字模板（尚未截取到该文字时使用）
+
+        返回:
+            添加的模板数量，找不到可用字体时为0
+        """
+        font_path = find_font('zh' if _CJK_PATTERN.search(text) else 'en')
+        if font_path is None:
+            return 0
+        count = 0
+        for size in self.config.get('ocr', 'template_font_sizes', [14, 18, 24, 32]):
+            gray = _to_gray(render_text(text, font_path, size))
+            # 裁掉渲染时的白边，只保留文字本身
+            points = cv2.findNonZero(255 - gray)
+            if points is None:
+                continue
+            x, y, w, h = cv2.boundingRect(points)
+            count += self.add_template(text, gray[y:y + h, x:x + w], source='render')
+        return count
+
+    def clear(self, text: Optional[str] = None) -> None:
+        """清除指定文字（为None时清除全部）的模板"""
+        with self._lock:
+            if text is None:
+                self.templates.clear()
+            else:
+                self.templates.pop(normalize_text(text), None)
+
+    def match(self, text: str, image: np.ndarray,
+              near: Optional[Tuple[int, int, int, int]] = None) -> Optional[Dict]:
+        """
+        仅使用模板匹配查找文字
+
+        参数:
+            text: 要查找的文字
+            image: 待查找的图像
+            near: 上次找到时的位置（图像坐标），提供时先只在其附近的窗口内匹配
+
+        返回:
+            文字框字典（confidence为匹配得分），未命中时返回None
+        """
+        with self._lock:
+            templates = list(self.templates.get(normalize_text(text), []))
+        if not templates:
+            return None
+
+        gray = _to_gray(image)
+        threshold = self.config.get('ocr', 'template_threshold', 0.85)
+        windows = [(0, 0, gray.shape[1], gray.shape[0])]
+        if near is not None:
+            margin = max(self.config.get('ocr', 'track_margins', [16, 64]) or [16])
+            windows.insert(0, expand_rect(near, margin, gray.shape))
+
+        for index, (wx, wy, ww, wh) in enumerate(windows):
+            view = gray[wy:wy + wh, wx:wx + ww]
+            for template in templates:
+                score, (x, y) = match_template(view, template['image'], invert=template['source'] == 'render')
+                if score >= threshold:
+                    th, tw = template['image'].shape[:2]
+                    if near is not None and index == 0:
+                        self.window_hits += 1
+                    return {'x': wx + x, 'y': wy + y, 'width': tw, 'height': th, 'text': text,
+                            'confidence': score, 'source': template['source']}
+        return None
+
+    def locate(self, text: str, region: Optional[Tuple[int, int, int, int]] = None,
+               image: Optional[np.ndarray] = None, ocr_fallback: bool = True,
+               min_confidence: float = 0.0) -> Optional[Dict]:
+        """
+        定位文字：先用模板匹配，未命中时回退到OCR，OCR找到后用截图更新模板
+
+        参数:
+            text: 要查找的文字
+            region: 可选的查找区域 (x, y, width, height)
+            image: 待查找的图像，为None时截取屏幕
+            ocr_fallback: 模板未命中时是否使用OCR
+            min_confidence: OCR回退时的最低置信度（0-1）
+
+        返回:
+            文字框字典（坐标为屏幕/图像坐标，source表示命中方式），未找到时返回None
+        """
+        start = time.perf_counter()
+        offset = (max(0, region[0]), max(0, region[1])) if region else (0, 0)
+        if image is None:
+            image = self.ocr.grab_frame(region)
+        elif region:
+            image = self.ocr._crop(image, region)
+        grabbed = time.perf_counter()
+        self.last_timings = {'capture': (grabbed - start) * 1000}
+
+        # 没有任何模板时先尝试字体渲染的模板
+        key = normalize_text(text)
+        if key not in self.templates and self.config.get('ocr', 'template_render', False):
+            self.render_templates(text)
+
+        # 与OCR共用位置跟踪：上次找到的位置附近优先匹配
+        near = self.ocr.tracked_rect(text)
+        if near is not None:
+            near = (near[0] - offset[0], near[1] - offset[1], near[2], near[3])
+
+        box = self.match(text, image, near)
+        matched = time.perf_counter()
+        self.last_timings['match'] = (matched - grabbed) * 1000
+        if box is not None:
+            self.template_hits += 1
+            box = self._shift(box, offset)
+            self.ocr.track(text, (box['x'], box['y'], box['width'], box['height']))
+            return box
+        if not ocr_fallback:
+            self.misses += 1
+            return None
+
+        # 回退到OCR（先识别跟踪位置附近的小窗口，再识别整个区域）
+        found = self.ocr.find_text(text, region, image, min_confidence=min_confidence)
+        self.last_timings['ocr'] = (time.perf_counter() - matched) * 1000
+        if found is None:
+            self.misses += 1
+            return None
+
+        self.ocr_hits += 1
+        x, y = found['x'] - offset[0], found['y'] - offset[1]
+        w, h = found['width'], found['height']
+        self.add_template(text, image[max(0, y):y + h, max(0, x):x + w], source='capture')
+        box = dict(found)
+        box['source'] = 'ocr'
+        return box
+
+    @staticmethod
+    def _shift(box: Dict, offset: Tuple[int, int]) -> Dict:
+        """将区域内坐标换算为屏幕/图像坐标"""
+        if offset != (0, 0):
+            box = dict(box)
+            box['x'] += offset[0]
+            box['y'] += offset[1]
+        return box
+
+    def stats(self) -> Dict:
+        """返回定位统计：模板命中、OCR命中、未找到次数及模板命中率"""
+        total = self.template_hits + self.ocr_hits + self.misses
+        return {
+            'template_hits': self.template_hits,
+            'window_hits': self.window_hits,
+            'ocr_hits': self.ocr_hits,
+            'misses': self.misses,
+            'template_hit_rate': self.template_hits / total if total else 0.0,
+            'templates': sum(len(t) for t in self.templates.values())
+        }
@@ -134,6 +134,816 @@ def test_ocr_preparation():
         return False, f"OCR模块初始化失败: {str(e)}"
 
 
+def test_update_config_reload():
+    """测试更新配置时只重新初始化配置发生变化的模块，并复用已加载的OCR引擎"""
+    try:
+        from automod import AutoMod
+
+        auto = AutoMod()
+        ocr, mouse, translator = auto.ocr, auto.mouse, auto.translator
+
+        # 只有翻译配置变化时只重建翻译器
+        auto.update_config(translation={'timeout': 5})
+        assert auto.ocr is ocr and auto.mouse is mouse and auto.translator is not translator
+        translator = auto.translator
+
+        # OCR配置变化时重建OCR处理器，但复用注册表中的引擎，定位器指向新的处理器
+        auto.update_config(ocr={'frame_cache_size': 8})
+        assert auto.ocr is not ocr and auto.ocr.engine is ocr.engine
+        assert auto.locator.ocr is auto.ocr
+        ocr = auto.ocr
+
+        # 设置为当前值时不重建任何模块，set_*方法同样只重建变化的模块
+        auto.update_config(ocr={'frame_cache_size': 8})
+        auto.set_ocr_engine(auto.config.get('ocr', 'engine'))
+        auto.set_translation_service(auto.config.get('translation', 'service'))
+        assert auto.ocr is ocr and auto.translator is translator and auto.mouse is mouse
+        auto.set_human_like_mouse(not auto.config.get('mouse', 'human_like'))
+        assert auto.mouse is not mouse and auto.ocr is ocr and auto.translator is translator
+
+        return True, "配置更新测试通过"
+    except Exception as e:
+        return False, f"配置更新测试失败: {str(e)}"
+
+
+def test_tesseract_pool():
+    """测试进程池引擎按进程数共享，以及列式结果"""
+    try:
+        import numpy as np
+        from concurrent.futures import Future
+        from automod import AutoModConfig, BoxArray, OCRProcessor, clear_engine_cache
+
+        def processor_with(**ocr_config):
+            config = AutoModConfig()
+            config.update_ocr_config(engine='pytesseract_pool', **ocr_config)
+            return OCRProcessor(config)
+
+        try:
+            # 进程数相同的处理器共用进程池，不同时各自创建
+            one = processor_with(pool_workers=1, columnar=True)
+            assert processor_with(pool_workers=1).engine is one.engine
+            assert processor_with(pool_workers=2).engine is not one.engine
+
+            data = {
+                'text': ['Hello', 'world'], 'conf': [95, 88],
+                'left': [10, 60], 'top': [5, 5], 'width': [40, 45], 'height': [20, 20],
+                'block_num': [1, 1], 'par_num': [1, 1], 'line_num': [1, 1]
+            }
+
+            def submit(image):
+                future = Future()
+                future.set_result(data)
+                return future
+            one._submit_tesseract = submit
+
+            # 整图和批量区域识别在columnar模式下都返回BoxArray
+            image = np.full((100, 200), 255, dtype=np.uint8)
+            result = one._recognize_with_pytesseract_pool(image, 60)
+            assert isinstance(result['boxes'], BoxArray) and result['text'] == 'Hello world'
+            results = one.recognize_regions(image, [(0, 0, 100, 50), (100, 0, 100, 50)])
+            assert all(isinstance(r['boxes'], BoxArray) and r['text'] == 'Hello world' for r in results)
+            assert results[0]['lines'][0]['text'] == 'Hello world'
+        finally:
+            clear_engine_cache('pytesseract_pool')
+
+        return True, "进程池引擎测试通过"
+    except Exception as e:
+        return False, f"进程池引擎测试失败: {str(e)}"
+
+
+def test_async_ocr():
+    """测试异步OCR流水线和线程安全的帧识别接口"""
+    try:
+        import asyncio
+        import numpy as np
+        from concurrent.futures import ThreadPoolExecutor
+        from automod import AsyncOCRProcessor
+
+        frame = np.full((120, 160, 3), 255, dtype=np.uint8)
+        frame[40:60, 30:90] = 0
+        calls = []
+        processor = _stub_processor(frame, _dark_text_engine(calls), frame_cache=False)
+
+        async def collect():
+            async with AsyncOCRProcessor(processor, workers=2) as ocr:
+                results = [result async for result in ocr.stream(fps=50, max_frames=3)]
+                return results, ocr.stats()
+
+        results, stats = asyncio.run(collect())
+        assert len(results) == 3 and all(r['text'] == 'OK' for r in results)
+        assert all('recognize' in r['timings'] for r in results)
+        assert stats['frames_recognized'] == 3 and stats['frames_captured'] >= 3
+
+        # 多个线程同时截图识别（经过帧差缓存），各自得到独立的结果和耗时
+        processor = _stub_processor(frame, _dark_text_engine(calls))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            frames = list(pool.map(lambda _: processor.grab_frame(), range(8)))
+            results = list(pool.map(processor.recognize_frame, frames))
+        assert all(r['boxes'] == results[0]['boxes'] and 'timings' in r for r in results)
+        results[0]['boxes'].clear()
+        assert all(r['boxes'] for r in results[1:])
+        cache = processor.cache_stats()
+        assert cache['hits'] + cache['misses'] == 8
+
+        return True, "异步OCR测试通过"
+    except Exception as e:
+        return False, f"异步OCR测试失败: {str(e)}"
+
+
+def _dark_text_engine(calls, text='OK', confidence=90.0):
+    """
+    桩识别引擎：把图像中水平相连的深色像素块识别为文字框，并记录每次调用的图像尺寸
+
+    confidence可以是数值，也可以是根据文字框（不含confidence字段）返回置信度的函数
+    """
+    import cv2
+    import numpy as np
+
+    def engine(image):
+        calls.append(image.shape[:2])
+        dark = (image < 128).astype(np.uint8)
+        count, labels = cv2.connectedComponents(cv2.dilate(dark, np.ones((1, 15), np.uint8)))
+        boxes = []
+        for label in range(1, count):
+            ys, xs = np.nonzero((labels == label) & (dark > 0))
+            box = {
+                'x': int(xs.min()), 'y': int(ys.min()),
+                'width': int(xs.max() - xs.min() + 1), 'height': int(ys.max() - ys.min() + 1),
+                'text': text, 'line': len(boxes)
+            }
+            box['confidence'] = confidence(box) if callable(confidence) else confidence
+            boxes.append(box)
+        return {'text': ' '.join(box['text'] for box in boxes), 'boxes': boxes, 'engine': 'pytesseract'}
+    return engine
+
+
+def _stub_processor(frames, engine, **ocr_config):
+    """创建使用内存截图和桩识别引擎的OCRProcessor（不依赖屏幕和tesseract）"""
+    from automod import AutoModConfig, FakeCapture, OCRProcessor, OCRResult
+
+    config = AutoModConfig()
+    config.update_ocr_config(preprocess=['grayscale'], **ocr_config)
+    processor = OCRProcessor(config)
+    processor.capture = FakeCapture(frames)
+    processor._run_engine = lambda image: processor._group(OCRResult(engine(image)))
+    return processor
+
+
+def test_frame_cache():
+    """测试帧差缓存的命中、淘汰和结果隔离"""
+    try:
+        import numpy as np
+        from automod import FakeCapture
+
+        frame = np.full((200, 300, 3), 255, dtype=np.uint8)
+        frame[20:40, 20:60] = 0
+        frame[120:140, 150:200] = 0
+        calls = []
+        processor = _stub_processor(frame, _dark_text_engine(calls), frame_cache_size=2)
+        first, second, third = (0, 0, 100, 100), (100, 100, 150, 80), (0, 100, 100, 100)
+
+        # 修改返回的结果不影响缓存中的结果
+        result = processor.screenshot_and_recognize(first)
+        expected = [dict(box) for box in result['boxes']]
+        result['boxes'][0]['x'] = 999
+        result['boxes'].append({'x': 0, 'y': 0, 'width': 1, 'height': 1, 'text': 'extra', 'confidence': 1.0})
+        result['lines'].clear()
+        cached = processor.screenshot_and_recognize(first)
+        assert len(calls) == 1
+        assert cached['boxes'] == expected and cached['lines'] and cached.find_one('extra') is None
+
+        # 超出容量时淘汰最久未使用的区域
+        processor.screenshot_and_recognize(second)
+        processor.screenshot_and_recognize(third)
+        processor.screenshot_and_recognize(second)
+        assert len(calls) == 3
+        processor.screenshot_and_recognize(first)
+        assert len(calls) == 4
+
+        # 画面变化后重新识别
+        changed = frame.copy()
+        changed[60:80, 20:60] = 0
+        processor.capture = FakeCapture(changed)
+        assert len(processor.screenshot_and_recognize(first)['boxes']) == 2
+        assert len(calls) == 5
+
+        stats = processor.cache_stats()
+        assert stats['hits'] == 2 and stats['misses'] == 5 and stats['evictions'] >= 1
+
+        return True, "帧差缓存测试通过"
+    except Exception as e:
+        return False, f"帧差缓存测试失败: {str(e)}"
+
+
+def test_recognize_at_points():
+    """测试坐标识别由小到大扩大区域并记住成功的区域大小"""
+    try:
+        import numpy as np
+
+        frame = np.full((200, 300, 3), 255, dtype=np.uint8)
+        frame[95:105, 115:125] = 0    # 距第一个坐标约20像素，小区域内识别不到
+        frame[148:152, 195:205] = 0   # 紧挨第二个坐标
+        calls = []
+        processor = _stub_processor(frame, _dark_text_engine(calls))
+        points = [(100, 100), (200, 150)]
+
+        # 第一轮两个坐标的小区域合并为一次识别，第二轮只扩大未识别到文字的坐标
+        results = processor.recognize_at_points(points, sizes=(10, 30))
+        assert len(calls) == 2 and calls[1] == (60, 60)
+        assert results[0]['region'] == (70, 70, 60, 60) and results[0]['text'] == 'OK'
+        assert results[0]['boxes'][0]['x'] == 45
+        assert results[1]['region'] == (190, 140, 20, 20) and results[1]['text'] == 'OK'
+
+        # 再次识别时各坐标直接使用上次成功的区域大小，一次识别完成
+        calls.clear()
+        results = processor.recognize_at_points(points, sizes=(10, 30))
+        assert len(calls) == 1
+        assert [r['region'] for r in results] == [(70, 70, 60, 60), (190, 140, 20, 20)]
+        assert all(r['text'] == 'OK' for r in results)
+
+        return True, "坐标区域识别测试通过"
+    except Exception as e:
+        return False, f"坐标区域识别测试失败: {str(e)}"
+
+
+def test_find_text_tracking():
+    """测试查找文字时先识别上次位置附近的窗口，未命中再扩大"""
+    try:
+        import numpy as np
+        from automod import FakeCapture
+
+        frame = np.full((300, 400, 3), 255, dtype=np.uint8)
+        frame[100:120, 200:260] = 0
+        calls = []
+        processor = _stub_processor(frame, _dark_text_engine(calls), frame_cache=False, track_margins=[16, 64])
+
+        # 首次查找识别整个画面，并记住位置
+        box = processor.find_text('OK')
+        assert (box['x'], box['y']) == (200, 100) and calls == [(300, 400)]
+        assert processor.tracked_rect('OK') == (200, 100, 60, 20)
+
+        # 再次查找只识别上次位置附近的小窗口
+        box = processor.find_text('OK')
+        assert (box['x'], box['y']) == (200, 100) and calls[-1] == (52, 92)
+
+        # 文字移动后依次扩大窗口，都未命中才识别整个画面
+        moved = np.full_like(frame, 255)
+        moved[200:220, 40:100] = 0
+        processor.capture = FakeCapture(moved)
+        calls.clear()
+        box = processor.find_text('OK')
+        assert (box['x'], box['y']) == (40, 200)
+        assert calls == [(52, 92), (148, 188), (300, 400)]
+
+        # 文字消失后不再跟踪
+        processor.capture = FakeCapture(np.full_like(frame, 255))
+        assert processor.find_text('OK') is None and processor.tracked_rect('OK') is None
+
+        stats = processor.track_stats()
+        assert stats['window_hits'] == 1 and stats['window_misses'] == 2
+        assert stats['full_hits'] == 2 and stats['misses'] == 1
+
+        return True, "文字位置跟踪测试通过"
+    except Exception as e:
+        return False, f"文字位置跟踪测试失败: {str(e)}"
+
+
+def test_ocr_retry():
+    """测试识别重试只作用于低置信度的区域识别，并优先使用上次成功的变体"""
+    try:
+        import numpy as np
+
+        frame = np.full((200, 300, 3), 255, dtype=np.uint8)
+        frame[80:90, 90:130] = 0      # 小字：原尺寸置信度不足，放大2倍后达标
+        frame[150:170, 200:260] = 0   # 大字：原尺寸即达标
+        small, large = (70, 70, 80, 40), (190, 140, 80, 40)
+        calls = []
+        engine = _dark_text_engine(calls, confidence=lambda box: 95.0 if box['height'] >= 18 else 30.0)
+        processor = _stub_processor(frame, engine, frame_cache=False, retry=True,
+                                    retry_variants=['native', 'scale_1.5', 'scale_2'])
+
+        # 全屏识别（包括文字区域检测拆分出的区域）不重试
+        result = processor.screenshot_and_recognize()
+        assert len(calls) == 1 and 'variant' not in result
+        processor.config.update_ocr_config(text_detection=True)
+        processor.screenshot_and_recognize()
+        assert len(calls) == 2 and processor.retry_stats()['calls'] == 0
+        processor.config.update_ocr_config(text_detection=False)
+
+        # 批量识别后只有置信度不足的区域重试，批量结果作为原始变体的结果
+        calls.clear()
+        results = processor.recognize_regions(frame, [small, large])
+        assert len(calls) == 3
+        assert results[0]['variant'] == 'scale_2' and results[0]['boxes'][0]['height'] == 10
+        assert 'variant' not in results[1]
+        assert processor.retry_stats()['winners'] == {small: 'scale_2'}
+
+        # 同一区域再次识别时先尝试上次成功的变体
+        calls.clear()
+        result = processor.recognize_region(frame, small)
+        assert len(calls) == 1 and calls[0] == (80, 160) and result['variant'] == 'scale_2'
+        stats = processor.retry_stats()
+        assert stats['calls'] == 2 and stats['first_try_hits'] == 1
+
+        return True, "识别重试测试通过"
+    except Exception as e:
+        return False, f"识别重试测试失败: {str(e)}"
+
+
+def test_template_locator():
+    """测试已知文字先用模板匹配定位，未命中时回退到OCR"""
+    try:
+        import cv2
+        import numpy as np
+        from automod import FakeCapture, TemplateLocator
+
+        def screen(x, y):
+            frame = np.full((240, 320, 3), 255, dtype=np.uint8)
+            cv2.putText(frame, 'OK', (x, y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+            return frame
+
+        calls = []
+        processor = _stub_processor(screen(40, 60), _dark_text_engine(calls), frame_cache=False)
+        locator = TemplateLocator(processor)
+
+        # 首次定位通过OCR找到文字，并截取模板
+        box = locator.locate('OK')
+        assert box['source'] == 'ocr' and len(calls) == 1
+        first = (box['x'], box['y'])
+
+        # 之后直接用模板匹配，不再调用OCR引擎
+        box = locator.locate('OK')
+        assert box['source'] == 'capture' and (box['x'], box['y']) == first and len(calls) == 1
+
+        # 文字移动到上次位置附近的窗口之外时，在整个画面上匹配
+        processor.capture = FakeCapture(screen(200, 180))
+        box = locator.locate('OK')
+        assert box['source'] == 'capture' and len(calls) == 1
+        assert (box['x'] - first[0], box['y'] - first[1]) == (160, 120)
+
+        stats = locator.stats()
+        assert stats['template_hits'] == 2 and stats['window_hits'] == 1 and stats['ocr_hits'] == 1
+
+        return True, "模板定位测试通过"
+    except Exception as e:
+        return False, f"模板定位测试失败: {str(e)}"
+
+
+def test_paddle_stages():
+    """测试PaddleOCR分阶段识别的检测框缓存和整体识别回退"""
+    try:
+        import warnings
+        import numpy as np
+        from concurrent.futures import ThreadPoolExecutor
+        from automod import AutoModConfig, OCRProcessor
+
+        class FakePaddle:
+            """分阶段接口的替身：固定返回一个检测框，识别结果为text"""
+            def __init__(self):
+                self.text = 'OK'
+                self.detections = 0
+
+            def text_detector(self, image):
+                self.detections += 1
+                return np.array([[[10, 10], [60, 10], [60, 30], [10, 30]]], dtype=np.float32), 0.0
+
+            def text_recognizer(self, crops):
+                return [(self.text, 0.95) for _ in crops], 0.0
+
+            def ocr(self, image, cls=True):
+                return [[([[1, 2], [30, 2], [30, 12], [1, 12]], ('whole', 0.9))]]
+
+        config = AutoModConfig()
+        config.update_ocr_config(preprocess=[], upright=True, frame_cache=False,
+                                 paddle_det_cache=True, paddle_det_refresh=2)
+        processor = OCRProcessor(config)
+        processor.engine_type, processor.engine = 'paddleocr', FakePaddle()
+        processor._paddle_staged = True
+        image = np.full((80, 120, 3), 255, dtype=np.uint8)
+
+        # 检测框最多复用paddle_det_refresh帧
+        for _ in range(4):
+            assert processor.recognize(image)['text'] == 'OK'
+        stats = processor.paddle_det_stats()
+        assert stats['detections'] == 2 and stats['cache_hits'] == 2
+
+        # 缓存的检测框上识别不到文字时重新检测
+        processor.engine.text = ''
+        assert processor.recognize(image)['text'] == ''
+        stats = processor.paddle_det_stats()
+        assert stats['invalidations'] == 1 and stats['detections'] == 3
+
+        # 多个线程同时识别时统计不丢失
+        processor.engine.text = 'OK'
+        before = stats['detections'] + stats['cache_hits']
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: processor.recognize(image), range(40)))
+        stats = processor.paddle_det_stats()
+        assert stats['detections'] + stats['cache_hits'] == before + 40
+
+        # 内部接口不可用时警告一次并改为整体识别
+        class Incompatible(FakePaddle):
+            def text_detector(self, image):
+                raise AttributeError("'TextDetector' object has no attribute 'predictor'")
+
+        processor.engine = Incompatible()
+        other = np.full((60, 100, 3), 255, dtype=np.uint8)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            assert processor.recognize(other)['text'] == 'whole'
+            assert processor.recognize(other)['text'] == 'whole'
+        assert len(caught) == 1 and not processor._paddle_staged
+
+        return True, "PaddleOCR分阶段识别测试通过"
+    except Exception as e:
+        return False, f"PaddleOCR分阶段识别测试失败: {str(e)}"
+
+
+def test_changed_regions():
+    """测试变化区域检测"""
+    try:
+        import numpy as np
+        from automod.regions import changed_tiles, tiles_to_rects, merge_rects
+
+        prev = np.zeros((100, 150), dtype=np.uint8)
+        curr = prev.copy()
+        curr[10:20, 10:20] = 255      # 左上角块
+        curr[97:99, 140:145] = 255    # 右下角不完整的块
+        curr[40:45, 70:75] = 5        # 小于容差的变化
+
+        mask = changed_tiles(prev, curr, tile=32, tolerance=12)
+        assert mask.shape == (4, 5)
+        assert mask[0, 0] and mask[3, 4] and mask.sum() == 2
+
+        # 右下角的块截断到原图范围内
+        rects = sorted(tiles_to_rects(mask, 32, curr.shape))
+        assert rects == [(0, 0, 32, 32), (128, 96, 22, 4)]
+
+        # 相邻的变化块合并为同一矩形
+        mask[0, 1] = True
+        assert sorted(tiles_to_rects(mask, 32, curr.shape))[0] == (0, 0, 64, 32)
+
+        # 链式重叠的矩形合并为一个，不相交的保持不变
+        merged = merge_rects([(0, 0, 10, 10), (50, 50, 5, 5), (8, 8, 10, 10), (16, 16, 4, 4)])
+        assert sorted(merged) == [(0, 0, 20, 20), (50, 50, 5, 5)]
+        assert merge_rects([]) == []
+
+        return True, "变化区域检测测试通过"
+    except Exception as e:
+        return False, f"变化区域检测测试失败: {str(e)}"
+
+
+def test_group_words():
+    """测试单词框按行、短语分组"""
+    try:
+        from automod.result import BoxArray, group_words
+
+        def word(text, x, line):
+            return {'x': x, 'y': line * 30, 'width': 30, 'height': 20,
+                    'text': text, 'confidence': 0.9, 'line': line}
+
+        # 第0行 "Start Game" 与 "Options" 间距超过行高，切分为两个短语
+        boxes = [word('Game', 40, 0), word('Start', 0, 0), word('Options', 120, 0), word('Exit', 0, 1)]
+        lines, phrases = group_words(boxes)
+        assert [line['text'] for line in lines] == ['Start Game Options', 'Exit']
+        assert [phrase['text'] for phrase in phrases] == ['Start Game', 'Options', 'Exit']
+        assert lines[0]['words'] == [1, 0, 2]
+        assert (phrases[0]['x'], phrases[0]['width']) == (0, 70)
+
+        # 列式实现与逐个字典的实现结果一致
+        assert group_words(BoxArray.from_list(boxes)) == (lines, phrases)
+        assert group_words(BoxArray.from_list([])) == ([], [])
+
+        return True, "单词分组测试通过"
+    except Exception as e:
+        return False, f"单词分组测试失败: {str(e)}"
+
+
+def test_tesseract_boxes():
+    """测试从tesseract输出构建列式文字框"""
+    try:
+        from automod.result import BoxArray
+
+        data = {
+            'text': ['', 'Hello', 'world', '  ', 'low', 'Next'],
+            'conf': [-1, 95, 88, 90, 20, 70],
+            'left': [0, 10, 60, 100, 120, 10],
+            'top': [0, 5, 5, 5, 5, 40],
+            'width': [200, 40, 45, 5, 30, 35],
+            'height': [80, 20, 20, 20, 20, 20],
+            'block_num': [0, 1, 1, 1, 1, 2],
+            'par_num': [0, 1, 1, 1, 1, 1],
+            'line_num': [0, 1, 1, 1, 1, 1]
+        }
+        # 过滤空文本和低于阈值（0-100刻度）的单词，行号按(块, 段, 行)连续编号
+        boxes = BoxArray.from_tesseract(data, 60, offset_y=100, line_base=3)
+        assert boxes.text == ['Hello', 'world', 'Next']
+        assert boxes.line.tolist() == [3, 3, 4]
+        assert boxes.y.tolist() == [105, 105, 140]
+        assert boxes[0] == {'x': 10, 'y': 105, 'width': 40, 'height': 20,
+                            'text': 'Hello', 'confidence': 95.0, 'line': 3}
+
+        empty = BoxArray.from_tesseract({key: [] for key in data}, 60)
+        assert len(empty) == 0
+
+        return True, "tesseract文字框测试通过"
+    except Exception as e:
+        return False, f"tesseract文字框测试失败: {str(e)}"
+
+
+def test_translation_cache():
+    """测试翻译缓存的过期与淘汰"""
+    try:
+        from automod.translation_cache import TranslationCache, make_key
+
+        ok = {'translated_text': '你好', 'error': None}
+        failed = {'translated_text': '', 'error': 'timeout'}
+
+        # LRU：超出容量时淘汰最久未使用的条目
+        cache = TranslationCache(max_size=2, ttl=None)
+        a, b, c = (make_key('google', 'en', 'zh', text) for text in ('a', 'b', 'c'))
+        cache.set(a, ok)
+        cache.set(b, ok)
+        assert cache.get(a) == ok
+        cache.set(c, ok)
+        assert cache.get(b) is None
+        assert cache.get(a) == ok and cache.get(c) == ok
+        assert cache.stats()['evictions'] == 1
+
+        # 成功结果按ttl过期，失败结果按negative_ttl过期
+        cache = TranslationCache(ttl=0.05, negative_ttl=0.05)
+        cache.set(a, ok)
+        cache.set(b, failed)
+        assert cache.get(b) == failed and cache.stats()['negative_hits'] == 1
+        time.sleep(0.1)
+        assert cache.get(a) is None and cache.get(b) is None
+        assert cache.stats()['size'] == 0
+
+        # negative_ttl为0时不缓存失败结果
+        cache = TranslationCache(negative_ttl=0)
+        cache.set(a, failed)
+        assert cache.get(a) is None and cache.stats()['stores'] == 0
+
+        return True, "翻译缓存测试通过"
+    except Exception as e:
+        return False, f"翻译缓存测试失败: {str(e)}"
+
+
+def test_token_bucket():
+    """测试令牌桶限流"""
+    try:
+        from automod.rate_limit import TokenBucket
+
+        now = [100.0]
+        bucket = TokenBucket(rate=20, burst=2, clock=lambda: now[0])
+
+        # 突发容量内的请求不等待，超出后按速率计算等待时间（预订的令牌累计）
+        assert bucket.reserve() == 0 and bucket.reserve() == 0
+        assert abs(bucket.reserve() - 0.05) < 1e-9
+        assert abs(bucket.reserve() - 0.10) < 1e-9
+
+        # 空闲期间补充令牌，但不超过桶容量
+        now[0] += 1.0
+        assert bucket.reserve() == 0 and bucket.reserve() == 0
+        assert abs(bucket.reserve() - 0.05) < 1e-9
+        assert bucket.stats()['acquired'] == 7
+
+        # 令牌不足时acquire阻塞等待（只检查下限，上限放宽以适应负载较高的机器）
+        bucket = TokenBucket(rate=20, burst=1)
+        bucket.acquire()
+        start = time.monotonic()
+        waited = bucket.acquire()
+        elapsed = time.monotonic() - start
+        assert waited > 0 and elapsed >= waited * 0.9 and elapsed < 1.0
+
+        # 速率不大于0时不限流
+        unlimited = TokenBucket(rate=0)
+        assert all(unlimited.acquire() == 0 for _ in range(10))
+
+        return True, "令牌桶限流测试通过"
+    except Exception as e:
+        return False, f"令牌桶限流测试失败: {str(e)}"
+
+
+def test_packed_translation():
+    """测试批量翻译的合并请求与拆分回退"""
+    try:
+        from automod import AutoModConfig, Translator
+        from automod.translation import pack_texts, plan_units, split_packed
+
+        # 按长度上限和条数上限装箱，超长文本单独成批
+        assert pack_texts(['aa', 'bb', 'cc'], limit=5) == [['aa', 'bb'], ['cc']]
+        assert pack_texts(['a', 'b', 'c'], limit=100, max_items=2) == [['a', 'b'], ['c']]
+        assert pack_texts(['a' * 10, 'b'], limit=5) == [['a' * 10], ['b']]
+
+        # 自动检测语言时中日韩文本与其他文本分开合并，多行文本单独请求
+        config = AutoModConfig()
+        units = plan_units(config, ['Hello', '你好', 'World', '世界', 'a\nb'], 'auto', 'google')
+        assert units == [['你好', '世界'], ['Hello', 'World'], 'a\nb']
+        assert plan_units(config, ['Hello', '你好'], 'en', 'google') == [['Hello', '你好']]
+
+        # 译文行数与原文不一致时无法拆分
+        packed = {'translated_text': '一\n二\n', 'src_lang': 'en', 'dest_lang': 'zh',
+                  'service': 'google', 'error': None}
+        assert set(split_packed(['one', 'two'], packed)) == {'one', 'two'}
+        assert split_packed(['one', 'two', 'three'], packed) is None
+
+        class FakeResponse:
+            def __init__(self, data):
+                self.data = data
+
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return self.data
+
+        class FakeSession:
+            """逐行返回译文；请求中包含"merge"时把前两行译文合并为一行"""
+            def __init__(self):
+                self.requests = []
+
+            def get(self, url, params=None, timeout=None):
+                self.requests.append(params['q'])
+                lines = ['译' + line for line in params['q'].split('\n')]
+                if 'merge' in params['q'] and len(lines) > 1:
+                    lines[:2] = [lines[0] + lines[1]]
+                return FakeResponse([[['\n'.join(lines), params['q']]], None, 'en'])
+
+        config = AutoModConfig()
+        config.update_translation_config(cache=False, max_workers=1)
+        translator = Translator(config)
+        translator._session = FakeSession()
+
+        results = translator.batch_translate(['one', 'two', 'one'], 'en', 'zh')
+        assert [r['translated_text'] for r in results] == ['译one', '译two', '译one']
+        assert translator._session.requests == ['one\ntwo']
+        assert translator.pack_stats == {'packs': 1, 'packed_items': 2, 'fallbacks': 0}
+
+        # 行数不一致时回退为逐条请求
+        translator._session = FakeSession()
+        results = translator.batch_translate(['merge', 'me', 'now'], 'en', 'zh')
+        assert [r['translated_text'] for r in results] == ['译merge', '译me', '译now']
+        assert translator._session.requests == ['merge\nme\nnow', 'merge', 'me', 'now']
+        assert translator.pack_stats['fallbacks'] == 1
+
+        return True, "合并请求翻译测试通过"
+    except Exception as e:
+        return False, f"合并请求翻译测试失败: {str(e)}"
+
+
+def test_async_translation():
+    """测试异步批量翻译的去重、缓存和合并请求"""
+    try:
+        import asyncio
+        from automod import AutoModConfig
+        from automod.async_translation import AsyncTranslator
+
+        class FakeResponse:
+            def __init__(self, data):
+                self.data = data
+
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return self.data
+
+        class FakeClient:
+            """替代httpx.AsyncClient：逐行返回译文；请求中包含"merge"时把前两行译文合并为一行"""
+            def __init__(self):
+                self.requests = []
+
+            async def get(self, url, params=None):
+                self.requests.append(params['q'])
+                lines = ['译' + line for line in params['q'].split('\n')]
+                if 'merge' in params['q'] and len(lines) > 1:
+                    lines[:2] = [lines[0] + lines[1]]
+                return FakeResponse([[['\n'.join(lines), params['q']]], None, 'en'])
+
+            async def aclose(self):
+                pass
+
+        texts = ['one', 'two', 'one', '', 'a\nb']
+
+        # 不合并请求：相同文本只请求一次，空文本不请求，结果顺序与输入一致
+        config = AutoModConfig()
+        config.update_translation_config(pack=False)
+        translator = AsyncTranslator(config)
+        translator._client = FakeClient()
+        results = asyncio.run(translator.translate_many(texts, 'en', 'zh'))
+        assert [r['translated_text'] for r in results] == ['译one', '译two', '译one', '', '译a\n译b']
+        assert results[3]['error'] == 'Empty text'
+        assert sorted(translator._client.requests) == ['a\nb', 'one', 'two']
+        # 每条文本只查找一次缓存
+        assert translator.cache.stats()['misses'] == 3
+
+        # 再次翻译全部命中缓存，不发送请求
+        translator._client = FakeClient()
+        results = asyncio.run(translator.translate_many(texts, 'en', 'zh'))
+        assert results[2]['translated_text'] == '译one' and translator._client.requests == []
+        assert translator.cache.stats()['memory_hits'] == 3
+
+        # 合并请求：短文本拼接为一个请求，多行文本单独请求
+        config = AutoModConfig()
+        config.update_translation_config(pack=True)
+        translator = AsyncTranslator(config)
+        translator._client = FakeClient()
+        results = asyncio.run(translator.translate_many(texts, 'en', 'zh'))
+        assert [r['translated_text'] for r in results] == ['译one', '译two', '译one', '', '译a\n译b']
+        assert sorted(translator._client.requests) == ['a\nb', 'one\ntwo']
+        assert translator.stats()['pack'] == {'packs': 1, 'packed_items': 2, 'fallbacks': 0}
+        assert translator.stats()['requests'] == 2
+
+        # 译文行数不一致时回退为逐条请求，逐条结果同样写入缓存
+        translator._client = FakeClient()
+        results = asyncio.run(translator.translate_many(['merge', 'me', 'now'], 'en', 'zh'))
+        assert [r['translated_text'] for r in results] == ['译merge', '译me', '译now']
+        assert sorted(translator._client.requests) == ['me', 'merge', 'merge\nme\nnow', 'now']
+        assert translator.pack_stats['fallbacks'] == 1
+        translator._client = FakeClient()
+        asyncio.run(translator.translate_many(['merge', 'me', 'now'], 'en', 'zh'))
+        assert translator._client.requests == []
+
+        return True, "异步翻译测试通过"
+    except Exception as e:
+        return False, f"异步翻译测试失败: {str(e)}"
+
+
+def test_file_translation():
+    """测试文档分块与文件翻译的断点续传"""
+    try:
+        import tempfile
+        from automod import AutoModConfig, Translator
+        from automod.translation import iter_document_chunks, split_sentences
+
+        # 超长的行按句子切分，单句仍超长时按字符切分
+        assert split_sentences('One. Two! Three?', 10) == ['One. Two!', 'Three?']
+        assert split_sentences('abcdefghij.', 4) == ['abcd', 'efgh', 'ij.']
+
+        # 保留缩进、空行和行尾空白，同一行切分出的段之间使用连接符
+        lines = ['  Hello.  \r\n', '\n', 'First one. Second one.\n', 'Tail']
+        chunks = list(iter_document_chunks(lines, limit=12, joiner='|'))
+        assert chunks == [
+            [('  ', 'Hello.', '  \n'), ('', '', '\n')],
+            [('', 'First one.', '|')],
+            [('', 'Second one.', '\n')],
+            [('', 'Tail', '')]
+        ]
+
+        class FakeResponse:
+            def __init__(self, data):
+                self.data = data
+
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return self.data
+
+        class FakeSession:
+            """逐行返回译文；broken为True时包含"gamma"的请求失败"""
+            def __init__(self, broken):
+                self.broken = broken
+                self.requests = []
+
+            def get(self, url, params=None, timeout=None):
+                self.requests.append(params['q'])
+                if self.broken and 'gamma' in params['q']:
+                    raise ConnectionError('connection reset')
+                lines = ['译' + line for line in params['q'].split('\n')]
+                return FakeResponse([[['\n'.join(lines), params['q']]], None, 'en'])
+
+        config = AutoModConfig()
+        config.update_translation_config(cache=False, max_workers=1, pack_limits={'google': 12})
+        translator = Translator(config)
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'source.txt')
+            output = os.path.join(directory, 'output.txt')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write('alpha one.\nbeta two.\n\ngamma three.\ndelta four.\n')
+
+            # 翻译到第三块时失败，已写入的块记录在检查点中
+            translator._session = FakeSession(broken=True)
+            result = translator.translate_file(source, output, 'en', 'zh')
+            assert not result['success'] and result['chunks'] == 2
+            assert result['checkpoint'] == output + '.ckpt' and os.path.exists(result['checkpoint'])
+
+            # 再次调用时跳过已完成的块，只翻译剩余部分
+            translator._session = FakeSession(broken=False)
+            result = translator.translate_file(source, output, 'en', 'zh')
+            assert result['success'] and result['resumed_chunks'] == 2 and result['chunks'] == 4
+            assert translator._session.requests == ['gamma three.', 'delta four.']
+            assert not os.path.exists(output + '.ckpt')
+            with open(output, 'r', encoding='utf-8') as f:
+                assert f.read() == '译alpha one.\n译beta two.\n\n译gamma three.\n译delta four.\n'
+
+        return True, "文件翻译测试通过"
+    except Exception as e:
+        return False, f"文件翻译测试失败: {str(e)}"
+
+
 def run_tests():
     """运行所有测试"""
     print("======= AutoMod 功能测试 =======")
@@ -151,6 +961,23 @@ def run_tests():
     result.add_result("翻译功能测试", *test_translation())
     result.add_result("鼠标位置测试", *test_mouse_position())
     result.add_result("OCR准备测试", *test_ocr_preparation())
+    result.add_result("配置更新测试", *test_update_config_reload())
+    result.add_result("进程池引擎测试", *test_tesseract_pool())
+    result.add_result("异步OCR测试", *test_async_ocr())
+    result.add_result("帧差缓存测试", *test_frame_cache())
+    result.add_result("坐标区域识别测试", *test_recognize_at_points())
+    result.add_result("文字位置跟踪测试", *test_find_text_tracking())
+    result.add_result("识别重试测试", *test_ocr_retry())
+    result.add_result("模板定位测试", *test_template_locator())
+    result.add_result("PaddleOCR分阶段识别测试", *test_paddle_stages())
+    result.add_result("变化区域检测测试", *test_changed_regions())
+    result.add_result("单词分组测试", *test_group_words())
+    result.add_result("tesseract文字框测试", *test_tesseract_boxes())
+    result.add_result("翻译缓存测试", *test_translation_cache())
+    result.add_result("令牌桶限流测试", *test_token_bucket())
+    result.add_result("合并请求翻译测试", *test_packed_translation())
+    result.add_result("异步翻译测试", *test_async_translation())
+    result.add_result("文件翻译测试", *test_file_translation())
     
     # 打印摘要
     success = result.summary()
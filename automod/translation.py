@@ -4,11 +4,323 @@
 提供文本翻译功能，支持多种翻译服务。
 """
 
+import re
 import time
 import json
+import hashlib
+import os
+import threading
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional, Tuple, Union
 from .config import AutoModConfig
+from .rate_limit import get_rate_limiter
+from .translation_cache import cache_from_config, make_key
+
+# 中日韩文字
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af]')
+
+
+def _has_cjk(text: str) -> bool:
+    """判断文本是否包含中日韩文字"""
+    return bool(_CJK_PATTERN.search(text))
+
+
+def _is_packable(text: str) -> bool:
+    """文本是否可以与其他文本合并请求（本身含换行的文本无法按行拆分译文）"""
+    return bool(text.strip()) and '\n' not in text and '\r' not in text
+
+
+def pack_texts(texts: list, limit: int, max_items: int = 64) -> list:
+    """
+    按长度上限将文本依次装入若干批次（批内以换行分隔）
+    
+    参数:
+        texts: 文本列表
+        limit: 每批拼接后的最大字符数，单条超过上限的文本单独成批
+        max_items: 每批最多包含的文本数
+    
+    返回:
+        批次列表，每个批次为文本列表
+    """
+    chunks, current, size = [], [], 0
+    for text in texts:
+        added = len(text) + (1 if current else 0)
+        if current and (size + added > limit or len(current) >= max_items):
+            chunks.append(current)
+            current, size = [], 0
+            added = len(text)
+        current.append(text)
+        size += added
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# 各翻译服务的中文名称（用于错误信息）
+SERVICE_NAMES = {'google': '谷歌翻译', 'baidu': '百度翻译', 'youdao': '有道翻译'}
+
+# 各翻译服务的语言代码映射
+_LANG_MAPS = {
+    'baidu': {
+        'auto': 'auto',
+        'zh': 'zh', 'en': 'en', 'ja': 'jp', 'ko': 'kor',
+        'fr': 'fra', 'de': 'de', 'ru': 'ru', 'es': 'spa'
+    },
+    'youdao': {
+        'auto': 'auto',
+        'zh': 'zh-CHS', 'en': 'en', 'ja': 'ja', 'ko': 'ko',
+        'fr': 'fr', 'de': 'de', 'ru': 'ru', 'es': 'es'
+    }
+}
+
+
+def _truncate(text: str) -> str:
+    """截断文本以符合API限制（有道翻译签名使用）"""
+    if len(text) <= 20:
+        return text
+    return text[:10] + str(len(text)) + text[-10:]
+
+
+def build_request(config: AutoModConfig, service: str, text: str,
+                  src_lang: str, dest_lang: str) -> Tuple[str, Dict, str, str]:
+    """
+    构造翻译请求（同步和异步翻译器共用）
+    
+    参数:
+        config: 配置对象（读取api_key和api_secret）
+        service: 翻译服务，google、baidu或youdao
+        text: 要翻译的文本
+        src_lang: 源语言
+        dest_lang: 目标语言
+    
+    返回:
+        (请求URL, 查询参数, 服务使用的源语言代码, 服务使用的目标语言代码)
+    """
+    if service == 'google':
+        # 使用无API密钥的方式访问谷歌翻译（适用于小规模使用）
+        url = "https://translate.googleapis.com/translate_a/single"
+        params = {
+            "client": "gtx",
+            "sl": src_lang,
+            "tl": dest_lang,
+            "dt": "t",
+            "q": text
+        }
+        return url, params, src_lang, dest_lang
+        
+    if service not in _LANG_MAPS:
+        raise ValueError(f"不支持的翻译服务: {service}")
+        
+    api_key = config.get('translation', 'api_key', None)
+    api_secret = config.get('translation', 'api_secret', None)
+    if not api_key or not api_secret:
+        raise ValueError(f"{SERVICE_NAMES[service]}需要提供api_key和api_secret")
+        
+    # 转换语言代码
+    lang_map = _LANG_MAPS[service]
+    from_lang = lang_map.get(src_lang, src_lang)
+    to_lang = lang_map.get(dest_lang, dest_lang)
+    salt = str(int(time.time()))
+    
+    if service == 'baidu':
+        sign = hashlib.md5((api_key + text + salt + api_secret).encode('utf-8')).hexdigest()
+        url = "https://fanyi-api.baidu.com/api/trans/vip/translate"
+        params = {
+            'q': text,
+            'from': from_lang,
+            'to': to_lang,
+            'appid': api_key,
+            'salt': salt,
+            'sign': sign
+        }
+    else:
+        sign_str = api_key + _truncate(text) + salt + api_secret
+        sign = hashlib.sha256(sign_str.encode('utf-8')).hexdigest()
+        url = "https://openapi.youdao.com/api"
+        params = {
+            'q': text,
+            'from': from_lang,
+            'to': to_lang,
+            'appKey': api_key,
+            'salt': salt,
+            'sign': sign,
+            'signType': 'v3',
+            'curtime': salt
+        }
+    return url, params, from_lang, to_lang
+
+
+def parse_response(service: str, data, text: str, src_lang: str, dest_lang: str) -> Dict:
+    """
+    解析翻译服务返回的JSON（同步和异步翻译器共用）
+    
+    参数:
+        service: 翻译服务
+        data: 响应JSON
+        text: 原文
+        src_lang, dest_lang: build_request返回的语言代码
+    
+    返回:
+        翻译结果字典，服务返回错误时抛出RuntimeError
+    """
+    if service == 'google':
+        translated_text = ''.join([sentence[0] for sentence in data[0]])
+        # 获取检测到的源语言
+        src_lang = data[2] if len(data) > 2 else src_lang
+    elif service == 'baidu':
+        if 'error_code' in data:
+            raise RuntimeError(f"百度翻译API错误: {data.get('error_msg', '未知错误')}")
+        # 多行文本每行对应一条结果，按行拼接
+        translated_text = '\n'.join([item['dst'] for item in data['trans_result']])
+    else:
+        if data.get('errorCode') != '0':
+            raise RuntimeError(f"有道翻译API错误: {data.get('errorMsg', '未知错误')}")
+        translated_text = data.get('translation', [''])[0]
+        
+    return {
+        'text': text,
+        'translated_text': translated_text,
+        'src_lang': src_lang,
+        'dest_lang': dest_lang,
+        'service': service,
+        'error': None
+    }
+
+
+def error_result(text: str, src_lang: str, dest_lang: str, service: Optional[str], error: str) -> Dict:
+    """构造翻译失败的结果字典"""
+    return {
+        'text': text,
+        'translated_text': '',
+        'src_lang': src_lang,
+        'dest_lang': dest_lang,
+        'service': service,
+        'error': error
+    }
+
+
+def plan_units(config: AutoModConfig, pending: list, src_lang: str, service: str) -> list:
+    """
+    将待翻译文本划分为请求单元（同步和异步批量翻译共用）
+    
+    返回:
+        单元列表，每个单元为单条文本或需合并请求的文本列表
+    """
+    if not config.get('translation', 'pack', True):
+        return list(pending)
+        
+    # 多条短文本合并为一个请求（按行分隔），其余逐条翻译
+    units = []
+    packable = [text for text in pending if _is_packable(text)]
+    singles = [text for text in pending if not _is_packable(text)]
+    limit = (config.get('translation', 'pack_limits', None) or {}).get(service, 1000)
+    max_items = config.get('translation', 'pack_max_items', 64)
+    groups = [packable]
+    if src_lang == 'auto':
+        # 自动检测语言时按文字类型分组，避免同一请求中混合语言导致误判
+        groups = [[t for t in packable if _has_cjk(t)], [t for t in packable if not _has_cjk(t)]]
+    for group in groups:
+        for chunk in pack_texts(group, limit, max_items):
+            units.append(chunk if len(chunk) > 1 else chunk[0])
+    units.extend(singles)
+    return units
+
+
+def split_packed(texts: list, result: Dict) -> Optional[Dict[str, Dict]]:
+    """
+    将合并请求的翻译结果按行拆分回各条文本
+    
+    返回:
+        文本 -> 翻译结果；请求失败或译文行数与原文不一致时返回None
+    """
+    lines = result['translated_text'].split('\n') if not result.get('error') else []
+    while len(lines) > len(texts) and not lines[-1].strip():
+        lines.pop()
+    if len(lines) != len(texts) or not all(line.strip() for line in lines):
+        return None
+        
+    results = {}
+    for text, line in zip(texts, lines):
+        results[text] = {
+            'text': text,
+            'translated_text': line.strip(),
+            'src_lang': result['src_lang'],
+            'dest_lang': result['dest_lang'],
+            'service': result['service'],
+            'error': None
+        }
+    return results
+
+
+# 句末标点（含其后的空白）
+_SENTENCE_PATTERN = re.compile(r'[^。！？.!?]*[。！？.!?]+\s*|[^。！？.!?]+$')
+
+
+def split_sentences(text: str, limit: int) -> list:
+    """
+    将超长的一行按句子切分为不超过limit的若干段（单句仍超长时按字符切分）
+    
+    返回:
+        文本段列表（已去除首尾空白）
+    """
+    parts, current = [], ''
+    for sentence in _SENTENCE_PATTERN.findall(text):
+        while len(sentence) > limit:
+            if current.strip():
+                parts.append(current.strip())
+            current = ''
+            parts.append(sentence[:limit].strip())
+            sentence = sentence[limit:]
+        if current and len(current) + len(sentence) > limit:
+            parts.append(current.strip())
+            current = ''
+        current += sentence
+    if current.strip():
+        parts.append(current.strip())
+    return [part for part in parts if part]
+
+
+def iter_document_chunks(lines, limit: int, max_items: int = 64, joiner: str = ' '):
+    """
+    按行流式读取文档，生成不超过服务长度上限的翻译块
+    
+    参数:
+        lines: 可迭代的文本行（含换行符），如打开的文件对象
+        limit: 每块需要翻译的文本拼接后（按换行分隔）的最大字符数
+        max_items: 每块最多包含的待翻译文本段数
+        joiner: 同一行被按句子切分后，各段译文之间的连接符
+    
+    生成:
+        块，每块为 (缩进, 文本, 结尾) 列表：文本为空的项（空行）原样写回，
+        其余项写回 缩进 + 译文 + 结尾
+    """
+    chunk, size, count = [], 0, 0
+    for line in lines:
+        body = line.rstrip('\r\n')
+        ending = line[len(body):].replace('\r\n', '\n')
+        text = body.strip()
+        if not text:
+            chunk.append((body, '', ending))
+            continue
+        indent = body[:len(body) - len(body.lstrip())]
+        ending = body[len(body.rstrip()):] + ending
+        pieces = split_sentences(text, limit) if len(text) > limit else [text]
+        for index, piece in enumerate(pieces):
+            last = index == len(pieces) - 1
+            added = len(piece) + (1 if count else 0)
+            if count and (size + added > limit or count >= max_items):
+                yield chunk
+                chunk, size, count = [], 0, 0
+                added = len(piece)
+            chunk.append((indent if index == 0 else '', piece, ending if last else joiner))
+            size += added
+            count += 1
+    if chunk:
+        yield chunk
+
 
 class Translator:
     """翻译器，用于文本翻译"""
@@ -17,6 +329,11 @@ class Translator:
         """初始化翻译器"""
         self.config = config or AutoModConfig()
         self._session = requests.Session()
+        # 连接池大小与批量翻译的并发数一致，避免并发请求时反复建立连接
+        pool_size = max(10, self.config.get('translation', 'max_workers', 8))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
         # 设置代理（如果有）
         proxy = self.config.get('translation', 'proxy', None)
         if proxy:
@@ -24,6 +341,14 @@ class Translator:
                 'http': proxy,
                 'https': proxy
             }
+            
+        # 合并请求统计：成功合并的请求数、合并的文本数、拆分失败后逐条翻译的次数
+        self.pack_stats = {'packs': 0, 'packed_items': 0, 'fallbacks': 0}
+        # 批量翻译在多个工作线程中更新统计
+        self._stats_lock = threading.Lock()
+        
+        # 翻译结果缓存：相同文本重复翻译时不再发送请求
+        self.cache = cache_from_config(self.config)
         
     def translate(self, text: str, src_lang: str = 'auto', dest_lang: str = 'zh') -> Dict:
         """
@@ -38,17 +363,32 @@ class Translator:
             包含翻译结果的字典
         """
         if not text.strip():
-            return {
-                'text': text,
-                'translated_text': '',
-                'src_lang': src_lang,
-                'dest_lang': dest_lang,
-                'service': None,
-                'error': 'Empty text'
-            }
+            return error_result(text, src_lang, dest_lang, None, 'Empty text')
             
         service = self.config.get('translation', 'service', 'google')
+        cached = self._cache_get(service, src_lang, dest_lang, text)
+        if cached is not None:
+            return cached
+        return self._translate_and_cache(text, src_lang, dest_lang, service)
+        
+    def _cache_get(self, service: str, src_lang: str, dest_lang: str, text: str) -> Optional[Dict]:
+        """查找缓存的翻译结果，未开启缓存或未命中时返回None"""
+        if self.cache is None:
+            return None
+        result = self.cache.get(make_key(service, src_lang, dest_lang, text))
+        if result is not None:
+            result['text'] = text
+        return result
         
+    def _translate_and_cache(self, text: str, src_lang: str, dest_lang: str, service: str) -> Dict:
+        """调用翻译服务并缓存结果"""
+        result = self._translate_uncached(text, src_lang, dest_lang, service)
+        if self.cache is not None:
+            self.cache.set(make_key(service, src_lang, dest_lang, text), result)
+        return result
+        
+    def _translate_uncached(self, text: str, src_lang: str, dest_lang: str, service: str) -> Dict:
+        """调用翻译服务翻译文本（首选服务失败时回退到谷歌翻译）"""
         try:
             if service == 'google':
                 return self._translate_with_google(text, src_lang, dest_lang)
@@ -66,180 +406,48 @@ class Translator:
                 else:
                     raise
             except:
-                return {
-                    'text': text,
-                    'translated_text': '',
-                    'src_lang': src_lang,
-                    'dest_lang': dest_lang,
-                    'service': service,
-                    'error': str(e)
-                }
+                return error_result(text, src_lang, dest_lang, service, str(e))
                 
     def _translate_with_google(self, text: str, src_lang: str, dest_lang: str) -> Dict:
         """使用谷歌翻译API翻译文本"""
-        # 使用无API密钥的方式访问谷歌翻译（适用于小规模使用）
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": src_lang,
-            "tl": dest_lang,
-            "dt": "t",
-            "q": text
-        }
-        
-        try:
-            timeout = self.config.get('translation', 'timeout', 10)
-            response = self._session.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-            
-            # 解析响应
-            data = response.json()
-            translated_text = ''.join([sentence[0] for sentence in data[0]])
-            
-            # 获取检测到的源语言
-            detected_lang = data[2] if len(data) > 2 else src_lang
-            
-            return {
-                'text': text,
-                'translated_text': translated_text,
-                'src_lang': detected_lang,
-                'dest_lang': dest_lang,
-                'service': 'google',
-                'error': None
-            }
-        except Exception as e:
-            raise RuntimeError(f"谷歌翻译失败: {str(e)}")
+        return self._request('google', text, src_lang, dest_lang)
             
     def _translate_with_baidu(self, text: str, src_lang: str, dest_lang: str) -> Dict:
         """使用百度翻译API翻译文本"""
-        # 百度翻译API配置
-        appid = self.config.get('translation', 'api_key', None)
-        secret_key = self.config.get('translation', 'api_secret', None)
-        
-        if not appid or not secret_key:
-            raise ValueError("百度翻译需要提供api_key和api_secret")
-            
-        # 百度翻译语言代码映射
-        lang_map = {
-            'auto': 'auto',
-            'zh': 'zh', 'en': 'en', 'ja': 'jp', 'ko': 'kor',
-            'fr': 'fra', 'de': 'de', 'ru': 'ru', 'es': 'spa'
-        }
-        
-        # 转换语言代码
-        from_lang = lang_map.get(src_lang, src_lang)
-        to_lang = lang_map.get(dest_lang, dest_lang)
-        
-        # 生成签名
-        import hashlib
-        salt = str(int(time.time()))
-        sign = appid + text + salt + secret_key
-        sign = hashlib.md5(sign.encode('utf-8')).hexdigest()
-        
-        # 发送请求
-        url = "https://fanyi-api.baidu.com/api/trans/vip/translate"
-        params = {
-            'q': text,
-            'from': from_lang,
-            'to': to_lang,
-            'appid': appid,
-            'salt': salt,
-            'sign': sign
-        }
-        
-        try:
-            timeout = self.config.get('translation', 'timeout', 10)
-            response = self._session.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-            
-            # 解析响应
-            data = response.json()
-            
-            if 'error_code' in data:
-                raise RuntimeError(f"百度翻译API错误: {data.get('error_msg', '未知错误')}")
-                
-            translated_text = ''.join([item['dst'] for item in data['trans_result']])
-            
-            return {
-                'text': text,
-                'translated_text': translated_text,
-                'src_lang': from_lang,
-                'dest_lang': to_lang,
-                'service': 'baidu',
-                'error': None
-            }
-        except Exception as e:
-            raise RuntimeError(f"百度翻译失败: {str(e)}")
+        return self._request('baidu', text, src_lang, dest_lang)
             
     def _translate_with_youdao(self, text: str, src_lang: str, dest_lang: str) -> Dict:
         """使用有道翻译API翻译文本"""
-        # 有道翻译API配置
-        app_key = self.config.get('translation', 'api_key', None)
-        app_secret = self.config.get('translation', 'api_secret', None)
-        
-        if not app_key or not app_secret:
-            raise ValueError("有道翻译需要提供api_key和api_secret")
+        return self._request('youdao', text, src_lang, dest_lang)
             
-        # 有道翻译语言代码映射
-        lang_map = {
-            'auto': 'auto',
-            'zh': 'zh-CHS', 'en': 'en', 'ja': 'ja', 'ko': 'ko',
-            'fr': 'fr', 'de': 'de', 'ru': 'ru', 'es': 'es'
-        }
-        
-        # 转换语言代码
-        from_lang = lang_map.get(src_lang, src_lang)
-        to_lang = lang_map.get(dest_lang, dest_lang)
-        
-        # 生成签名
-        import hashlib
-        import time
-        curtime = str(int(time.time()))
-        sign_str = app_key + self._truncate(text) + curtime + app_secret
-        sign = hashlib.sha256(sign_str.encode('utf-8')).hexdigest()
-        
-        # 发送请求
-        url = "https://openapi.youdao.com/api"
-        params = {
-            'q': text,
-            'from': from_lang,
-            'to': to_lang,
-            'appKey': app_key,
-            'salt': curtime,
-            'sign': sign,
-            'signType': 'v3',
-            'curtime': curtime
-        }
-        
+    def _request(self, service: str, text: str, src_lang: str, dest_lang: str) -> Dict:
+        """构造请求、限流后发送并解析响应"""
+        url, params, from_lang, to_lang = build_request(self.config, service, text, src_lang, dest_lang)
         try:
             timeout = self.config.get('translation', 'timeout', 10)
+            self._throttle(service)
             response = self._session.get(url, params=params, timeout=timeout)
             response.raise_for_status()
-            
-            # 解析响应
-            data = response.json()
-            
-            if data.get('errorCode') != '0':
-                raise RuntimeError(f"有道翻译API错误: {data.get('errorMsg', '未知错误')}")
-                
-            translated_text = data.get('translation', [''])[0]
-            
-            return {
-                'text': text,
-                'translated_text': translated_text,
-                'src_lang': from_lang,
-                'dest_lang': to_lang,
-                'service': 'youdao',
-                'error': None
-            }
+            return parse_response(service, response.json(), text, from_lang, to_lang)
         except Exception as e:
-            raise RuntimeError(f"有道翻译失败: {str(e)}")
+            raise RuntimeError(f"{SERVICE_NAMES[service]}失败: {str(e)}")
+            
+    def _throttle(self, service: str) -> None:
+        """按translation_config中rate_limits的配置对指定服务限流"""
+        spec = (self.config.get('translation', 'rate_limits', None) or {}).get(service)
+        if spec:
+            get_rate_limiter(service, spec.get('rate', 0), spec.get('burst')).acquire()
             
+    def cache_stats(self) -> Dict:
+        """返回翻译缓存的命中统计"""
+        if self.cache is None:
+            return {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'negative_hits': 0,
+                    'stores': 0, 'evictions': 0, 'size': 0, 'hit_rate': 0.0}
+        return self.cache.stats()
+        
     def _truncate(self, text: str) -> str:
         """截断文本以符合API限制"""
-        if len(text) <= 20:
-            return text
-        return text[:10] + str(len(text)) + text[-10:]
+        return _truncate(text)
         
     def detect_language(self, text: str) -> str:
         """
@@ -256,7 +464,7 @@ class Translator:
         
     def batch_translate(self, texts: list, src_lang: str = 'auto', dest_lang: str = 'zh') -> list:
         """
-        批量翻译文本列表
+        批量翻译文本列表（并发请求，相同文本只翻译一次，结果顺序与输入一致）
         
         参数:
             texts: 要翻译的文本列表
@@ -266,49 +474,162 @@ class Translator:
         返回:
             翻译结果列表
         """
-        results = []
-        
-        for text in texts:
-            result = self.translate(text, src_lang, dest_lang)
-            results.append(result)
+        if not texts:
+            return []
             
-            # 添加延迟，避免触发API频率限制
-            time.sleep(0.1)
+        service = self.config.get('translation', 'service', 'google')
+        translated: Dict[str, Dict] = {}
+        pending = []
+        # 相同的文本只翻译一次，已缓存的文本不再请求
+        for text in dict.fromkeys(texts):
+            cached = self._cache_get(service, src_lang, dest_lang, text) if text.strip() else None
+            if cached is not None:
+                translated[text] = cached
+            else:
+                pending.append(text)
+                
+        units = plan_units(self.config, pending, src_lang, service)
+            
+        def run(unit):
+            if isinstance(unit, list):
+                return self._translate_packed(unit, src_lang, dest_lang, service)
+            return {unit: self._translate_and_cache(unit, src_lang, dest_lang, service)
+                    if unit.strip() else self.translate(unit, src_lang, dest_lang)}
+            
+        # 并发发送请求，请求频率由各服务的令牌桶限制
+        workers = min(self.config.get('translation', 'max_workers', 8), len(units))
+        if workers <= 1:
+            for part in map(run, units):
+                translated.update(part)
+        elif units:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for part in pool.map(run, units):
+                    translated.update(part)
+                
+        # 按输入顺序返回，重复的文本各自返回独立的结果字典
+        return [dict(translated[text]) for text in texts]
+        
+    def _translate_packed(self, texts: list, src_lang: str, dest_lang: str, service: str) -> Dict[str, Dict]:
+        """
+        将多条文本按行拼接为一个请求翻译，再按行拆分回各条文本
+        
+        返回:
+            文本 -> 翻译结果；请求失败或译文行数与原文不一致时逐条重新翻译
+        """
+        result = self._translate_uncached('\n'.join(texts), src_lang, dest_lang, service)
+        results = split_packed(texts, result)
+        if results is None:
+            with self._stats_lock:
+                self.pack_stats['fallbacks'] += 1
+            return {text: self._translate_and_cache(text, src_lang, dest_lang, service) for text in texts}
             
+        with self._stats_lock:
+            self.pack_stats['packs'] += 1
+            self.pack_stats['packed_items'] += len(texts)
+        if self.cache is not None:
+            for text, item in results.items():
+                self.cache.set(make_key(service, src_lang, dest_lang, text), item)
         return results
         
-    def translate_file(self, file_path: str, output_path: str, src_lang: str = 'auto', dest_lang: str = 'zh') -> Dict:
+    def translate_file(self, file_path: str, output_path: str, src_lang: str = 'auto', dest_lang: str = 'zh',
+                       resume: bool = True) -> Dict:
         """
-        翻译文件内容
+        流式翻译文件内容
+        
+        按行读取文件，将各行（超长的行按句子切分）合并为不超过服务长度上限的块，
+        并发翻译（同时进行的块数有上限），按原顺序写入输出文件。每写完一块记录检查点
+        （output_path + '.ckpt'），失败后再次调用时从检查点继续，完成后删除检查点。
         
         参数:
             file_path: 源文件路径
             output_path: 输出文件路径
             src_lang: 源语言
             dest_lang: 目标语言
+            resume: 存在与本次参数一致的检查点时是否从检查点继续
         
         返回:
             翻译结果信息
         """
+        checkpoint_path = output_path + '.ckpt'
+        service = self.config.get('translation', 'service', 'google')
+        limit = (self.config.get('translation', 'pack_limits', None) or {}).get(service, 1000)
+        max_items = self.config.get('translation', 'pack_max_items', 64)
+        # 译文为中日韩文字时，同一行切分出的各段直接拼接
+        joiner = '' if dest_lang.split('-')[0].lower() in ('zh', 'ja', 'ko') else ' '
+        workers = max(1, self.config.get('translation', 'max_workers', 8))
+        
+        state = {'chunks': 0, 'output_bytes': 0, 'translated_size': 0, 'src_lang': src_lang}
+        resumed = 0
         try:
-            # 读取文件
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            stat = os.stat(file_path)
+            signature = {'file_path': os.path.abspath(file_path), 'size': stat.st_size,
+                         'mtime_ns': stat.st_mtime_ns, 'src_lang': src_lang, 'dest_lang': dest_lang,
+                         'service': service, 'limit': limit, 'max_items': max_items}
+            if resume and os.path.exists(checkpoint_path) and os.path.exists(output_path):
+                with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                if saved.get('signature') == signature:
+                    state.update(saved['state'])
+                    resumed = state['chunks']
+                    
+            with open(file_path, 'r', encoding='utf-8') as source, \
+                    open(output_path, 'r+b' if resumed else 'wb') as output:
+                # 丢弃检查点之后写入的不完整内容
+                output.truncate(state['output_bytes'])
+                output.seek(state['output_bytes'])
+                original_size = [0]
                 
-            # 翻译内容
-            result = self.translate(content, src_lang, dest_lang)
-            
-            # 写入结果
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result['translated_text'])
+                def read_lines():
+                    for line in source:
+                        original_size[0] += len(line)
+                        yield line
+                        
+                chunks = iter_document_chunks(read_lines(), limit, max_items, joiner)
+                for _ in range(resumed):
+                    if next(chunks, None) is None:
+                        break
+                        
+                def write(chunk, translated):
+                    parts = []
+                    for indent, text, ending in chunk:
+                        if text:
+                            result = translated[text]
+                            parts.append(indent + result['translated_text'] + ending)
+                            if state['src_lang'] == 'auto':
+                                state['src_lang'] = result['src_lang']
+                        else:
+                            parts.append(indent + ending)
+                    data = ''.join(parts)
+                    output.write(data.encode('utf-8'))
+                    output.flush()
+                    state['chunks'] += 1
+                    state['output_bytes'] += len(data.encode('utf-8'))
+                    state['translated_size'] += len(data)
+                    self._save_checkpoint(checkpoint_path, {'signature': signature, 'state': state})
+                    
+                # 最多同时翻译 2×max_workers 个块，先提交的块完成后立即按顺序写入
+                in_flight = deque()
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    for chunk in chunks:
+                        texts = [text for _, text, _ in chunk if text]
+                        in_flight.append((chunk, pool.submit(self._translate_chunk, texts, src_lang, dest_lang, service)))
+                        if len(in_flight) >= workers * 2:
+                            write(in_flight[0][0], in_flight.popleft()[1].result())
+                    while in_flight:
+                        write(in_flight[0][0], in_flight.popleft()[1].result())
+                        
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
                 
             return {
                 'file_path': file_path,
                 'output_path': output_path,
-                'original_size': len(content),
-                'translated_size': len(result['translated_text']),
-                'src_lang': result['src_lang'],
-                'dest_lang': result['dest_lang'],
+                'original_size': original_size[0],
+                'translated_size': state['translated_size'],
+                'src_lang': state['src_lang'],
+                'dest_lang': dest_lang,
+                'chunks': state['chunks'],
+                'resumed_chunks': resumed,
                 'success': True,
                 'error': None
             }
@@ -316,6 +637,38 @@ class Translator:
             return {
                 'file_path': file_path,
                 'output_path': output_path,
+                'chunks': state['chunks'],
+                'resumed_chunks': resumed,
+                'checkpoint': checkpoint_path if os.path.exists(checkpoint_path) else None,
                 'success': False,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+            
+    def _translate_chunk(self, texts: list, src_lang: str, dest_lang: str, service: str) -> Dict[str, Dict]:
+        """翻译文件中的一块（已缓存的文本不再请求，其余合并为一个请求），任一文本失败时抛出RuntimeError"""
+        translated = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            cached = self._cache_get(service, src_lang, dest_lang, text)
+            if cached is not None and not cached.get('error'):
+                translated[text] = cached
+            else:
+                pending.append(text)
+                
+        if len(pending) > 1:
+            translated.update(self._translate_packed(pending, src_lang, dest_lang, service))
+        elif pending:
+            translated[pending[0]] = self._translate_and_cache(pending[0], src_lang, dest_lang, service)
+            
+        for result in translated.values():
+            if result.get('error'):
+                raise RuntimeError(f"翻译失败: {result['error']}")
+        return translated
+        
+    @staticmethod
+    def _save_checkpoint(path: str, data: Dict) -> None:
+        """原子地写入检查点文件"""
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
@@ -0,0 +1,208 @@
+"""
+翻译缓存模块
+
+两级翻译结果缓存：内存LRU + 可选的SQLite持久化存储，支持过期时间和失败结果的短时缓存。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# 缓存键: (翻译服务, 源语言, 目标语言, 规范化文本)
+CacheKey = Tuple[str, str, str, str]
+
+
+def make_key(service: str, src_lang: str, dest_lang: str, text: str) -> CacheKey:
+    """生成缓存键（文本首尾空白去除、连续空白合并为一个空格）"""
+    return (service, src_lang, dest_lang, ' '.join(text.split()))
+
+
+class TranslationCache:
+    """翻译结果缓存（内存LRU + SQLite）"""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 7 * 24 * 3600,
+                 negative_ttl: float = 60.0, path: Optional[str] = None,
+                 max_disk_entries: int = 100000):
+        """
+        初始化翻译缓存
+
+        参数:
+            max_size: 内存中最多缓存的条目数，超出时淘汰最久未使用的条目
+            ttl: 成功结果的有效期（秒），None表示永不过期
+            negative_ttl: 失败结果的有效期（秒），为0时不缓存失败结果
+            path: SQLite数据库路径，None表示只使用内存缓存
+            max_disk_entries: 数据库中最多保存的条目数，超出时删除最久未使用的条目
+        """
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path = path
+        self.max_disk_entries = max(1, int(max_disk_entries))
+        # 键 -> (过期时间, 结果)，过期时间为None表示永不过期
+        self._entries: "OrderedDict[CacheKey, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        self._writes = 0
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS translations ('
+                'key TEXT PRIMARY KEY, result TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)'
+            )
+            self._db.commit()
+
+        # 统计计数
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _db_key(key: CacheKey) -> str:
+        return json.dumps(key, ensure_ascii=False)
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        """
+        查找缓存结果
+
+        返回:
+            未过期的缓存结果（副本），未命中时返回None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    if result.get('error'):
+                        self.negative_hits += 1
+                    return dict(result)
+                del self._entries[key]
+
+            if self._db is not None:
+                db_key = self._db_key(key)
+                row = self._db.execute(
+                    'SELECT result, expires_at FROM translations WHERE key = ?', (db_key,)
+                ).fetchone()
+                if row is not None:
+                    result, expires_at = json.loads(row[0]), row[1]
+                    if expires_at is None or expires_at > now:
+                        self._db.execute('UPDATE translations SET accessed_at = ? WHERE key = ?', (now, db_key))
+                        self._db.commit()
+                        self._remember(key, expires_at, result)
+                        self.disk_hits += 1
+                        if result.get('error'):
+                            self.negative_hits += 1
+                        return dict(result)
+                    self._db.execute('DELETE FROM translations WHERE key = ?', (db_key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: CacheKey, result: Dict) -> None:
+        """保存翻译结果（失败结果按negative_ttl保存）"""
+        ttl = self.negative_ttl if result.get('error') else self.ttl
+        if ttl is not None and ttl <= 0:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        result = dict(result)
+
+        with self._lock:
+            self._remember(key, expires_at, result)
+            self.stores += 1
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO translations (key, result, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    (self._db_key(key), json.dumps(result, ensure_ascii=False), expires_at, now)
+                )
+                self._writes += 1
+                # 每写入一定次数才清理一次，避免每次写入都扫描整表
+                if self._writes % 100 == 0:
+                    self._prune(now)
+                self._db.commit()
+
+    def _remember(self, key: CacheKey, expires_at: Optional[float], result: Dict) -> None:
+        """写入内存LRU（调用方持有锁）"""
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _prune(self, now: float) -> None:
+        """删除数据库中已过期和超出数量上限的条目（调用方持有锁）"""
+        self._db.execute('DELETE FROM translations WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+        count = self._db.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                'DELETE FROM translations WHERE key IN '
+                '(SELECT key FROM translations ORDER BY accessed_at LIMIT ?)', (excess,)
+            )
+            self.evictions += excess
+
+    def clear(self) -> None:
+        """清空缓存（包括数据库，保留统计计数）"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM translations')
+                self._db.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict:
+        """返回缓存命中统计"""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'negative_hits': self.negative_hits,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'hit_rate': hits / total if total else 0.0
+        }
+
+
+def cache_from_config(config) -> Optional[TranslationCache]:
+    """
+    按translation_config创建翻译缓存（同步和异步翻译器共用）
+
+    参数:
+        config: AutoModConfig配置对象
+
+    返回:
+        翻译缓存，配置中关闭缓存时返回None
+    """
+    if not config.get('translation', 'cache', True):
+        return None
+    return TranslationCache(
+        max_size=config.get('translation', 'cache_size', 1024),
+        ttl=config.get('translation', 'cache_ttl', 7 * 24 * 3600),
+        negative_ttl=config.get('translation', 'cache_negative_ttl', 60),
+        path=config.get('translation', 'cache_path', None),
+        max_disk_entries=config.get('translation', 'cache_max_disk_entries', 100000)
+    )
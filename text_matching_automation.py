@@ -69,6 +69,9 @@ class TextMatchingAutomation:
         """设置自动化配置"""
         # 配置OCR识别精度
         self.auto.set_ocr_engine("pytesseract")
+        # 坐标附近的小字号文字识别失败时在同一帧上放大或更换阈值重试，而不是等待下一轮
+        # （只作用于区域识别，click_text的全屏查找不重试）
+        self.auto.update_config(ocr={"retry": True})
         # 配置类人鼠标操作
         self.auto.set_human_like_mouse(True)
         # 设置翻译服务
@@ -88,28 +91,21 @@ class TextMatchingAutomation:
         
         while time.time() - start_time < max_search_time:
             try:
-                # 截取全屏并识别文字
-                ocr_result = self.auto.screenshot_and_recognize()
-                
-                if not ocr_result.get('text'):
-                    time.sleep(0.5)
-                    continue
-                
-                # 在识别结果中查找目标文字
-                for box in ocr_result.get('boxes', []):
-                    if text_to_find in box['text'] and box['confidence'] > 0.6:
-                        # 计算文本框中心位置
-                        center_x = box['x'] + box['width'] // 2
-                        center_y = box['y'] + box['height'] // 2
-                        
-                        print(f"找到文字 '{text_to_find}'，位置: ({center_x}, {center_y})")
-                        
-                        # 移动鼠标并点击
-                        self.auto.move_mouse(center_x, center_y)
-                        time.sleep(0.2)
-                        self.auto.click_mouse()
-                        return True
-                        
+                # 已找到过的文字直接用模板匹配定位，未命中时才截图识别
+                box = self.auto.locate_text(text_to_find, min_confidence=0.6)
+                if box:
+                    # 计算文本框中心位置
+                    center_x = box['x'] + box['width'] // 2
+                    center_y = box['y'] + box['height'] // 2
+                    
+                    print(f"找到文字 '{text_to_find}'，位置: ({center_x}, {center_y})")
+                    
+                    # 移动鼠标并点击
+                    self.auto.move_mouse(center_x, center_y)
+                    time.sleep(0.2)
+                    self.auto.click_mouse()
+                    return True
+                    
             except Exception as e:
                 print(f"查找文字时发生错误: {str(e)}")
                 
@@ -120,25 +116,21 @@ class TextMatchingAutomation:
     
     def recognize_text_at_position(self, x, y, region_size=30):
         """识别指定位置附近的文字"""
-        # 定义识别区域（以指定坐标为中心）
-        region = (x - region_size, y - region_size, region_size * 2, region_size * 2)
-        
+        return self.recognize_texts_at_positions([(x, y)], region_size)[0]
+    
+    def recognize_texts_at_positions(self, positions, region_size=30):
+        """批量识别多个位置附近的文字（每轮只截取一次屏幕，识别为空时在同一画面上扩大区域）"""
         try:
-            # 截取区域并识别文字
-            ocr_result = self.auto.screenshot_and_recognize(region=region)
-            
-            # 如果识别结果为空，尝试扩大区域再次识别
-            if not ocr_result.get('text'):
-                larger_region = (x - region_size * 2, y - region_size * 2, region_size * 4, region_size * 4)
-                ocr_result = self.auto.screenshot_and_recognize(region=larger_region)
+            results = self.auto.recognize_at_points(positions, sizes=(region_size, region_size * 2))
+            texts = [result.get('text', '').strip() for result in results]
             
-            text = ocr_result.get('text', '').strip()
-            print(f"在位置({x}, {y})识别到文字: '{text}'")
+            for (x, y), text in zip(positions, texts):
+                print(f"在位置({x}, {y})识别到文字: '{text}'")
             
-            return text
+            return texts
         except Exception as e:
-            print(f"在位置({x}, {y})识别文字失败: {str(e)}")
-            return ""
+            print(f"在位置{list(positions)}识别文字失败: {str(e)}")
+            return [""] * len(positions)
     
     def click_translation(self, text, is_chinese):
         """根据文本语言类型查找并点击对应的翻译"""
@@ -184,12 +176,17 @@ class TextMatchingAutomation:
         
         all_success = True
         
+        # 批量识别假设所有坐标的文字来自同一帧画面：一次截图识别剩余的全部坐标，
+        # 点击之后画面可能已变化，之后的坐标重新截图识别，不使用点击前的结果
+        texts = []
+        
         # 遍历所有坐标
         for i, (x, y) in enumerate(self.coordinates):
             print(f"\n处理坐标 {i+1}: ({x}, {y})")
             
-            # 识别指定位置的文字
-            text = self.recognize_text_at_position(x, y)
+            if not texts:
+                texts = self.recognize_texts_at_positions(self.coordinates[i:])
+            text = texts.pop(0)
             
             if text:
                 # 判断是否为中文
@@ -199,7 +196,10 @@ class TextMatchingAutomation:
                 # 点击对应的翻译
                 success = self.click_translation(text, is_chinese)
                 
-                if not success:
+                if success:
+                    # 已点击，剩余坐标重新识别
+                    texts = []
+                else:
                     all_success = False
                     print(f"警告: 点击翻译失败")
             else: